@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Assignment 1 — factorial benchmark
+
+Times factorial_fast against factorial_iterative and factorial_recursive for
+n from 10^3 to 10^6. The recursive version is only run below the recursion
+limit and the iterative one up to --iterative-max, since it is quadratic.
+"""
+
+import argparse
+import sys
+import time
+
+from task4 import factorial_fast, factorial_iterative, factorial_recursive
+
+
+def time_once(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6])
+    parser.add_argument("--iterative-max", type=int, default=3 * 10**5)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    recursion_max = sys.getrecursionlimit() - 50
+    print(f"{'n':>9} {'recursive':>11} {'iterative':>11} {'fast':>11} {'fast xN':>11}")
+    for n in args.n:
+        recursive = f"{time_once(factorial_recursive, n):11.4f}" if n <= recursion_max else f"{'too deep':>11}"
+        iterative = f"{time_once(factorial_iterative, n):11.4f}" if n <= args.iterative_max else f"{'skipped':>11}"
+        fast = time_once(factorial_fast, n)
+        parallel = time_once(factorial_fast, n, args.workers)
+        print(f"{n:>9} {recursive} {iterative} {fast:11.4f} {parallel:11.4f}")
+
+
+if __name__ == "__main__":
+    main()
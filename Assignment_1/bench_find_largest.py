@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Assignment 1 — find_largest benchmark
+
+Writes a temporary newline-delimited file of random floats and compares the
+list-based find_largest (read everything into a list first) with
+find_largest_stream, pure Python and NumPy.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from task5 import find_largest, find_largest_stream, stream_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=5_000_000)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    try:
+        with os.fdopen(fd, "w") as f:
+            for _ in range(args.count):
+                f.write(f"{random.uniform(-1e9, 1e9)!r}\n")
+        size_mb = os.path.getsize(path) / 1e6
+
+        def list_based():
+            with open(path) as f:
+                return find_largest([float(line) for line in f])
+
+        runs = [
+            ("list + find_largest", list_based),
+            ("stream (python)", lambda: find_largest_stream(path, use_numpy=False)),
+            ("stream (numpy)", lambda: find_largest_stream(path)),
+            (f"stream top-{args.top} (numpy)", lambda: stream_stats(path, k=args.top).max),
+        ]
+        print(f"{args.count} numbers, {size_mb:.1f} MB")
+        for name, func in runs:
+            start = time.perf_counter()
+            largest = func()
+            elapsed = time.perf_counter() - start
+            print(f"{name:<24} {elapsed:8.3f} s  {size_mb / elapsed:8.1f} MB/s  max={largest}")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Assignment 1 — primality benchmark
+
+Times is_prime_trial (6k ± 1 reference) against the Miller–Rabin/BPSW fast
+path on the largest prime below 2^bits for several bit widths. The trial
+loop is skipped above --trial-max-bits because it would take minutes.
+
+The last columns time task2.is_prime itself and show which path it takes:
+the shared sieve up to prime_engine.DEFAULT_LIMIT (2^25), Miller–Rabin
+above it. The 30-bit row (about 1.07e9) is the batch jobs' typical input,
+which is above the default sieve limit.
+"""
+
+import argparse
+import timeit
+
+from prime_engine import DEFAULT_LIMIT
+from primality import is_prime_fast
+from task2 import is_prime, is_prime_trial
+
+
+def largest_prime_below(n: int) -> int:
+    n -= 1
+    while not is_prime_fast(n):
+        n -= 1
+    return n
+
+
+def time_call(func, n: int, min_time: float = 0.2) -> float:
+    """Return seconds per call of func(n), repeating until min_time has passed."""
+    timer = timeit.Timer(lambda: func(n))
+    number, elapsed = timer.autorange()
+    while elapsed < min_time:
+        number *= 2
+        elapsed = timer.timeit(number)
+    return elapsed / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, nargs="+", default=[16, 24, 30, 32, 40, 48, 64, 82, 128, 256, 512])
+    parser.add_argument("--trial-max-bits", type=int, default=48)
+    args = parser.parse_args()
+
+    print(f"{'bits':>5} {'trial (s)':>12} {'fast (s)':>12} {'speedup':>10} "
+          f"{'is_prime (s)':>13} {'path':>13}")
+    for bits in args.bits:
+        n = largest_prime_below(2 ** bits)
+        is_prime(n)  # grow the sieve before timing
+        fast = time_call(is_prime_fast, n)
+        auto = time_call(is_prime, n)
+        path = "sieve" if n <= DEFAULT_LIMIT else "miller-rabin"
+        if bits <= args.trial_max_bits:
+            trial = time_call(is_prime_trial, n, min_time=0.0)
+            print(f"{bits:>5} {trial:>12.3e} {fast:>12.3e} {trial / fast:>9.0f}x "
+                  f"{auto:>13.3e} {path:>13}")
+        else:
+            print(f"{bits:>5} {'skipped':>12} {fast:>12.3e} {'-':>10} {auto:>13.3e} {path:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Assignment 1 — modular factorial and binomial tables
+
+Provides FactorialTable(mod, limit), which precomputes n! and (n!)^-1
+modulo a prime `mod` for every n <= limit and then answers:
+- fact(n), inv_fact(n), binom(n, k) in O(1)
+- binom_many(n, k) for NumPy arrays, vectorized
+
+This avoids building the huge exact n! only to reduce it mod p afterwards.
+Both tables are flat array('Q') buffers, so NumPy can view them without
+copying.
+"""
+
+from __future__ import annotations
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # binom_many needs NumPy; everything else does not
+    np = None
+
+from primality import is_prime_fast
+
+
+class FactorialTable:
+    """Factorials and inverse factorials modulo a prime, up to `limit`."""
+
+    def __init__(self, mod: int, limit: int) -> None:
+        if not isinstance(mod, int) or not isinstance(limit, int):
+            raise TypeError("mod and limit must be integers")
+        if not is_prime_fast(mod) or mod >= 1 << 64:
+            raise ValueError("mod must be a prime below 2^64")
+        if not 0 <= limit < mod:
+            raise ValueError("limit must satisfy 0 <= limit < mod")
+        self.mod = mod
+        self.limit = limit
+
+        fact = array("Q", bytes(8 * (limit + 1)))
+        fact[0] = 1
+        value = 1
+        for i in range(1, limit + 1):
+            value = value * i % mod
+            fact[i] = value
+
+        inv_fact = array("Q", bytes(8 * (limit + 1)))
+        value = pow(fact[limit], -1, mod)
+        for i in range(limit, 0, -1):
+            inv_fact[i] = value
+            value = value * i % mod
+        inv_fact[0] = value
+
+        self._fact = fact
+        self._inv_fact = inv_fact
+
+    def _check(self, n: int) -> None:
+        if not 0 <= n <= self.limit:
+            raise ValueError(f"n must satisfy 0 <= n <= {self.limit}")
+
+    def fact(self, n: int) -> int:
+        """Return n! mod p."""
+        self._check(n)
+        return self._fact[n]
+
+    def inv_fact(self, n: int) -> int:
+        """Return the inverse of n! mod p."""
+        self._check(n)
+        return self._inv_fact[n]
+
+    def binom(self, n: int, k: int) -> int:
+        """Return C(n, k) mod p (0 when k < 0 or k > n)."""
+        self._check(n)
+        if k < 0 or k > n:
+            return 0
+        return self._fact[n] * self._inv_fact[k] % self.mod * self._inv_fact[n - k] % self.mod
+
+    def binom_many(self, n, k):
+        """Return C(n, k) mod p elementwise for broadcastable integer arrays.
+
+        Returns:
+            numpy uint64 array (0 where k < 0 or k > n)
+
+        Raises:
+            ImportError: if NumPy is not installed
+            ValueError: if any n is outside 0..limit
+        """
+        if np is None:
+            raise ImportError("binom_many requires NumPy")
+        n, k = np.broadcast_arrays(np.asarray(n, dtype=np.int64), np.asarray(k, dtype=np.int64))
+        if n.size and (n.min() < 0 or n.max() > self.limit):
+            raise ValueError(f"n must satisfy 0 <= n <= {self.limit}")
+        valid = (k >= 0) & (k <= n)
+        kk = np.where(valid, k, 0)
+        fact = np.frombuffer(self._fact, dtype=np.uint64)
+        inv_fact = np.frombuffer(self._inv_fact, dtype=np.uint64)
+        a, b, c = fact[n], inv_fact[kk], inv_fact[n - kk]
+
+        if self.mod < 1 << 32:
+            # Products of two residues fit in uint64, so reduce after each one.
+            mod = np.uint64(self.mod)
+            result = a * b % mod * c % mod
+        else:
+            mod = self.mod
+            triples = zip(a.ravel().tolist(), b.ravel().tolist(), c.ravel().tolist())
+            result = np.array(
+                [x * y % mod * z % mod for x, y, z in triples], dtype=np.uint64
+            ).reshape(n.shape)
+        return np.where(valid, result, np.uint64(0))
+
+
+if __name__ == "__main__":
+    table = FactorialTable(1_000_000_007, 10**6)
+    print(f"10^6! mod p = {table.fact(10**6)}")
+    print(f"C(10^6, 5 * 10^5) mod p = {table.binom(10**6, 5 * 10**5)}")
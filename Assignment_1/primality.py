@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Assignment 1 — fast primality tests for large integers
+
+Provides:
+- miller_rabin(n: int, witnesses) -> bool (strong probable-prime test)
+- strong_lucas(n: int) -> bool (strong Lucas probable-prime test)
+- is_prime_bpsw(n: int) -> bool (Baillie–PSW)
+- is_prime_fast(n: int) -> bool
+
+is_prime_fast trial-divides by the primes below 1000 first, then runs
+Miller–Rabin with a witness set proven deterministic for n below
+3.3 * 10^24, and Baillie–PSW for anything larger (no counterexample is
+known for BPSW).
+"""
+
+from __future__ import annotations
+
+from math import gcd, isqrt
+from typing import Iterable
+
+from prime_engine import primes_in_range
+
+SMALL_PRIMES = tuple(primes_in_range(0, 1000))
+_SMALL_PRIMORIAL = 1
+for _p in SMALL_PRIMES:
+    _SMALL_PRIMORIAL *= _p
+del _p
+
+# (exclusive bound, witnesses): Miller–Rabin with these bases is exact for
+# every n below the bound (Jaeschke; Sorenson & Webster).
+_DETERMINISTIC_WITNESSES = (
+    (2_047, (2,)),
+    (1_373_653, (2, 3)),
+    (25_326_001, (2, 3, 5)),
+    (3_215_031_751, (2, 3, 5, 7)),
+    (2_152_302_898_747, (2, 3, 5, 7, 11)),
+    (3_474_749_660_383, (2, 3, 5, 7, 11, 13)),
+    (341_550_071_728_321, (2, 3, 5, 7, 11, 13, 17)),
+    (3_825_123_056_546_413_051, (2, 3, 5, 7, 11, 13, 17, 19, 23)),
+    (318_665_857_834_031_151_167_461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+    (3_317_044_064_679_887_385_961_981, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)),
+)
+MR_DETERMINISTIC_LIMIT = _DETERMINISTIC_WITNESSES[-1][0]
+
+
+def miller_rabin(n: int, witnesses: Iterable[int]) -> bool:
+    """Return True if odd n > 2 is a strong probable prime to every witness."""
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in witnesses:
+        a %= n
+        if a == 0:
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _jacobi(a: int, n: int) -> int:
+    """Jacobi symbol (a/n) for odd positive n."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def strong_lucas(n: int) -> bool:
+    """Return True if odd n > 2 is a strong Lucas probable prime.
+
+    Parameters are chosen with Selfridge's method A: D is the first of
+    5, -7, 9, -11, ... with Jacobi (D/n) = -1, P = 1 and Q = (1 - D) / 4.
+    """
+    root = isqrt(n)
+    if root * root == n:
+        return False  # perfect squares never give (D/n) = -1
+    d = 5
+    while True:
+        j = _jacobi(d, n)
+        if j == -1:
+            break
+        if j == 0 and abs(d) != n:
+            return False
+        d = -d - 2 if d > 0 else -d + 2
+    q = (1 - d) // 4
+
+    # n + 1 = k * 2^s with k odd
+    k = n + 1
+    s = (k & -k).bit_length() - 1
+    k >>= s
+
+    def halve(x: int) -> int:
+        return (x + n if x & 1 else x) // 2 % n
+
+    # Binary ladder over the bits of k computing U_k, V_k and Q^k (mod n).
+    u, v, qk = 1, 1, q % n
+    for bit in bin(k)[3:]:
+        u, v = u * v % n, (v * v - 2 * qk) % n
+        qk = qk * qk % n
+        if bit == "1":
+            u, v = halve(u + v), halve(d * u + v)
+            qk = qk * q % n
+    if u == 0 or v == 0:
+        return True
+    for _ in range(s - 1):
+        v = (v * v - 2 * qk) % n
+        if v == 0:
+            return True
+        qk = qk * qk % n
+    return False
+
+
+def is_prime_bpsw(n: int) -> bool:
+    """Baillie–PSW test: Miller–Rabin to base 2 plus a strong Lucas test."""
+    if n < 2:
+        return False
+    if n % 2 == 0:
+        return n == 2
+    return miller_rabin(n, (2,)) and strong_lucas(n)
+
+
+def is_prime_fast(n: int) -> bool:
+    """Return True if n is prime, otherwise False.
+
+    - Small-prime trial division acts as a prefilter.
+    - Deterministic Miller–Rabin for n < 3.3 * 10^24.
+    - Baillie–PSW above that.
+    """
+    if n < 2:
+        return False
+    if n <= SMALL_PRIMES[-1]:
+        return n in SMALL_PRIMES
+    if gcd(n, _SMALL_PRIMORIAL) != 1:
+        return False
+    if n < 1_000_000:
+        return True  # no prime factor below 1000, so n is prime
+    for bound, witnesses in _DETERMINISTIC_WITNESSES:
+        if n < bound:
+            return miller_rabin(n, witnesses)
+    return miller_rabin(n, (2,)) and strong_lucas(n)
+
+
+if __name__ == "__main__":
+    for n in (2**61 - 1, 2**64 + 13, 2**89 - 1, 2**127 - 1, 2**127 + 1):
+        print(f"{n}: {'prime' if is_prime_fast(n) else 'composite'}")
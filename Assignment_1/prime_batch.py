@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Assignment 1 — batch primality classification
+
+Provides is_prime_many(values) -> numpy bool array for large batches:
+1. Divisibility by the primes below 100 is eliminated vectorized in NumPy.
+2. Survivors up to the sieve limit are looked up in the shared sieve bitmap,
+   also vectorized.
+3. The remaining (large) survivors are tested with is_prime_fast, fanned out
+   in chunks over a ProcessPoolExecutor.
+
+Results are returned in input order with the input's shape.
+"""
+
+from __future__ import annotations
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from prime_engine import default_sieve, primes_in_range
+from primality import is_prime_fast
+
+CHUNK_SIZE = 1 << 16
+
+_VECTOR_PRIMES = tuple(primes_in_range(0, 100))
+# Every candidate below 101^2 with no prime factor under 100 is prime.
+_TRIVIAL_BOUND = 101 * 101
+
+
+def _as_int_array(values: Union[Iterable[int], np.ndarray]) -> np.ndarray:
+    """Return values as a flat int64/uint64 array, or object array for big ints."""
+    if isinstance(values, np.ndarray):
+        arr = values.ravel()
+        if arr.dtype == object:
+            return arr
+        if arr.dtype.kind == "i":
+            return arr.astype(np.int64, copy=False)
+        if arr.dtype.kind == "u":
+            return arr.astype(np.uint64, copy=False)
+        raise TypeError(f"values must have an integer dtype, got {arr.dtype}")
+    if isinstance(values, array):
+        if values.typecode in "bhilq":
+            return np.frombuffer(values, dtype=f"i{values.itemsize}").astype(np.int64)
+        if values.typecode in "BHILQ":
+            return np.frombuffer(values, dtype=f"u{values.itemsize}").astype(np.uint64)
+    items = list(values)
+    if not all(isinstance(v, int) for v in items):
+        raise TypeError("values must be integers")
+    try:
+        return np.array(items, dtype=np.int64)
+    except OverflowError:
+        return np.array(items, dtype=object)
+
+
+def _classify_chunk(values: List[int]) -> List[bool]:
+    return [is_prime_fast(v) for v in values]
+
+
+def _classify(values: List[int], workers: Optional[int], chunk_size: int) -> List[bool]:
+    """Run is_prime_fast over values, in a process pool when there are enough."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(values) <= chunk_size:
+        return _classify_chunk(values)
+    chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+    results: List[bool] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # map() yields in submission order, which keeps the input order.
+        for part in executor.map(_classify_chunk, chunks):
+            results.extend(part)
+    return results
+
+
+def is_prime_many(
+    values: Union[Iterable[int], np.ndarray],
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> np.ndarray:
+    """Return a boolean array telling which of `values` are prime.
+
+    Args:
+        values: iterable of ints, integer array.array or ndarray (any shape)
+        workers: worker processes for large survivors (default: CPU count;
+            1 keeps everything in this process)
+        chunk_size: survivors per task sent to a worker
+
+    Returns:
+        numpy bool array with the same shape as values (1-D for iterables)
+
+    Raises:
+        TypeError: if values are not integers
+    """
+    shape = values.shape if isinstance(values, np.ndarray) else None
+    arr = _as_int_array(values)
+    result = np.zeros(arr.size, dtype=bool)
+
+    if arr.dtype == object:
+        pending = np.arange(arr.size)
+    else:
+        candidate = arr >= 2
+        for p in _VECTOR_PRIMES:
+            candidate &= (arr % p != 0) | (arr == p)
+        result[candidate & (arr < _TRIVIAL_BOUND)] = True
+
+        limit = default_sieve.limit
+        in_sieve = np.flatnonzero(candidate & (arr >= _TRIVIAL_BOUND) & (arr <= limit))
+        if in_sieve.size:
+            n = arr[in_sieve]
+            bits = np.frombuffer(default_sieve.bitmap(int(n.max())), dtype=np.uint8)
+            index = n >> 1
+            result[in_sieve] = (bits[index >> 3] >> (index & 7).astype(np.uint8)) & 1
+        pending = np.flatnonzero(candidate & (arr > limit))
+
+    if pending.size:
+        result[pending] = _classify(arr[pending].tolist(), workers, chunk_size)
+    return result.reshape(shape) if shape is not None else result
+
+
+if __name__ == "__main__":
+    sample = np.arange(10**9, 10**9 + 100)
+    flags = is_prime_many(sample)
+    print(f"Primes in [10**9, 10**9 + 100): {sample[flags].tolist()}")
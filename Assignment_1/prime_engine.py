@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Assignment 1 — segmented prime sieve engine
+
+Provides a lazily grown, bit-packed Sieve of Eratosthenes:
+- PrimeSieve(limit) -> sieve object with is_prime(n) and primes_in_range(lo, hi)
+- is_prime(n: int) -> bool backed by a shared module-level sieve
+- primes_in_range(lo: int, hi: int) -> generator of primes in [lo, hi)
+
+Only odd numbers are stored, one bit each (bit i of the bitmap stands for
+2*i + 1), so sieving up to 10^9 needs about 62 MB. Numbers above the sieve
+limit are answered by trial division with the sieved primes.
+"""
+
+from __future__ import annotations
+
+from math import isqrt
+from typing import Iterator, List
+
+# Bytes of bitmap added per segment; each byte covers 16 consecutive integers.
+SEGMENT_BYTES = 1 << 15
+SEGMENT_SPAN = 16 * SEGMENT_BYTES
+
+# Default sieve limit: a 2 MiB bitmap that builds in well under a second.
+# It does not reach the ~1e9 inputs of the batch jobs; task2.is_prime sends
+# queries above it to Miller-Rabin/BPSW (primality.py), and a PRIME_TABLE
+# file (prime_table.py) can cover a larger range without a rebuild.
+DEFAULT_LIMIT = 1 << 25
+
+# For every byte value, the positions of its set bits (used when decoding).
+_BIT_POSITIONS = tuple(
+    tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256)
+)
+# Maps the 0/1 flag bytes of a working segment to ASCII '0'/'1'.
+_FLAG_TO_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _pack_flags(flags: bytearray) -> bytes:
+    """Pack a bytearray of 0/1 flags (length a multiple of 8) into bits.
+
+    Flag k ends up in bit k % 8 of byte k // 8. The work is done by
+    translate/int/to_bytes so it runs at C speed.
+    """
+    if not flags:
+        return b""
+    digits = flags.translate(_FLAG_TO_ASCII)[::-1]
+    return int(digits, 2).to_bytes(len(flags) // 8, "little")
+
+
+class PrimeSieve:
+    """Segmented Sieve of Eratosthenes stored as a bit-packed bytearray.
+
+    The bitmap starts empty and grows one segment at a time, only as far as
+    the largest number queried so far (capped at `limit`). Lookups for
+    numbers that are already sieved are O(1).
+    """
+
+    def __init__(self, limit: int = DEFAULT_LIMIT) -> None:
+        if not isinstance(limit, int):
+            raise TypeError("limit must be an integer")
+        if limit < 2:
+            raise ValueError("limit must be at least 2")
+        self.limit = limit
+        self._bits = bytearray()
+        # Odd primes found so far that are used to sieve later segments.
+        self._base_primes: List[int] = []
+        self._base_bound = 1
+
+    @property
+    def sieved_to(self) -> int:
+        """Exclusive upper bound of the numbers currently covered by the bitmap."""
+        return 16 * len(self._bits)
+
+    def _grow_to(self, n: int) -> None:
+        """Extend the bitmap segment by segment until it covers n."""
+        target = min(n, self.limit)
+        while self.sieved_to <= target:
+            self._sieve_segment()
+
+    def _sieve_segment(self) -> None:
+        lo = self.sieved_to
+        hi = lo + SEGMENT_SPAN
+        # flags[k] == 1 means lo + 2k + 1 is still a prime candidate
+        flags = bytearray(b"\x01") * (SEGMENT_SPAN // 2)
+        if lo == 0:
+            flags[0] = 0  # 1 is not prime
+            for k in range(1, (isqrt(hi - 1) - 1) // 2 + 1):
+                if flags[k]:
+                    p = 2 * k + 1
+                    start = p * p // 2
+                    flags[start::p] = bytes(len(range(start, len(flags), p)))
+        else:
+            for p in self._primes_up_to(isqrt(hi - 1)):
+                start = max(p * p, (lo + p - 1) // p * p)
+                if start % 2 == 0:
+                    start += p
+                k = (start - lo) // 2
+                flags[k::p] = bytes(len(range(k, len(flags), p)))
+        self._bits += _pack_flags(flags)
+
+    def _primes_up_to(self, bound: int) -> List[int]:
+        """Return the cached odd base primes, extended to cover `bound`."""
+        if bound > self._base_bound:
+            self._base_primes.extend(self._decode(self._base_bound + 1, bound + 1))
+            self._base_bound = bound
+        return self._base_primes
+
+    def bitmap(self, n: int) -> bytes:
+        """Return a copy of the packed bitmap, grown first to cover n (up to limit).
+
+        Bit i of the result is set when 2*i + 1 is prime.
+        """
+        self._grow_to(n)
+        return bytes(self._bits)
+
+    def _decode(self, lo: int, hi: int) -> Iterator[int]:
+        """Yield the odd primes in [lo, hi) from the already-sieved bitmap."""
+        bits = self._bits
+        first = max(lo, 3) // 16
+        last = min(hi, self.sieved_to)
+        for index in range(first, (last + 15) // 16):
+            byte = bits[index]
+            if not byte:
+                continue
+            base = 16 * index + 1
+            for bit in _BIT_POSITIONS[byte]:
+                p = base + 2 * bit
+                if lo <= p < hi:
+                    yield p
+
+    def is_prime(self, n: int) -> bool:
+        """Return True if n is prime, otherwise False.
+
+        Numbers up to `limit` are looked up in the bitmap (growing it lazily);
+        larger numbers fall back to trial division by the sieved primes.
+        """
+        if n < 2:
+            return False
+        if n % 2 == 0:
+            return n == 2
+        if n > self.limit:
+            return self._trial_division(n)
+        if n >= self.sieved_to:
+            self._grow_to(n)
+        index = n >> 1
+        return bool(self._bits[index >> 3] >> (index & 7) & 1)
+
+    def _trial_division(self, n: int) -> bool:
+        """Primality of an odd n > limit by trial division."""
+        root = isqrt(n)
+        self._grow_to(root)
+        for p in self._decode(3, min(root, self.limit) + 1):
+            if n % p == 0:
+                return False
+        # Continue with 6k ± 1 candidates past the end of the sieve.
+        i = max(5, self.limit // 6 * 6 - 1)
+        while i <= root:
+            if n % i == 0 or n % (i + 2) == 0:
+                return False
+            i += 6
+        return True
+
+    def primes_in_range(self, lo: int, hi: int) -> Iterator[int]:
+        """Yield the primes p with lo <= p < hi in increasing order.
+
+        Raises:
+            ValueError: if hi - 1 is above the sieve limit
+        """
+        if hi - 1 > self.limit:
+            raise ValueError(f"hi must not exceed limit + 1 ({self.limit + 1})")
+        if lo <= 2 < hi:
+            yield 2
+        # Grow and decode one segment at a time so large ranges stream.
+        start = max(lo, 3)
+        while start < hi:
+            stop = min(hi, (start // SEGMENT_SPAN + 1) * SEGMENT_SPAN)
+            self._grow_to(stop - 1)
+            yield from self._decode(start, stop)
+            start = stop
+
+
+default_sieve = PrimeSieve()
+
+
+def is_prime(n: int) -> bool:
+    """Return True if n is prime, using the shared module-level sieve."""
+    return default_sieve.is_prime(n)
+
+
+def primes_in_range(lo: int, hi: int) -> Iterator[int]:
+    """Yield the primes in [lo, hi) from the shared module-level sieve."""
+    return default_sieve.primes_in_range(lo, hi)
+
+
+if __name__ == "__main__":
+    print(f"Primes below 100: {list(primes_in_range(0, 100))}")
+    print(f"Primes in [10**6, 10**6 + 100): {list(primes_in_range(10**6, 10**6 + 100))}")
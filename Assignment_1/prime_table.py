@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Assignment 1 — persisted, memory-mapped prime table
+
+Provides:
+- save_prime_table(path, limit) -> writes the sieve bitmap plus a prime-count
+  checkpoint index to a versioned file
+- PrimeTable.open(path) -> read-only, mmap-backed table with is_prime(n) and
+  prime_count(n) that needs no rebuild on startup
+
+File layout (all integers little-endian):
+    header      64 bytes: magic, version, limit, checkpoint step,
+                checkpoint count, bitmap length (struct HEADER)
+    checkpoints count * uint64, checkpoint k = number of primes < k * step
+    bitmap      odd-only sieve bitmap as produced by prime_engine.PrimeSieve
+
+The file is written to a temporary name and renamed into place, and is only
+ever opened with ACCESS_READ, so any number of worker processes can share
+one table safely (the OS shares the mapped pages between them).
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+from prime_engine import PrimeSieve
+from primality import is_prime_fast
+
+MAGIC = b"PRIMETBL"
+VERSION = 1
+HEADER = struct.Struct("<8sIQQQQ")
+HEADER_SIZE = 64
+CHECKPOINT_STEP = 1 << 16
+# Each bitmap byte covers 16 integers.
+_BLOCK_BYTES = CHECKPOINT_STEP // 16
+
+
+def save_prime_table(path: str, limit: int) -> None:
+    """Sieve up to `limit` and write the table to `path` atomically."""
+    sieve = PrimeSieve(limit)
+    bitmap = sieve.bitmap(limit)[: limit // 16 + 1]
+
+    checkpoints = array("Q", [0])
+    count = 0
+    for start in range(0, len(bitmap), _BLOCK_BYTES):
+        block = bitmap[start:start + _BLOCK_BYTES]
+        count += int.from_bytes(block, "little").bit_count()
+        if start == 0:
+            count += 1  # the prime 2 is not in the odd-only bitmap
+        checkpoints.append(count)
+    if checkpoints.itemsize != 8:
+        raise RuntimeError("array('Q') is not 64-bit on this platform")
+    if sys.byteorder != "little":
+        checkpoints.byteswap()
+
+    header = HEADER.pack(MAGIC, VERSION, 16 * len(bitmap) - 1, CHECKPOINT_STEP,
+                         len(checkpoints), len(bitmap))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".prime_table.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            f.write(checkpoints.tobytes())
+            f.write(bitmap)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class PrimeTable:
+    """Read-only view of a saved prime table backed by mmap."""
+
+    def __init__(self, mapped: mmap.mmap) -> None:
+        magic, version, limit, step, n_checkpoints, n_bitmap = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            raise ValueError("not a prime table file")
+        if version != VERSION:
+            raise ValueError(f"unsupported prime table version {version} (expected {VERSION})")
+        self._checkpoint_offset = HEADER_SIZE
+        self._bitmap_offset = HEADER_SIZE + 8 * n_checkpoints
+        if len(mapped) != self._bitmap_offset + n_bitmap:
+            raise ValueError("prime table file is truncated or corrupt")
+        self._mm = mapped
+        self.limit = limit
+        self.step = step
+
+    @classmethod
+    def open(cls, path: str) -> "PrimeTable":
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapped)
+        except Exception:
+            mapped.close()
+            raise
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "PrimeTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def is_prime(self, n: int) -> bool:
+        """Return True if n is prime; uses is_prime_fast above the table limit."""
+        if n < 2:
+            return False
+        if n % 2 == 0:
+            return n == 2
+        if n > self.limit:
+            return is_prime_fast(n)
+        index = n >> 1
+        return bool(self._mm[self._bitmap_offset + (index >> 3)] >> (index & 7) & 1)
+
+    def prime_count(self, n: int) -> int:
+        """Return pi(n), the number of primes <= n.
+
+        Raises:
+            ValueError: if n is above the table limit
+        """
+        if n > self.limit:
+            raise ValueError(f"n must not exceed the table limit ({self.limit})")
+        if n < 2:
+            return 0
+        if n % 2 == 0:
+            n -= 1  # even n > 2 is never prime
+        if n < 3:
+            return 1
+        k = n // self.step
+        (count,) = struct.unpack_from("<Q", self._mm, self._checkpoint_offset + 8 * k)
+        if k == 0:
+            count = 1  # the prime 2
+        # Popcount the bits for the odd numbers in [k * step, n].
+        first = self._bitmap_offset + k * self.step // 16
+        last_index = n >> 1
+        last = self._bitmap_offset + (last_index >> 3)
+        count += int.from_bytes(self._mm[first:last], "little").bit_count()
+        mask = (1 << ((last_index & 7) + 1)) - 1
+        return count + (self._mm[last] & mask).bit_count()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query a persisted prime table.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="sieve up to LIMIT and write the table")
+    build.add_argument("path")
+    build.add_argument("limit", type=int)
+    query = sub.add_parser("count", help="print pi(n) for each N")
+    query.add_argument("path")
+    query.add_argument("n", type=int, nargs="+")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        save_prime_table(args.path, args.limit)
+        print(f"Wrote prime table up to {args.limit} to {args.path}")
+    else:
+        with PrimeTable.open(args.path) as table:
+            for n in args.n:
+                print(f"pi({n}) = {table.prime_count(n)}")
+
+
+if __name__ == "__main__":
+    main()
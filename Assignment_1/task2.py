@@ -3,9 +3,64 @@
 
 Provides a small, efficient is_prime(n: int) -> bool implementation
 and a tiny test harness when run as a script.
+
+is_prime is backed by the cached sieve in prime_engine for small n and by
+deterministic Miller–Rabin / Baillie–PSW (primality.py) for large n;
+is_prime_trial is the original 6k ± 1 trial-division version, kept as the
+reference path.
+
+If the PRIME_TABLE environment variable names a table written by
+prime_table.py, it is memory-mapped at import and used instead of the
+in-process sieve, so new worker processes start with no rebuild.
 """
 
-def is_prime(n: int) -> bool:
+import os
+import sys
+
+import common_package  # makes the shared `common` package importable
+from common.fastparse import read_numbers
+from prime_engine import DEFAULT_LIMIT, is_prime as _sieve_is_prime
+from primality import is_prime_fast
+from prime_table import PrimeTable
+
+_TABLE = PrimeTable.open(os.environ["PRIME_TABLE"]) if os.environ.get("PRIME_TABLE") else None
+
+METHODS = ("auto", "sieve", "miller-rabin", "trial")
+
+
+def is_prime(n: int, method: str = "auto") -> bool:
+	"""Return True if n is prime, otherwise False.
+
+	- Handles n < 2 (not prime).
+	- Integral floats (7.0) are checked as ints; other floats are not prime.
+	- method="auto" answers from the PRIME_TABLE file or the shared sieve
+	  up to their limit (prime_engine.DEFAULT_LIMIT, about 3.4e7, without a
+	  table) and uses the Miller–Rabin/BPSW fast path above it, so queries
+	  around 1e9 go to Miller–Rabin unless a larger table is loaded.
+	- method="sieve" always uses the sieve (trial division above its limit),
+	  "miller-rabin" always uses the fast path, "trial" the 6k ± 1 loop.
+
+	Raises:
+		ValueError: if method is not one of METHODS
+	"""
+	if isinstance(n, float):
+		if not n.is_integer():
+			return False
+		n = int(n)
+	if method == "auto":
+		if _TABLE is not None and n <= _TABLE.limit:
+			return _TABLE.is_prime(n)
+		return _sieve_is_prime(n) if n <= DEFAULT_LIMIT else is_prime_fast(n)
+	if method == "sieve":
+		return _sieve_is_prime(n)
+	if method == "miller-rabin":
+		return is_prime_fast(n)
+	if method == "trial":
+		return is_prime_trial(n)
+	raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+
+
+def is_prime_trial(n: int) -> bool:
 	"""Return True if n is prime, otherwise False.
 
 	- Handles n < 2 (not prime).
@@ -25,7 +80,30 @@ def is_prime(n: int) -> bool:
 	return True
 
 
+def run_batch() -> None:
+	"""Classify every integer on stdin (whitespace/comma separated).
+
+	Input is parsed in bulk by common.fastparse; bad tokens are reported on
+	stderr with their byte offset and skipped.
+	"""
+	values, bad_tokens = read_numbers(kind="int", errors="skip")
+	for offset, token in bad_tokens:
+		print(f"'{token}' at byte offset {offset} is not a valid integer.", file=sys.stderr)
+	try:
+		from prime_batch import is_prime_many
+	except ImportError:  # NumPy not installed
+		flags = [is_prime(n) for n in values]
+	else:
+		flags = is_prime_many(values).tolist()
+	sys.stdout.write("".join(
+		f"{n}: {'prime' if flag else 'composite'}\n" for n, flag in zip(values, flags)
+	))
+
+
 if __name__ == "__main__":
+	if "--batch" in sys.argv[1:]:
+		run_batch()
+		sys.exit(0)
 	# Interactive primality checker
 	print("Primality checker. Enter integers to test. Type 'q' or blank line to quit.")
 	try:
@@ -1,21 +1,123 @@
 #!/usr/bin/env python3
 """Assignment 1 — factorial implementations
 
-Provides two working factorial implementations:
+Provides three working factorial implementations:
 - factorial_recursive(n: int) -> int
 - factorial_iterative(n: int) -> int
+- factorial_fast(n: int, workers: int | None = None) -> int
 
-Both validate that n is a non-negative integer.
+All validate that n is a non-negative integer. The recursive and iterative
+versions can share a FactorialCache, which keeps every `step`-th factorial
+and extends from the nearest cached checkpoint instead of starting at 1.
 """
 
 from __future__ import annotations
 
+from bisect import bisect_right, insort
+from concurrent.futures import ProcessPoolExecutor
+from math import isqrt
 
-def factorial_recursive(n: int) -> int:
+from prime_engine import PrimeSieve, default_sieve
+
+# Below this n the process pool costs more than it saves.
+PARALLEL_THRESHOLD = 200_000
+# Prime powers per task handed to a worker process.
+_PARALLEL_CHUNK = 4096
+
+
+class FactorialCache:
+    """Checkpointed factorial cache bounded by the total size of its values.
+
+    Only multiples of `step` are stored. `current_bytes` is the size of the
+    held factorials (their bit lengths rounded up to bytes); when a store
+    pushes it over `max_bytes`, checkpoints are evicted by size and recency
+    together (GreedyDual-Size): each has priority clock + 1 / its size in
+    bytes, refreshed when a lookup uses it, and the lowest priority goes first, its priority
+    becoming the new clock. Every checkpoint costs the same `step`
+    multiplications to rebuild from its predecessor, so a big, long-unused
+    one is evicted before a small or recently used one, while a big one in
+    active use survives.
+    `hits` counts lookups that found a checkpoint <= n, `misses` the ones
+    that had to start from 0! = 1.
+    """
+
+    def __init__(self, step: int = 256, max_bytes: int = 64 * 1024 * 1024) -> None:
+        if step < 1:
+            raise ValueError("step must be positive")
+        self.step = step
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.current_bytes = 0
+        self._clock = 0.0
+        self._values: dict[int, int] = {}
+        self._priority: dict[int, float] = {}
+        self._keys: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @staticmethod
+    def _size(value: int) -> int:
+        return (value.bit_length() + 7) // 8
+
+    def _priority_of(self, size: int) -> float:
+        return self._clock + 1 / max(size, 1)
+
+    def nearest(self, n: int) -> tuple[int, int]:
+        """Return (m, m!) for the largest cached checkpoint m <= n, else (0, 1)."""
+        i = bisect_right(self._keys, n) - 1
+        if i < 0:
+            self.misses += 1
+            return 0, 1
+        m = self._keys[i]
+        value = self._values[m]
+        self._priority[m] = self._priority_of(self._size(value))
+        self.hits += 1
+        return m, value
+
+    def store(self, n: int, value: int) -> None:
+        """Remember n! = value if n is a checkpoint and it fits under the cap."""
+        if n == 0 or n % self.step or n in self._values:
+            return
+        size = self._size(value)
+        if size > self.max_bytes:
+            return
+        while self.current_bytes + size > self.max_bytes:
+            old = min(self._priority, key=self._priority.__getitem__)
+            self._clock = self._priority.pop(old)
+            self._keys.remove(old)
+            self.current_bytes -= self._size(self._values.pop(old))
+        self._values[n] = value
+        self._priority[n] = self._priority_of(size)
+        insort(self._keys, n)
+        self.current_bytes += size
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._priority.clear()
+        self._keys.clear()
+        self.current_bytes = 0
+        self._clock = 0.0
+        self.hits = self.misses = 0
+
+
+def _recursive_from(n: int, m: int, base: int, cache: FactorialCache) -> int:
+    """Return n! recursively, stopping at the checkpoint m where m! = base."""
+    if n == m:
+        return base
+    result = n * _recursive_from(n - 1, m, base, cache)
+    cache.store(n, result)
+    return result
+
+
+def factorial_recursive(n: int, cache: FactorialCache | None = None) -> int:
     """Return n! computed recursively.
 
     Args:
         n: non-negative integer
+        cache: optional FactorialCache; recursion then stops at the nearest
+            cached checkpoint and stores new checkpoints on the way back
 
     Returns:
         n! as int
@@ -30,26 +132,139 @@ def factorial_recursive(n: int) -> int:
         raise TypeError("n must be an integer")
     if n < 0:
         raise ValueError("n must be non-negative")
+    if cache is not None:
+        m, base = cache.nearest(n)
+        return _recursive_from(n, m, base, cache)
     if n <= 1:
         return 1
     return n * factorial_recursive(n - 1)
 
 
-def factorial_iterative(n: int) -> int:
+def factorial_iterative(n: int, cache: FactorialCache | None = None) -> int:
     """Return n! computed iteratively (loop).
 
-    Args and errors same as factorial_recursive.
+    Args and errors same as factorial_recursive; with a cache the loop starts
+    from the nearest cached checkpoint and stores new ones as it passes them.
     """
     if not isinstance(n, int):
         raise TypeError("n must be an integer")
     if n < 0:
         raise ValueError("n must be non-negative")
-    result = 1
-    for i in range(2, n + 1):
+    if cache is None:
+        result = 1
+        for i in range(2, n + 1):
+            result *= i
+        return result
+    m, result = cache.nearest(n)
+    for i in range(m + 1, n + 1):
         result *= i
+        cache.store(i, result)
     return result
 
 
+def _product(factors: list[int], lo: int = 0, hi: int | None = None) -> int:
+    """Return the product of factors[lo:hi] using a balanced product tree.
+
+    Multiplying numbers of similar size keeps the bignum work close to that
+    of a single large multiplication instead of n small-by-huge ones.
+    """
+    if hi is None:
+        hi = len(factors)
+    if hi - lo <= 8:
+        result = 1
+        for i in range(lo, hi):
+            result *= factors[i]
+        return result
+    mid = (lo + hi) // 2
+    return _product(factors, lo, mid) * _product(factors, mid, hi)
+
+
+def _chunk_product(factors: list[int]) -> int:
+    return _product(factors)
+
+
+def _odd_primes(n: int) -> list[int]:
+    """Return the odd primes <= n from the shared sieve (or a private one)."""
+    sieve = default_sieve if n <= default_sieve.limit else PrimeSieve(n)
+    return list(sieve.primes_in_range(3, n + 1))
+
+
+def _swing_factors(n: int, primes: list[int]) -> list[int]:
+    """Return the odd prime powers whose product is the swing n!/(n//2)!^2.
+
+    Luschny's prime swing: the exponent of p is the number of odd digits
+    floor(n / p^k) for k >= 1, which collapses to 0 or 1 for p > sqrt(n).
+    """
+    root = isqrt(n)
+    factors = []
+    for p in primes:
+        if p > n:
+            break
+        if p <= root:
+            q, power = n, 1
+            while q >= p:
+                q //= p
+                if q & 1:
+                    power *= p
+            if power > 1:
+                factors.append(power)
+        elif (n // p) & 1:
+            factors.append(p)
+    return factors
+
+
+def factorial_fast(n: int, workers: int | None = None) -> int:
+    """Return n! using the prime-swing algorithm.
+
+    n! = 2^(n - popcount(n)) * odd(n) with odd(n) = odd(n // 2)^2 * swing(n),
+    and every swing is a product-tree product of prime powers.
+
+    Args:
+        n: non-negative integer
+        workers: if > 1 and n >= PARALLEL_THRESHOLD, the swing products are
+            computed in that many worker processes
+
+    Returns:
+        n! as int
+
+    Raises:
+        TypeError: if n is not an int
+        ValueError: if n is negative
+    """
+    if not isinstance(n, int):
+        raise TypeError("n must be an integer")
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if n < 2:
+        return 1
+
+    primes = _odd_primes(n)
+    levels = []
+    m = n
+    while m >= 3:
+        levels.append(_swing_factors(m, primes))
+        m //= 2
+
+    if workers is not None and workers > 1 and n >= PARALLEL_THRESHOLD:
+        tasks, owners = [], []
+        for level, factors in enumerate(levels):
+            for i in range(0, len(factors), _PARALLEL_CHUNK):
+                tasks.append(factors[i:i + _PARALLEL_CHUNK])
+                owners.append(level)
+        partial: list[list[int]] = [[] for _ in levels]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for level, value in zip(owners, executor.map(_chunk_product, tasks)):
+                partial[level].append(value)
+        swings = [_product(values) for values in partial]
+    else:
+        swings = [_product(factors) for factors in levels]
+
+    odd = 1
+    for swing in reversed(swings):
+        odd = odd * odd * swing
+    return odd << (n - bin(n).count("1"))
+
+
 if __name__ == "__main__":
     # Interactive factorial calculator
     try:
@@ -67,6 +282,7 @@ if __name__ == "__main__":
             try:
                 print(f"{n}! (recursive) = {factorial_recursive(n)}")
                 print(f"{n}! (iterative) = {factorial_iterative(n)}")
+                print(f"{n}! (fast) = {factorial_fast(n)}")
             except Exception as e:
                 print(f"Error: {e}")
     except (EOFError, KeyboardInterrupt):
@@ -1,9 +1,30 @@
 #!/usr/bin/env python3
 """Assignment 1 — list operations
 
-Provides a function to find the largest number in a user-provided list.
+Provides a function to find the largest number in a user-provided list,
+and streaming variants for inputs too large to hold in memory:
+- stream_stats(source, k=0) -> running count/min/max and top-k in O(k) memory
+- find_largest_stream(source) -> float
+
+`source` is any iterable of numbers or the path of a newline-delimited
+number file. Files are read in large binary chunks and, when NumPy is
+installed and use_numpy=True, each chunk is parsed and reduced vectorized.
 """
 
+import heapq
+import os
+from itertools import islice
+from typing import Iterable, List, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_BYTES = 1 << 22
+BATCH_SIZE = 1 << 16
+
+
 def find_largest(numbers: list[float]) -> float:
     """Return the largest number in the given list.
     
@@ -21,6 +42,125 @@ def find_largest(numbers: list[float]) -> float:
     return max(numbers)
 
 
+class RunningStats:
+    """Running count, min, max and the k largest values seen so far."""
+
+    def __init__(self, k: int = 0) -> None:
+        self.k = k
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._heap: List[float] = []  # min-heap of the k largest values
+
+    def add_many(self, values: Iterable[float]) -> None:
+        """Fold values into the running stats, one bounded batch at a time."""
+        iterator = iter(values)
+        while True:
+            batch = list(islice(iterator, BATCH_SIZE))
+            if not batch:
+                return
+            self._add_batch(batch, min(batch), max(batch))
+
+    def add_array(self, chunk) -> None:
+        """Fold a NumPy array into the running stats, vectorized."""
+        if not chunk.size:
+            return
+        if self.k and chunk.size > self.k:
+            top = np.partition(chunk, -self.k)[-self.k:]
+        else:
+            top = chunk
+        self._add_batch(top.tolist(), float(chunk.min()), float(chunk.max()), int(chunk.size))
+
+    def _add_batch(self, values: List[float], low: float, high: float, count: Optional[int] = None) -> None:
+        self.count += len(values) if count is None else count
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        if self.k:
+            self._heap = heapq.nlargest(self.k, self._heap + heapq.nlargest(self.k, values))
+            heapq.heapify(self._heap)
+
+    def top(self) -> List[float]:
+        """Return the k largest values, largest first."""
+        return sorted(self._heap, reverse=True)
+
+
+def _iter_file_chunks(path: str, chunk_bytes: int) -> Iterable[bytes]:
+    """Yield chunks of the file that always end on a line boundary."""
+    with open(path, "rb") as f:
+        tail = b""
+        while True:
+            block = f.read(chunk_bytes)
+            if not block:
+                break
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            if cut == 0:
+                tail = block
+                continue
+            tail = block[cut:]
+            yield block[:cut]
+        if tail:
+            yield tail
+
+
+def _parse_chunk(chunk: bytes) -> List[float]:
+    values = []
+    for token in chunk.split():
+        try:
+            values.append(float(token))
+        except ValueError:
+            raise ValueError(f"'{token.decode(errors='replace')}' is not a valid number") from None
+    return values
+
+
+def stream_stats(
+    source: Union[str, os.PathLike, Iterable[float]],
+    k: int = 0,
+    chunk_bytes: int = CHUNK_BYTES,
+    use_numpy: bool = True,
+) -> RunningStats:
+    """Scan `source` once and return its RunningStats.
+
+    Args:
+        source: path of a newline-delimited number file, or any iterable
+        k: how many of the largest values to keep (0 disables top-k)
+        chunk_bytes: read size for files
+        use_numpy: parse and reduce file chunks with NumPy when available
+
+    Raises:
+        ValueError: if a line in the file is not a number
+    """
+    stats = RunningStats(k)
+    if not isinstance(source, (str, os.PathLike)):
+        stats.add_many(source)
+        return stats
+    for chunk in _iter_file_chunks(os.fspath(source), chunk_bytes):
+        if use_numpy and np is not None:
+            try:
+                stats.add_array(np.fromstring(chunk, sep=" "))
+                continue
+            except ValueError:
+                pass  # fall through so the bad token gets a clear message
+        stats.add_many(_parse_chunk(chunk))
+    return stats
+
+
+def find_largest_stream(
+    source: Union[str, os.PathLike, Iterable[float]],
+    chunk_bytes: int = CHUNK_BYTES,
+    use_numpy: bool = True,
+) -> float:
+    """Return the largest number in `source` without building a list.
+
+    Raises:
+        ValueError: if the source holds no numbers
+    """
+    stats = stream_stats(source, chunk_bytes=chunk_bytes, use_numpy=use_numpy)
+    if stats.max is None:
+        raise ValueError("Cannot find largest in empty input")
+    return stats.max
+
+
 if __name__ == "__main__":
     print("Enter numbers one per line. Leave blank when done.")
     numbers = []
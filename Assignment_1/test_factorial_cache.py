@@ -0,0 +1,50 @@
+import math
+import unittest
+
+from task4 import FactorialCache, factorial_iterative, factorial_recursive
+
+
+def size(n):
+    return (math.factorial(n).bit_length() + 7) // 8
+
+
+class TestFactorialCache(unittest.TestCase):
+    def test_results_match_math_factorial(self):
+        cache = FactorialCache(step=16, max_bytes=4000)
+        for n in (100, 500, 1000, 2000, 300, 1500, 0, 1):
+            self.assertEqual(factorial_iterative(n, cache), math.factorial(n))
+            self.assertEqual(factorial_recursive(min(n, 900), cache), math.factorial(min(n, 900)))
+            self.assertLessEqual(cache.current_bytes, cache.max_bytes)
+        self.assertEqual(cache.current_bytes, sum(size(m) for m in cache._keys))
+        self.assertGreater(cache.hits, 0)
+
+    def test_large_idle_checkpoint_is_evicted_before_small_recent_one(self):
+        cache = FactorialCache(step=10, max_bytes=size(2000) + size(10) + size(1990))
+        cache.store(2000, math.factorial(2000))
+        cache.store(10, math.factorial(10))
+        self.assertEqual(cache.nearest(15), (10, math.factorial(10)))
+        cache.store(1990, math.factorial(1990))
+        cache.store(2010, math.factorial(2010))
+        self.assertEqual(cache._keys, [10, 2010])
+        self.assertEqual(cache.current_bytes, size(10) + size(2010))
+
+    def test_small_checkpoint_outlives_newer_large_ones(self):
+        # Plain LRU would evict 10! first, as it is the least recently used.
+        cache = FactorialCache(step=10, max_bytes=2 * size(2010) + size(10))
+        cache.store(10, math.factorial(10))
+        cache.store(2000, math.factorial(2000))
+        cache.store(2010, math.factorial(2010))
+        cache.store(2020, math.factorial(2020))
+        # Making room for 2020!, the largest idle checkpoint goes.
+        self.assertEqual(cache._keys, [10, 2000, 2020])
+
+    def test_values_over_the_cap_are_not_stored(self):
+        cache = FactorialCache(step=10, max_bytes=size(100) - 1)
+        cache.store(100, math.factorial(100))
+        self.assertEqual((len(cache), cache.current_bytes), (0, 0))
+        self.assertEqual(cache.nearest(100), (0, 1))
+        self.assertEqual(cache.misses, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
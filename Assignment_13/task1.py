@@ -1,4 +1,12 @@
-from typing import Callable, Dict
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Sequence, Tuple
+
+import common_package  # makes the shared `common` package importable
+from common.shape_areas import bulk_areas
+
+if TYPE_CHECKING:  # NumPy is only needed by the bulk functions
+    import numpy as np
 
 
 def _rectangle_area(length: float, width: float) -> float:
@@ -35,3 +43,18 @@ def calculate_area(shape: str, x: float, y: float = 0) -> float:
     return calculator(x, y)
 
 
+def calculate_areas(shapes: Sequence[str], x, y: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculate the areas of many shapes at once, vectorized.
+
+    Args:
+        shapes: Shape name per row, as accepted by calculate_area.
+        x: Primary dimension per row.
+        y: Secondary dimension per row (width for rectangles); 0 when omitted.
+
+    Returns:
+        (areas, invalid): float array matching calculate_area row by row
+        (NaN for rows it would reject) and a bool mask of those rows.
+    """
+    if y is None:
+        y = [0.0] * len(shapes)
+    return bulk_areas(shapes, x, y, pi=3.14, require_positive=False, supported=_AREA_DISPATCH)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Benchmark matrix for read_csv_column_stats backends.
+
+Generates CSV files of random floats for every (rows, columns) pair and
+times each installed backend on them, printing rows/s per backend.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from csv_backends import available_backends
+from task1 import read_csv_column_stats
+
+
+def write_csv(path: str, rows: int, columns: int) -> None:
+    with open(path, "w") as f:
+        f.write(",".join(f"c{i}" for i in range(columns)) + "\n")
+        for _ in range(rows):
+            f.write(",".join(f"{random.random():.6f}" for _ in range(columns)) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--columns", type=int, nargs="+", default=[2, 8, 32])
+    args = parser.parse_args()
+
+    backends = available_backends()
+    print(f"{'rows':>9} {'cols':>5} {'MB':>7} " + " ".join(f"{b + ' rows/s':>16}" for b in backends))
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            for columns in args.columns:
+                path = os.path.join(tmp, f"{rows}x{columns}.csv")
+                write_csv(path, rows, columns)
+                size_mb = os.path.getsize(path) / 1e6
+                cells = []
+                for backend in backends:
+                    start = time.perf_counter()
+                    read_csv_column_stats(path, backend=backend)
+                    cells.append(f"{rows / (time.perf_counter() - start):16,.0f}")
+                print(f"{rows:>9} {columns:>5} {size_mb:>7.1f} " + " ".join(cells))
+                os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Benchmark of batch palindrome classification.
+
+Times, on random short strings (product-code and handle-like, about a
+third of them palindromes):
+- the original per-call check, re.sub + lower + reversed copy
+- per-call task2.is_palindrome
+- classify_palindromes with one worker and with --workers processes
+and prints strings/s for each.
+"""
+
+import argparse
+import random
+import re
+import string
+import time
+
+from palindrome_batch import classify_palindromes
+from task2 import is_palindrome
+
+
+def is_palindrome_regex(s) -> bool:
+    if s is None:
+        return False
+    filtered = re.sub(r'[^0-9a-zA-Z]', '', str(s)).lower()
+    return filtered == filtered[::-1]
+
+
+def make_items(count: int):
+    alphabet = string.ascii_letters + string.digits + "-_. "
+    items = []
+    for _ in range(count):
+        half = "".join(random.choices(alphabet, k=random.randint(2, 8)))
+        if random.random() < 0.33:
+            items.append(half + half[::-1].swapcase())
+        else:
+            items.append(half + "".join(random.choices(alphabet, k=random.randint(1, 8))))
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    items = make_items(args.count)
+    runs = [
+        ("re.sub per call", lambda: [is_palindrome_regex(s) for s in items]),
+        ("is_palindrome per call", lambda: [is_palindrome(s) for s in items]),
+        ("classify, 1 worker", lambda: list(classify_palindromes(items, workers=1))),
+        ("classify, pool", lambda: list(classify_palindromes(items, workers=args.workers))),
+    ]
+    expected = None
+    print(f"{'method':<24} {'seconds':>9} {'strings/s':>14}")
+    for name, run in runs:
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = result
+        elif result != expected:
+            raise SystemExit(f"{name}: results differ from the re.sub reference")
+        print(f"{name:<24} {elapsed:>9.3f} {args.count / elapsed:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Benchmark of sum_even_odd on integer buffers.
+
+For each size, builds random int64 values as a NumPy array and an
+array('q') and times:
+- the validated Python loop (sum_even_odd on a list), up to --loop-max
+  elements since it runs at interpreter speed
+- sum_even_odd on the array('q') and on the NumPy array (vectorized path)
+and prints elements/s for each. The default sizes go up to 10^8 elements,
+which needs about 2 GB of memory for the two buffers.
+"""
+
+import argparse
+import time
+from array import array
+
+import numpy as np
+
+from task5 import sum_even_odd
+
+
+def throughput(func, values, count: int):
+    start = time.perf_counter()
+    result = func(values)
+    return result, count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**6, 10**7, 10**8])
+    parser.add_argument("--loop-max", type=int, default=10**7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'elements':>11} {'loop el/s':>14} {'array(q) el/s':>15} {'numpy el/s':>15}")
+    for size in args.sizes:
+        values = rng.integers(-(1 << 62), 1 << 62, size=size, dtype=np.int64)
+        buffer = array("q", values.tobytes())
+        expected, numpy_rate = throughput(sum_even_odd, values, size)
+        result, array_rate = throughput(sum_even_odd, buffer, size)
+        if result != expected:
+            raise SystemExit("array('q') result differs from the NumPy result")
+        loop_cell = f"{'skipped':>14}"
+        if size <= args.loop_max:
+            result, loop_rate = throughput(sum_even_odd, values.tolist(), size)
+            if result != expected:
+                raise SystemExit("loop result differs from the vectorized result")
+            loop_cell = f"{loop_rate:>14,.0f}"
+        print(f"{size:>11,} {loop_cell} {array_rate:>15,.0f} {numpy_rate:>15,.0f}")
+        del values, buffer
+
+
+if __name__ == "__main__":
+    main()
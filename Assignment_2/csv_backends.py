@@ -0,0 +1,154 @@
+"""Columnar backends for CSV column statistics.
+
+Provides scan_csv_columnar(filepath, column_name=None, backend="auto"),
+which returns the same (fieldnames, stats per column, rows) result as
+csv_stats.scan_csv but parses whole blocks of rows into typed arrays and
+computes the statistics vectorized:
+- "pyarrow": pyarrow.csv streaming reader, one record batch at a time
+- "numpy": numpy.loadtxt per block of lines, numpy.genfromtxt for blocks
+  with empty or non-numeric cells
+- "python": csv_stats.scan_csv, the pure-Python reference path
+- "auto": the first of the above that is installed
+
+Numeric columns are picked from the same row sample as the Python path.
+Empty and non-numeric cells are skipped (NaN counts as missing). When a file
+uses quoted fields, or pyarrow cannot convert a column, the scan falls back
+to the Python path so results never depend on a backend's quirks.
+"""
+
+from __future__ import annotations
+
+import csv
+from itertools import islice
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+
+from csv_stats import SAMPLE_ROWS, ColumnStats, prepare, scan_csv
+
+BACKENDS = ("auto", "pyarrow", "numpy", "python")
+CHUNK_ROWS = 1 << 18
+
+
+def available_backends() -> List[str]:
+    """Return the concrete backends usable in this environment, fastest first."""
+    backends = []
+    if pa is not None and np is not None:
+        backends.append("pyarrow")
+    if np is not None:
+        backends.append("numpy")
+    backends.append("python")
+    return backends
+
+
+def _numeric_columns(filepath: str, column_name: Optional[str], sample_rows: int):
+    with open(filepath, newline='') as f:
+        header, _, numeric = prepare(csv.reader(f), column_name, sample_rows)
+    return header, numeric
+
+
+def _parse_block(lines: List[str], numeric: List[int]):
+    """Parse the numeric columns of CSV lines into a 2-D float array."""
+    try:
+        table = np.loadtxt(lines, delimiter=",", usecols=numeric, dtype=np.float64,
+                           comments=None, ndmin=2)
+    except ValueError:
+        try:
+            # Empty or non-numeric cells: genfromtxt turns them into NaN.
+            table = np.genfromtxt(lines, delimiter=",", usecols=numeric, dtype=np.float64,
+                                  comments=None)
+        except ValueError:
+            # Rows of different lengths: fill cell by cell, like csv_stats.
+            table = np.full((len(lines), len(numeric)), np.nan)
+            for i, row in enumerate(csv.reader(lines)):
+                for j, index in enumerate(numeric):
+                    try:
+                        table[i, j] = float(row[index])
+                    except (ValueError, IndexError):
+                        continue
+    return table.reshape(-1, len(numeric))
+
+
+def _scan_numpy(filepath: str, header: List[str], numeric: List[int], sketches: bool):
+    stats = {index: ColumnStats(sketches) for index in numeric}
+    rows = 0
+    with open(filepath, newline='') as f:
+        f.readline()  # header
+        while True:
+            lines = [line for line in islice(f, CHUNK_ROWS) if line.strip()]
+            if not lines:
+                break
+            if any('"' in line for line in lines):
+                return None
+            rows += len(lines)
+            if not numeric:
+                continue
+            table = _parse_block(lines, numeric)
+            for j, index in enumerate(numeric):
+                column = table[:, j]
+                stats[index].merge(ColumnStats.from_array(column[~np.isnan(column)], sketches))
+    return header, {header[index]: column for index, column in stats.items()}, rows
+
+
+def _scan_pyarrow(filepath: str, header: List[str], numeric: List[int], sketches: bool):
+    names = [header[index] for index in numeric]
+    if len(set(header)) != len(header):
+        return None  # duplicate column names: let csv.reader semantics decide
+    convert = pa_csv.ConvertOptions(
+        include_columns=names,
+        column_types={name: pa.float64() for name in names},
+        strings_can_be_null=True,
+    )
+    stats = {name: ColumnStats(sketches) for name in names}
+    rows = 0
+    try:
+        reader = pa_csv.open_csv(filepath, read_options=pa_csv.ReadOptions(block_size=1 << 24),
+                                 convert_options=convert)
+        for batch in reader:
+            rows += batch.num_rows
+            for name in names:
+                values = batch.column(name).drop_null().to_numpy(zero_copy_only=False)
+                stats[name].merge(ColumnStats.from_array(values[~np.isnan(values)], sketches))
+    except pa.ArrowInvalid:
+        return None  # a cell is not a number: the Python path skips it instead
+    return header, stats, rows
+
+
+def scan_csv_columnar(
+    filepath: str,
+    column_name: Optional[str] = None,
+    sample_rows: int = SAMPLE_ROWS,
+    sketches: bool = False,
+    backend: str = "auto",
+):
+    """Like csv_stats.scan_csv, using a vectorized backend (see module docstring).
+
+    Raises:
+        ValueError: if backend is unknown or not installed
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+    if backend == "auto":
+        backend = available_backends()[0]
+    elif backend not in available_backends():
+        raise ValueError(f"backend {backend!r} is not installed")
+    if backend == "python":
+        return scan_csv(filepath, column_name, sample_rows, sketches)
+
+    header, numeric = _numeric_columns(filepath, column_name, sample_rows)
+    if header is None:
+        return None, {}, 0
+    scan = _scan_pyarrow if backend == "pyarrow" else _scan_numpy
+    result = scan(filepath, header, numeric, sketches)
+    if result is None:
+        return scan_csv(filepath, column_name, sample_rows, sketches)
+    return result
@@ -0,0 +1,296 @@
+"""Single-pass streaming statistics over CSV columns.
+
+Provides:
+- ColumnStats: running count, mean, variance (Welford), min and max
+- scan_csv(filepath, column_name=None) -> (fieldnames, stats per column, rows)
+- scan_csv_parallel(filepath, column_name=None, workers=None) -> same result,
+  computed by worker processes over newline-aligned byte ranges
+- scan_range(filepath, start, end, ...) -> partial stats of one byte range
+- prepare(reader, column_name, sample_rows) -> header, sample and numeric columns
+
+Rows are streamed with csv.reader, so memory use does not depend on the
+file size. The numeric columns are inferred from the first `sample_rows`
+rows: a column is tracked when at least one sampled cell parses as a float
+(the requested column is always tracked). Cells that do not parse, and
+"nan" cells, are skipped.
+
+In the parallel scan every worker returns mergeable partial ColumnStats
+(count, mean, M2, min, max) that are combined with ColumnStats.merge.
+Splitting on raw newlines is only valid when no quoted field spans lines,
+so workers also report whether any line has an odd number of quote
+characters; if one does, the result is discarded and the file is scanned
+serially instead.
+
+With sketches=True every column also carries a t-digest and a HyperLogLog
+(sketches.py), filled in the same pass and merged the same way, for
+approximate percentiles, histograms and distinct counts.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import locale
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import common_package  # makes the shared `common` package importable
+from common.csvblocks import has_open_quote, iter_line_blocks, split_offsets
+from sketches import HyperLogLog, TDigest
+
+SAMPLE_ROWS = 1000
+# Files smaller than this are always scanned serially.
+PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+
+class ColumnStats:
+    """Running statistics of one numeric column (Welford's algorithm)."""
+
+    __slots__ = ("count", "mean", "m2", "min", "max", "digest", "distinct")
+
+    def __init__(self, sketches: bool = False) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.digest = TDigest() if sketches else None
+        self.distinct = HyperLogLog() if sketches else None
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if self.digest is not None:
+            self.digest.add(x)
+            self.distinct.add(x)
+
+    @classmethod
+    def from_array(cls, values, sketches: bool = False) -> "ColumnStats":
+        """Build the stats of a 1-D NumPy float array in a few vectorized passes."""
+        stats = cls(sketches)
+        if values.size:
+            stats.count = int(values.size)
+            stats.mean = float(values.mean())
+            stats.m2 = float(((values - stats.mean) ** 2).sum())
+            stats.min = float(values.min())
+            stats.max = float(values.max())
+            if sketches:
+                for x in values.tolist():
+                    stats.digest.add(x)
+                    stats.distinct.add(x)
+        return stats
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        """Fold another partial result into this one (Chan et al.)."""
+        if not other.count:
+            return self
+        if self.digest is not None and other.digest is not None:
+            self.digest.merge(other.digest)
+            self.distinct.merge(other.distinct)
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0.0 for fewer than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def histogram(self, bins: Union[int, Sequence[float]]) -> Tuple[List[float], List[float]]:
+        """Return (edges, approximate counts) from the t-digest.
+
+        `bins` is either a number of equal-width bins spanning [min, max],
+        whose counts then add up to `count`, or the bin edges themselves.
+        """
+        if isinstance(bins, int):
+            width = (self.max - self.min) / bins
+            edges = [self.min + i * width for i in range(bins)] + [self.max]
+            # Open outer edges so the values at min and max are all counted.
+            return edges, self.digest.histogram([-math.inf] + edges[1:-1] + [math.inf])
+        edges = [float(edge) for edge in bins]
+        return edges, self.digest.histogram(edges)
+
+    def as_dict(
+        self,
+        percentiles: Optional[Sequence[float]] = None,
+        histogram: Optional[Union[int, Sequence[float]]] = None,
+    ) -> Dict[str, float]:
+        """Return the stats; with sketches, also "p<q>" for each percentile and "distinct".
+
+        With `histogram` (see ColumnStats.histogram) the result also has
+        "histogram" (counts) and "histogram_edges".
+        """
+        result = {
+            "mean": self.mean,
+            "min": self.min,
+            "max": self.max,
+            "count": self.count,
+            "variance": self.variance,
+        }
+        if self.digest is not None:
+            for q in percentiles or ():
+                result[f"p{q:g}"] = self.digest.quantile(q / 100)
+            result["distinct"] = self.distinct.estimate()
+            if histogram is not None:
+                result["histogram_edges"], result["histogram"] = self.histogram(histogram)
+        return result
+
+
+def _has_number(rows: List[List[str]], index: int) -> bool:
+    for row in rows:
+        try:
+            float(row[index])
+        except (ValueError, IndexError):
+            continue
+        return True
+    return False
+
+
+def _accumulate(rows: Iterable[List[str]], stats: Dict[int, ColumnStats]) -> int:
+    """Feed rows into the per-column stats; return the number of data rows."""
+    count = 0
+    for row in rows:
+        if not row:
+            continue
+        count += 1
+        for index, column in stats.items():
+            try:
+                x = float(row[index])
+            except (ValueError, IndexError):
+                continue
+            if x == x:  # NaN counts as missing, as in the columnar backends
+                column.add(x)
+    return count
+
+
+def prepare(
+    reader: Iterator[List[str]], column_name: Optional[str], sample_rows: int
+) -> Tuple[Optional[List[str]], List[List[str]], List[int]]:
+    """Read the header and sample; return (header, sample rows, numeric column indexes)."""
+    header = next(reader, None)
+    if header is None:
+        return None, [], []
+    # Later duplicates win, like csv.DictReader.
+    positions = {name: index for index, name in enumerate(header)}
+    sample = [row for row in islice(reader, sample_rows) if row]
+    if column_name is not None:
+        numeric = [positions[column_name]] if column_name in positions else []
+    else:
+        numeric = [i for i in sorted(positions.values()) if _has_number(sample, i)]
+    return header, sample, numeric
+
+
+def scan_csv(
+    filepath: str,
+    column_name: Optional[str] = None,
+    sample_rows: int = SAMPLE_ROWS,
+    sketches: bool = False,
+) -> Tuple[Optional[List[str]], Dict[str, ColumnStats], int]:
+    """Stream `filepath` once and collect ColumnStats for its numeric columns.
+
+    Args:
+        filepath: CSV file whose first row is the header
+        column_name: only track this column (None: every numeric column)
+        sample_rows: rows used to decide which columns are numeric
+        sketches: also build a t-digest and HyperLogLog per column
+
+    Returns:
+        (fieldnames, stats keyed by column name, number of data rows);
+        fieldnames is None when the file is empty.
+    """
+    with open(filepath, newline='') as f:
+        reader = csv.reader(f)
+        header, sample, numeric = prepare(reader, column_name, sample_rows)
+        if header is None:
+            return None, {}, 0
+        stats = {index: ColumnStats(sketches) for index in numeric}
+        rows = _accumulate(chain(sample, reader), stats)
+    return header, {header[index]: column for index, column in stats.items()}, rows
+
+
+def scan_range(
+    filepath: str, start: int, end: int, numeric: List[int], encoding: str, sketches: bool
+) -> Tuple[Dict[int, ColumnStats], int, bool]:
+    """Scan the rows in the byte range [start, end), which must begin at a line start.
+
+    Returns (stats keyed by column index, rows, saw_open_quote).
+    """
+    stats = {index: ColumnStats(sketches) for index in numeric}
+    rows = 0
+    with open(filepath, "rb") as f:
+        f.seek(start)
+        for block in iter_line_blocks(f, end):
+            if has_open_quote(block):
+                return stats, rows, True
+            text = io.StringIO(block.decode(encoding), newline='')
+            rows += _accumulate(csv.reader(text), stats)
+    return stats, rows, False
+
+
+def scan_csv_parallel(
+    filepath: str,
+    column_name: Optional[str] = None,
+    workers: Optional[int] = None,
+    sample_rows: int = SAMPLE_ROWS,
+    sketches: bool = False,
+) -> Tuple[Optional[List[str]], Dict[str, ColumnStats], int]:
+    """Like scan_csv, but split the file across worker processes.
+
+    The header and sample are read here to pick the numeric columns; the
+    rest of the file is cut at line starts into one range per worker.
+    Falls back to scan_csv for small files or when a quoted field may span
+    lines.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or os.path.getsize(filepath) < PARALLEL_MIN_BYTES:
+        return scan_csv(filepath, column_name, sample_rows, sketches)
+
+    with open(filepath, "rb") as f:
+        header_line = f.readline()
+        data_start = f.tell()
+    encoding = locale.getpreferredencoding(False)
+    if header_line.count(b'"') & 1:
+        return scan_csv(filepath, column_name, sample_rows, sketches)
+    with open(filepath, newline='') as f:
+        header, _, numeric = prepare(csv.reader(f), column_name, sample_rows)
+    if header is None:
+        return None, {}, 0
+
+    offsets = split_offsets(filepath, data_start, workers)
+    stats = {index: ColumnStats(sketches) for index in numeric}
+    rows = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(scan_range, filepath, start, end, numeric, encoding, sketches)
+            for start, end in zip(offsets, offsets[1:])
+        ]
+        for future in futures:
+            partial, partial_rows, open_quote = future.result()
+            if open_quote:
+                # A quoted field may contain a newline: the byte split is unsafe.
+                for other in futures:
+                    other.cancel()
+                return scan_csv(filepath, column_name, sample_rows, sketches)
+            for index, column in partial.items():
+                stats[index].merge(column)
+            rows += partial_rows
+    return header, {header[index]: column for index, column in stats.items()}, rows
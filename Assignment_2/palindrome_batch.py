@@ -0,0 +1,85 @@
+"""Batch palindrome classification.
+
+Provides classify_palindromes(iterable, workers=None) -> iterator of bools,
+one per item, with the same answer as task2.is_palindrome: None is False,
+anything else is converted with str(), ASCII alphanumerics are kept and
+compared case-insensitively.
+
+Items are normalized with the cached translation table of
+common.palindromes (one str.translate per item, no regex), in chunks of
+`chunk_size`. With more than one worker the chunks are classified by a
+ProcessPoolExecutor; only a bounded number of chunks is in flight at a time,
+so the input may be a generator of any length and results stream back in
+input order.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional
+
+import common_package  # makes the shared `common` package importable
+from common.palindromes import Normalizer
+
+CHUNK_SIZE = 1 << 14
+# Chunks queued per worker: enough to keep workers busy, bounded for memory.
+PREFETCH = 4
+
+_TABLE = Normalizer("alnum").table
+
+
+def _normalize(item: Any) -> Optional[str]:
+    return None if item is None else str(item).translate(_TABLE)
+
+
+def _classify_chunk(items: List[Any]) -> List[bool]:
+    texts = [item.translate(_TABLE) if type(item) is str else _normalize(item) for item in items]
+    return [text is not None and text == text[::-1] for text in texts]
+
+
+def _chunks(items: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def classify_palindromes(
+    items: Iterable[Any],
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[bool]:
+    """Yield is_palindrome(item) for every item, in input order.
+
+    Args:
+        items: any iterable, consumed lazily
+        workers: worker processes (default: CPU count; 1 classifies in
+            this process)
+        chunk_size: items per task sent to a worker
+
+    Raises:
+        ValueError: if chunk_size is not positive
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = _chunks(items, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _classify_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_classify_chunk, chunk))
+            if len(pending) >= workers * PREFETCH:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,291 @@
+"""Numerically stable reductions over float buffers and streams.
+
+Provides:
+- total(values), sum_of_squares(values), dot(a, b), norm(values)
+- CompensatedSum: Neumaier (improved Kahan) running sum
+- StreamReducer / reduce_stream(stream): count, sum, sum of squares and
+  norm of every number in a binary stream, parsed block by block with
+  common.fastparse
+
+Inputs may be array('d'), memoryview or any buffer of doubles (viewed
+without copying), NumPy arrays, or plain iterables of numbers. They are
+reduced in chunks of CHUNK_SIZE, so temporaries stay bounded. Each chunk
+is summed with _sum2, a vectorized pairwise summation that also sums the
+exact rounding error of every addition (TwoSum, as in Ogita-Rump-Oishi
+Sum2), and the chunk sums and errors are combined with a CompensatedSum.
+The result is as accurate as if it had been computed with twice the
+precision, so cancellation does not lose the small terms and, short of
+condition numbers beyond about 1e16, the results agree with math.fsum
+(used instead without NumPy) to the last bit or two.
+
+task4.sum_of_squares remains the plain reference implementation.
+"""
+
+from __future__ import annotations
+
+import math
+import sys
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import common_package  # makes the shared `common` package importable
+from common.fastparse import ParseError, iter_blocks, parse_block
+
+CHUNK_SIZE = 1 << 16
+
+
+class CompensatedSum:
+    """Running sum with Neumaier compensation for the rounding error."""
+
+    __slots__ = ("_sum", "_compensation")
+
+    def __init__(self) -> None:
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    def add(self, x: float) -> None:
+        t = self._sum + x
+        if abs(self._sum) >= abs(x):
+            self._compensation += (self._sum - t) + x
+        else:
+            self._compensation += (x - t) + self._sum
+        self._sum = t
+
+    def scale(self, factor: float) -> None:
+        self._sum *= factor
+        self._compensation *= factor
+
+    @property
+    def value(self) -> float:
+        if not math.isfinite(self._sum):
+            return self._sum  # the compensation is NaN once the sum is inf
+        return self._sum + self._compensation
+
+
+def _is_double_buffer(values) -> bool:
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return False
+    return view.format == "d"
+
+
+def _as_array(values) -> "np.ndarray":
+    """Return values as a flat float64 array, viewing double buffers without copying."""
+    if isinstance(values, np.ndarray):
+        return values.astype(np.float64, copy=False).ravel()
+    if _is_double_buffer(values):
+        return np.frombuffer(values, dtype=np.float64)
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    return np.asarray(values, dtype=np.float64).ravel()
+
+
+def _chunks(values, chunk_size: int = CHUNK_SIZE) -> Iterator:
+    """Yield the values as float64 chunks (NumPy arrays, or lists without NumPy)."""
+    if np is None:
+        iterator = iter(values)
+        while True:
+            chunk = [float(x) for x in islice(iterator, chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+    arr = _as_array(values)
+    for start in range(0, arr.size, chunk_size):
+        yield arr[start:start + chunk_size]
+
+
+def _sum2(chunk: "np.ndarray") -> Tuple[float, float]:
+    """Return (sum, error) of a float64 array, in twice the working precision.
+
+    Pairs are added level by level, and the rounding error of every
+    addition is recovered exactly with TwoSum and summed separately; the
+    last few partial sums are added with math.fsum, keeping its residual. With inf or NaN
+    values, or if an intermediate sum overflows, NumPy's plain sum is
+    returned with no error term.
+    """
+    with np.errstate(over="ignore", invalid="ignore"):
+        plain = float(chunk.sum())
+        if not math.isfinite(plain):
+            return plain, 0.0
+        error = 0.0
+        rest = []
+        while chunk.size > 64:
+            half = chunk.size // 2
+            if chunk.size & 1:
+                rest.append(float(chunk[-1]))
+            a, b = chunk[:half], chunk[half:2 * half]
+            s = a + b
+            b_part = s - a
+            error += float(((a - (s - b_part)) + (b - b_part)).sum())
+            chunk = s
+        rest.extend(chunk.tolist())
+        try:
+            high = math.fsum(rest)
+            rest.append(-high)
+            error += math.fsum(rest)
+        except (OverflowError, ValueError):
+            return plain, 0.0
+    if not (math.isfinite(high) and math.isfinite(error)):
+        return plain, 0.0
+    return high, error
+
+
+def _add_sum(result: CompensatedSum, chunk: "np.ndarray") -> None:
+    high, error = _sum2(chunk)
+    result.add(high)
+    result.add(error)
+
+
+def _add_fsum(result: CompensatedSum, chunk: List[float]) -> None:
+    """Add math.fsum(chunk) and its rounding error (the no-NumPy _add_sum)."""
+    high = math.fsum(chunk)
+    result.add(high)
+    if math.isfinite(high):
+        result.add(math.fsum(chunk + [-high]))
+
+
+def total(values) -> float:
+    """Return the sum of values."""
+    if np is None:
+        return math.fsum(values)
+    result = CompensatedSum()
+    for chunk in _chunks(values):
+        _add_sum(result, chunk)
+    return result.value
+
+
+def sum_of_squares(values) -> float:
+    """Return the sum of x * x over values."""
+    if np is None:
+        return math.fsum(x * x for x in map(float, values))
+    result = CompensatedSum()
+    for chunk in _chunks(values):
+        with np.errstate(over="ignore"):
+            _add_sum(result, np.square(chunk))
+    return result.value
+
+
+def dot(a, b) -> float:
+    """Return the dot product of two sequences of the same length.
+
+    Raises:
+        ValueError: if the lengths differ
+    """
+    if np is None:
+        a, b = list(a), list(b)
+        if len(a) != len(b):
+            raise ValueError("dot: sequences must have the same length")
+        return math.fsum(float(x) * float(y) for x, y in zip(a, b))
+    a, b = _as_array(a), _as_array(b)
+    if a.size != b.size:
+        raise ValueError("dot: sequences must have the same length")
+    result = CompensatedSum()
+    for start in range(0, a.size, CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        with np.errstate(over="ignore", invalid="ignore"):
+            _add_sum(result, a[start:stop] * b[start:stop])
+    return result.value
+
+
+class StreamReducer:
+    """Accumulates count, sum, sum of squares and a scaled 2-norm chunk by chunk.
+
+    The norm is kept as scale * sqrt(ssq) with scale = max |x| so far (as in
+    LAPACK dnrm2), so it neither overflows nor underflows where the sum of
+    squares would.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._sum = CompensatedSum()
+        self._squares = CompensatedSum()
+        self._scale = 0.0
+        self._ssq = CompensatedSum()
+
+    def update(self, values) -> "StreamReducer":
+        for chunk in _chunks(values):
+            if np is None:
+                n = len(chunk)
+                if not n:
+                    continue
+                _add_fsum(self._sum, chunk)
+                _add_fsum(self._squares, [x * x for x in chunk])
+                peak = max(abs(x) for x in chunk)
+            else:
+                n = int(chunk.size)
+                if not n:
+                    continue
+                _add_sum(self._sum, chunk)
+                with np.errstate(over="ignore"):  # inf, as the norm below is not
+                    _add_sum(self._squares, np.square(chunk))
+                peak = float(np.abs(chunk).max())
+            self.count += n
+            if peak == 0.0 or not math.isfinite(peak):
+                if not math.isfinite(peak):
+                    self._scale = peak
+                continue
+            if peak > self._scale:
+                if self._scale:
+                    self._ssq.scale((self._scale / peak) ** 2)
+                self._scale = peak
+            if np is None:
+                _add_fsum(self._ssq, [(x / self._scale) ** 2 for x in chunk])
+            else:
+                _add_sum(self._ssq, np.square(chunk / self._scale))
+        return self
+
+    @property
+    def sum(self) -> float:
+        return self._sum.value
+
+    @property
+    def sum_of_squares(self) -> float:
+        return self._squares.value
+
+    @property
+    def norm(self) -> float:
+        if not math.isfinite(self._scale):
+            return self._scale
+        return self._scale * math.sqrt(self._ssq.value)
+
+
+def norm(values) -> float:
+    """Return the Euclidean norm of values, without intermediate overflow."""
+    return StreamReducer().update(values).norm
+
+
+def reduce_stream(
+    stream: Optional[BinaryIO] = None,
+    block_size: int = 1 << 20,
+    errors: str = "raise",
+) -> Tuple[StreamReducer, List[Tuple[int, str]]]:
+    """Reduce every number in a binary stream (default: sys.stdin.buffer).
+
+    The stream is parsed one block at a time, so memory use does not depend
+    on its size.
+
+    Returns:
+        (reducer, bad_tokens) where bad_tokens is a list of (offset, token)
+
+    Raises:
+        ParseError: on the first bad token when errors="raise"
+    """
+    if errors not in ("raise", "skip"):
+        raise ValueError(f"errors must be 'raise' or 'skip', got {errors!r}")
+    if stream is None:
+        stream = sys.stdin.buffer
+    reducer = StreamReducer()
+    bad_tokens: List[Tuple[int, str]] = []
+    for offset, block in iter_blocks(stream, block_size):
+        values, bad = parse_block(block, offset, "float")
+        if bad and errors == "raise":
+            raise ParseError(*bad[0], "float")
+        reducer.update(values)
+        bad_tokens.extend(bad)
+    return reducer, bad_tokens
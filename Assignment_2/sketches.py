@@ -0,0 +1,187 @@
+"""Mergeable streaming sketches for approximate quantiles and distinct counts.
+
+Provides:
+- TDigest: merging t-digest (Dunning) for quantiles, CDF and histograms
+- HyperLogLog: distinct-value estimator
+
+Both use memory bounded by their parameters, not by the number of values,
+and both support merge() so that partial sketches built by separate chunks
+or worker processes combine into the sketch of the whole input.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+from operator import itemgetter
+from typing import List, Sequence, Tuple
+
+_MASK64 = (1 << 64) - 1
+_DOUBLE = struct.Struct("<d")
+
+
+class TDigest:
+    """Merging t-digest with the k1 (arcsine) scale function.
+
+    Values are buffered and folded into at most about `compression`
+    centroids whenever the buffer fills up; quantiles are most accurate
+    near the tails, which is what p95/p99 need.
+    """
+
+    def __init__(self, compression: float = 200.0, buffer_size: int = 4096) -> None:
+        self.compression = compression
+        self.buffer_size = buffer_size
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._centroids: List[Tuple[float, float]] = []  # (mean, weight), sorted
+        self._buffer: List[Tuple[float, float]] = []
+
+    def add(self, x: float, weight: float = 1.0) -> None:
+        self._buffer.append((x, weight))
+        self.count += weight
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if len(self._buffer) >= self.buffer_size:
+            self._compress()
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Fold another digest into this one."""
+        other._compress()
+        self._buffer.extend(other._centroids)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _k_to_q(self, k: float) -> float:
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(2 * math.pi * k / self.compression) + 1) / 2
+
+    def _q_to_k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        items = self._centroids + self._buffer
+        items.sort(key=itemgetter(0))
+        self._buffer = []
+        total = self.count
+
+        merged: List[Tuple[float, float]] = []
+        done = 0.0
+        limit = total * self._k_to_q(self._q_to_k(0.0) + 1)
+        mean, weight = items[0]
+        for x, w in items[1:]:
+            if done + weight + w <= limit:
+                weight += w
+                mean += (x - mean) * w / weight
+            else:
+                merged.append((mean, weight))
+                done += weight
+                limit = total * self._k_to_q(self._q_to_k(done / total) + 1)
+                mean, weight = x, w
+        merged.append((mean, weight))
+        self._centroids = merged
+
+    def quantile(self, q: float) -> float:
+        """Return the approximate q-quantile (0 <= q <= 1); NaN when empty."""
+        self._compress()
+        if not self._centroids:
+            return math.nan
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        target = q * self.count
+        # Interpolate between the centres of neighbouring centroids, with the
+        # exact min and max as the two outer anchors.
+        prev_pos, prev_value = 0.0, self.min
+        cumulative = 0.0
+        for mean, weight in self._centroids:
+            center = cumulative + weight / 2
+            if target < center:
+                span = center - prev_pos
+                t = (target - prev_pos) / span if span else 0.0
+                return prev_value + t * (mean - prev_value)
+            prev_pos, prev_value = center, mean
+            cumulative += weight
+        span = self.count - prev_pos
+        t = (target - prev_pos) / span if span else 0.0
+        return prev_value + t * (self.max - prev_value)
+
+    def cdf(self, x: float) -> float:
+        """Return the approximate fraction of values <= x."""
+        self._compress()
+        if not self._centroids or x < self.min:
+            return 0.0
+        if x >= self.max:
+            return 1.0
+        prev_pos, prev_value = 0.0, self.min
+        cumulative = 0.0
+        for mean, weight in self._centroids:
+            center = cumulative + weight / 2
+            if x < mean:
+                span = mean - prev_value
+                t = (x - prev_value) / span if span else 1.0
+                return (prev_pos + t * (center - prev_pos)) / self.count
+            prev_pos, prev_value = center, mean
+            cumulative += weight
+        span = self.max - prev_value
+        t = (x - prev_value) / span if span else 1.0
+        return (prev_pos + t * (self.count - prev_pos)) / self.count
+
+    def histogram(self, edges: Sequence[float]) -> List[float]:
+        """Return the approximate number of values in each [edges[i], edges[i+1])."""
+        fractions = [self.cdf(edge) for edge in edges]
+        return [(b - a) * self.count for a, b in zip(fractions, fractions[1:])]
+
+
+def _mix64(h: int) -> int:
+    """splitmix64 finaliser: spread the input bits over all 64 output bits."""
+    h = (h ^ (h >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    h = (h ^ (h >> 27)) * 0x94D049BB133111EB & _MASK64
+    return h ^ (h >> 31)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over floats with 2^precision registers.
+
+    The standard error is about 1.04 / sqrt(2^precision), i.e. 0.8% for the
+    default precision of 14 (16 KiB of registers).
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, x: float) -> None:
+        # + 0.0 maps -0.0 to 0.0 so both count as the same value
+        h = _mix64(int.from_bytes(_DOUBLE.pack(x + 0.0), "little"))
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = 64 - self.precision - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("cannot merge HyperLogLogs with different precision")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+        return self
+
+    def estimate(self) -> float:
+        m = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # linear counting for small sets
+        return raw
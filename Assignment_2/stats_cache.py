@@ -0,0 +1,200 @@
+"""Persistent sidecar cache for CSV column statistics.
+
+Provides:
+- cached_scan_csv(filepath, ...) -> same result as csv_stats.scan_csv,
+  served from the cache when the file is unchanged
+- evict(cache_dir, max_bytes, max_entries) -> trims the cache directory
+
+Each entry is keyed on the file path and the scan options, and records the
+file size, mtime and a hash of evenly spaced content samples. A lookup is:
+- a hit when size, mtime and sample hash all match;
+- an incremental refresh when the file only grew: the samples of the first
+  `old size` bytes still hash the same, the old content ended with a
+  newline and its column sample was complete, so only the appended tail is
+  scanned and merged into the cached ColumnStats;
+- a full rescan otherwise.
+
+Entries are pickled ColumnStats, written atomically. After every write the
+directory is trimmed least-recently-used first (entry mtime is bumped on
+each hit) to CACHE_MAX_BYTES / CACHE_MAX_ENTRIES.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import locale
+import os
+import pickle
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from csv_stats import SAMPLE_ROWS, ColumnStats, scan_range, scan_csv, scan_csv_parallel
+
+CACHE_VERSION = 1
+CACHE_DIR = os.environ.get(
+    "CSV_STATS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "csv_stats")
+)
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_MAX_ENTRIES = 1000
+
+# Content samples hashed for the fingerprint: count and size of each.
+_SAMPLES = 16
+_SAMPLE_BYTES = 4096
+
+ScanResult = Tuple[Optional[List[str]], Dict[str, ColumnStats], int]
+
+
+def fingerprint(filepath: str, size: int) -> str:
+    """Hash evenly spaced samples of the first `size` bytes of the file."""
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(filepath, "rb") as f:
+        if size <= _SAMPLES * _SAMPLE_BYTES:
+            digest.update(f.read(size))
+        else:
+            last = size - _SAMPLE_BYTES
+            for i in range(_SAMPLES):
+                f.seek(last * i // (_SAMPLES - 1))
+                digest.update(f.read(_SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
+def _ends_with_newline(filepath: str, size: int) -> bool:
+    if size == 0:
+        return False
+    with open(filepath, "rb") as f:
+        f.seek(size - 1)
+        return f.read(1) == b"\n"
+
+
+def _entry_path(cache_dir: str, filepath: str, options: tuple) -> str:
+    key = repr((os.path.abspath(filepath), options)).encode()
+    return os.path.join(cache_dir, hashlib.sha1(key).hexdigest() + ".stats")
+
+
+def _load(path: str) -> Optional[dict]:
+    try:
+        with open(path, "rb") as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+        return None
+    return entry
+
+
+def _store(path: str, entry: dict) -> None:
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def evict(
+    cache_dir: str = CACHE_DIR,
+    max_bytes: int = CACHE_MAX_BYTES,
+    max_entries: int = CACHE_MAX_ENTRIES,
+) -> int:
+    """Delete least recently used entries until both limits hold; return how many."""
+    try:
+        names = [name for name in os.listdir(cache_dir) if name.endswith(".stats")]
+    except FileNotFoundError:
+        return 0
+    entries = []
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime_ns, st.st_size, path))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes and len(entries) - removed <= max_entries:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def cached_scan_csv(
+    filepath: str,
+    column_name: Optional[str] = None,
+    sample_rows: int = SAMPLE_ROWS,
+    sketches: bool = False,
+    workers: int = 1,
+    cache_dir: Optional[str] = None,
+) -> ScanResult:
+    """scan_csv with a persistent cache; see the module docstring."""
+    cache_dir = cache_dir or CACHE_DIR
+    entry_path = _entry_path(cache_dir, filepath, (column_name, sample_rows, sketches))
+    st = os.stat(filepath)
+    entry = _load(entry_path)
+
+    if entry is not None and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        if entry["fingerprint"] == fingerprint(filepath, st.st_size):
+            os.utime(entry_path)  # mark as recently used
+            return entry["header"], entry["stats"], entry["rows"]
+
+    result = None
+    if (
+        entry is not None
+        and entry["header"] is not None
+        and st.st_size > entry["size"]
+        and entry["ends_with_newline"]
+        # numeric columns are final once the sample was full (or fixed by name)
+        and (column_name is not None or entry["rows"] >= sample_rows)
+        and entry["fingerprint"] == fingerprint(filepath, entry["size"])
+    ):
+        result = _refresh_tail(filepath, entry, st.st_size, sketches)
+    if result is None:
+        if workers > 1:
+            result = scan_csv_parallel(filepath, column_name, workers, sample_rows, sketches)
+        else:
+            result = scan_csv(filepath, column_name, sample_rows, sketches)
+
+    header, stats, rows = result
+    after = os.stat(filepath)
+    if (after.st_size, after.st_mtime_ns) != (st.st_size, st.st_mtime_ns):
+        return result  # changed while scanning: do not cache a mixed result
+    _store(entry_path, {
+        "version": CACHE_VERSION,
+        "path": os.path.abspath(filepath),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "fingerprint": fingerprint(filepath, st.st_size),
+        "ends_with_newline": _ends_with_newline(filepath, st.st_size),
+        "header": header,
+        "stats": stats,
+        "rows": rows,
+    })
+    evict(cache_dir)
+    return result
+
+
+def _refresh_tail(filepath: str, entry: dict, size: int, sketches: bool) -> Optional[ScanResult]:
+    """Scan only the bytes appended since the entry was written and merge them."""
+    header = entry["header"]
+    positions = {name: index for index, name in enumerate(header)}
+    names = {positions[name]: name for name in entry["stats"]}
+    encoding = locale.getpreferredencoding(False)
+    partial, rows, open_quote = scan_range(
+        filepath, entry["size"], size, sorted(names), encoding, sketches
+    )
+    if open_quote:
+        return None  # a quoted field may span lines: rescan from the start
+    stats = entry["stats"]
+    for index, column in partial.items():
+        stats[names[index]].merge(column)
+    return header, stats, entry["rows"] + rows
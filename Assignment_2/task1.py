@@ -1,62 +1,107 @@
-import csv
-from typing import Optional, Dict
+from typing import Optional, Dict, Sequence, Union
 
+from csv_backends import scan_csv_columnar
+from csv_stats import SAMPLE_ROWS, scan_csv, scan_csv_parallel
+from stats_cache import cached_scan_csv
 
-def read_csv_stats(filepath: str, column_name: Optional[str] = None) -> Dict[str, float]:
+
+def _scan(filepath: str, column_name: Optional[str], workers: int, sample_rows: int,
+		  percentiles: Optional[Sequence[float]], histogram: Optional[Union[int, Sequence[float]]],
+		  cache: bool, backend: str):
+	if percentiles is not None and not all(0 <= q <= 100 for q in percentiles):
+		raise ValueError("percentiles must be between 0 and 100")
+	if isinstance(histogram, int):
+		if histogram < 1:
+			raise ValueError("histogram bin count must be positive")
+	elif histogram is not None:
+		edges = list(histogram)
+		if len(edges) < 2 or any(a >= b for a, b in zip(edges, edges[1:])):
+			raise ValueError("histogram edges must be at least two increasing values")
+	sketches = percentiles is not None or histogram is not None
+	if cache:
+		return cached_scan_csv(filepath, column_name, sample_rows, sketches, workers)
+	if workers > 1:
+		return scan_csv_parallel(filepath, column_name, workers, sample_rows, sketches)
+	if backend != "python":
+		return scan_csv_columnar(filepath, column_name, sample_rows, sketches, backend)
+	return scan_csv(filepath, column_name, sample_rows, sketches)
+
+
+def read_csv_stats(
+	filepath: str,
+	column_name: Optional[str] = None,
+	workers: int = 1,
+	percentiles: Optional[Sequence[float]] = None,
+	cache: bool = False,
+	backend: str = "python",
+	histogram: Optional[Union[int, Sequence[float]]] = None,
+) -> Dict[str, float]:
 	"""Read a CSV file and return mean, min, max for a numeric column.
 
 	If `column_name` is None the function will pick the first column that contains
 	numeric values. Raises ValueError if no numeric data is found.
+
+	The file is streamed once (see csv_stats.scan_csv); the result also holds
+	the column's `count` and sample `variance`. With `workers` > 1 large files
+	are split across that many processes (csv_stats.scan_csv_parallel).
+
+	With `percentiles` (e.g. (50, 95, 99)) the same pass also fills a
+	t-digest and a HyperLogLog, and the result gains approximate "p50",
+	"p95", "p99" and "distinct" entries.
+
+	With `histogram` (a bin count, or the bin edges) the t-digest also gives
+	approximate counts per bin: the result gains "histogram" (the counts)
+	and "histogram_edges". A bin count splits [min, max] into equal bins.
+
+	With `cache=True` the per-column aggregates are kept in a sidecar cache
+	(stats_cache.py); unchanged files are not re-read and files that only
+	grew have just their new tail scanned.
+
+	`backend` selects the parser for single-process, uncached scans:
+	"python" (default), "numpy", "pyarrow" or "auto" (see csv_backends.py).
+	"""
+	header, stats, rows = _scan(filepath, column_name, workers, SAMPLE_ROWS, percentiles, histogram,
+								cache, backend)
+	if header is None:
+		raise ValueError("No numeric data found in CSV")
+	if rows == 0:
+		raise ValueError(f"CSV '{filepath}' has no data rows")
+
+	if column_name is None:
+		for field in header:
+			column = stats.get(field)
+			if column is not None and column.count:
+				return column.as_dict(percentiles, histogram)
+		raise ValueError("No numeric column found in CSV")
+
+	column = stats.get(column_name)
+	if column is None or not column.count:
+		raise ValueError(f"No numeric data found in column '{column_name}'")
+	return column.as_dict(percentiles, histogram)
+
+
+def read_csv_column_stats(
+	filepath: str,
+	sample_rows: int = SAMPLE_ROWS,
+	workers: int = 1,
+	percentiles: Optional[Sequence[float]] = None,
+	cache: bool = False,
+	backend: str = "python",
+	histogram: Optional[Union[int, Sequence[float]]] = None,
+) -> Dict[str, Dict[str, float]]:
+	"""Return the stats of every numeric column, keyed by column name, in one pass.
+
+	Columns are considered numeric when a value in the first `sample_rows`
+	rows parses as a float. Raises ValueError if there are none. `percentiles`,
+	`histogram`, `cache` and `backend` are as in read_csv_stats.
 	"""
-	values = []
-	with open(filepath, newline='') as f:
-		# Try to read with DictReader (header) first
-		f.seek(0)
-		dict_reader = csv.DictReader(f)
-		if dict_reader.fieldnames:
-			rows = list(dict_reader)
-			if not rows:
-				raise ValueError(f"CSV '{filepath}' has no data rows")
-
-			if column_name is None:
-				# find first column with numeric data
-				for field in dict_reader.fieldnames:
-					vals = []
-					for r in rows:
-						cell = r.get(field)
-						try:
-							vals.append(float(cell))
-						except Exception:
-							continue
-					if vals:
-						values = vals
-						break
-				if not values:
-					raise ValueError("No numeric column found in CSV")
-			else:
-				for r in rows:
-					cell = r.get(column_name)
-					try:
-						values.append(float(cell))
-					except Exception:
-						continue
-				if not values:
-					raise ValueError(f"No numeric data found in column '{column_name}'")
-		else:
-			# No header — fallback to reader and collect all numeric cells
-			f.seek(0)
-			simple_reader = csv.reader(f)
-			for row in simple_reader:
-				for cell in row:
-					try:
-						values.append(float(cell))
-					except Exception:
-						continue
-			if not values:
-				raise ValueError("No numeric data found in CSV")
-
-	mean_val = sum(values) / len(values)
-	return {"mean": mean_val, "min": min(values), "max": max(values)}
+	header, stats, rows = _scan(filepath, None, workers, sample_rows, percentiles, histogram, cache, backend)
+	if header is None or rows == 0:
+		raise ValueError(f"CSV '{filepath}' has no data rows")
+	result = {name: column.as_dict(percentiles, histogram) for name, column in stats.items() if column.count}
+	if not result:
+		raise ValueError("No numeric column found in CSV")
+	return result
 
 
 if __name__ == '__main__':
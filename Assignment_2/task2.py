@@ -1,5 +1,10 @@
-import re
-from typing import Any
+import sys
+from typing import Any, List, Tuple
+
+import common_package  # makes the shared `common` package importable
+from common.palindromes import Normalizer, PalindromeIndex, is_palindrome_file
+
+_NORMALIZER = Normalizer("alnum")
 def is_palindrome(s: Any) -> bool:
 	"""Return True if string `s` is a palindrome.
 
@@ -12,11 +17,36 @@ def is_palindrome(s: Any) -> bool:
 		return False
 	text = str(s)
 	# keep only alphanumeric characters and make lowercase
-	filtered = re.sub(r'[^0-9a-zA-Z]', '', text).lower()
+	filtered = _NORMALIZER.normalize(text)
 	return filtered == filtered[::-1]
+def longest_palindrome(s: Any) -> Tuple[int, int, str]:
+	"""Return (start, end, substring) of the longest palindrome in `s`.
+
+	Uses the same rules as is_palindrome (ASCII alphanumerics, case-insensitive);
+	start/end are offsets into str(s), so punctuation inside the match is kept.
+	Runs in linear time (Manacher).
+	"""
+	if s is None:
+		return 0, 0, ''
+	return PalindromeIndex(str(s), "alnum").longest()
+def maximal_palindromes(s: Any, min_length: int = 2) -> List[str]:
+	"""Return the maximal palindrome around every centre of `s`, in order.
+
+	Only palindromes of at least `min_length` alphanumeric characters are kept.
+	"""
+	if s is None:
+		return []
+	text = str(s)
+	return [text[start:end] for start, end in PalindromeIndex(text, "alnum").maximal_palindromes(min_length)]
 if __name__ == '__main__':
+	if len(sys.argv) == 3 and sys.argv[1] == '--file':
+		# Check a whole file without loading it: two pointers over mmap'ed blocks.
+		print(f'Palindrome: {is_palindrome_file(sys.argv[2])}')
+		sys.exit(0)
 	# Loop: repeatedly read input from the keyboard and print whether it's a palindrome.
 	# Type 'quit' or 'exit' (case-insensitive) to stop, or send EOF (Ctrl+Z then Enter on Windows).
+	# With --longest, also print the longest palindromic substring of each input.
+	show_longest = '--longest' in sys.argv[1:]
 	prompt = "Enter text to check for palindrome (or type 'quit' to exit): "
 	while True:
 		try:
@@ -34,5 +64,10 @@ if __name__ == '__main__':
 			print('Exit command received — exiting.')
 			break
 		result = is_palindrome(s)
-		print(f'Palindrome: {result}\n')
+		if show_longest:
+			print(f'Palindrome: {result}')
+			_, _, longest = longest_palindrome(s)
+			print(f'Longest palindrome: {longest!r}\n')
+		else:
+			print(f'Palindrome: {result}\n')
 
@@ -1,5 +1,14 @@
+from __future__ import annotations
+
 import math
-from typing import Union, Optional
+import sys
+from typing import TYPE_CHECKING, Union, Optional, Sequence, Tuple
+
+import common_package  # makes the shared `common` package importable
+from common.shape_areas import areas_csv, bulk_areas
+
+if TYPE_CHECKING:  # NumPy is only needed by the bulk functions
+    import numpy as np
 
 Number = Union[int, float]
 
@@ -36,6 +45,28 @@ def square_area(side: Number) -> Optional[float]:
     return side * side
 
 
+def shape_areas(shapes: Sequence[str], dim1, dim2=None) -> Tuple[np.ndarray, np.ndarray]:
+    """Calculate the areas of many shapes at once.
+
+    Same rules as the single-shape functions: dim1 is the radius, length,
+    base or side, dim2 the width or height, and dimensions must be positive.
+    Invalid rows are flagged instead of printing an error.
+
+    Returns:
+        (areas, invalid): float array (NaN where invalid) and bool mask
+    """
+    return bulk_areas(shapes, dim1, dim2, pi=math.pi, require_positive=True)
+
+
+def shape_areas_csv(src_path: str, dst_path: str) -> Tuple[int, int]:
+    """Stream a CSV with shape, x and y columns to dst_path with an area column added.
+
+    Returns (rows, invalid rows).
+    """
+    with open(src_path, newline='') as src, open(dst_path, "w", newline='') as dst:
+        return areas_csv(src, dst, pi=math.pi, require_positive=True)
+
+
 def get_positive_number(prompt: str) -> Optional[float]:
     """Get a positive number from user input."""
     try:
@@ -101,4 +132,8 @@ def main():
 
 
 if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == '--csv':
+        rows, invalid = shape_areas_csv(sys.argv[2], sys.argv[3])
+        print(f"Wrote {rows} rows to {sys.argv[3]} ({invalid} invalid)")
+        sys.exit(0)
     main()
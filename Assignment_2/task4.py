@@ -1,3 +1,6 @@
+import sys
+
+
 def sum_of_squares(numbers):
     """
     Calculate the sum of squares of numbers in the input list/sequence.
@@ -15,7 +18,26 @@ def sum_of_squares(numbers):
     return sum(num * num for num in numbers)
 
 
+def run_batch():
+    """Print the sum of squares of every number on stdin.
+
+    Input is parsed block by block by common.fastparse and reduced with the
+    compensated, chunked sum in reductions.py, so memory use does not
+    depend on the input size; bad tokens are reported on stderr with their
+    byte offset and skipped.
+    """
+    from reductions import reduce_stream
+
+    reducer, bad_tokens = reduce_stream(errors="skip")
+    for offset, token in bad_tokens:
+        print(f"Error: '{token}' at byte offset {offset} is not a valid number", file=sys.stderr)
+    print(f"Sum of squares: {reducer.sum_of_squares}")
+
+
 if __name__ == '__main__':
+    if "--batch" in sys.argv[1:]:
+        run_batch()
+        sys.exit(0)
     # Get input from user
     try:
         print("Enter numbers separated by spaces:")
@@ -1,6 +1,10 @@
 
+import sys
 from typing import Iterable, Dict
 
+import common_package  # makes the shared `common` package importable
+from common.parity import even_odd_sums
+
 
 def sum_even_odd(numbers: Iterable[int]) -> Dict[str, int]:
 	"""Return the sum of even and odd integers from `numbers`.
@@ -14,6 +18,11 @@ def sum_even_odd(numbers: Iterable[int]) -> Dict[str, int]:
 	Raises:
 		ValueError: if any item is not an integer (or integral float).
 	"""
+	# Integer arrays and buffers (array('q'), memoryview, NumPy): vectorized.
+	fast = even_odd_sums(numbers)
+	if fast is not None:
+		return {"even_sum": fast[0], "odd_sum": fast[1]}
+
 	even_sum = 0
 	odd_sum = 0
 	for item in numbers:
@@ -44,7 +53,26 @@ def _parse_ints_from_string(s: str):
 	return [int(p) for p in parts]
 
 
+def run_batch():
+	"""Print the even/odd sums of every integer on stdin.
+
+	Input is parsed in bulk by common.fastparse; bad tokens are reported on
+	stderr with their byte offset and skipped.
+	"""
+	from common.fastparse import read_numbers
+
+	nums, bad_tokens = read_numbers(kind="int", errors="skip")
+	for offset, token in bad_tokens:
+		print(f"Error: '{token}' at byte offset {offset} is not a valid integer.", file=sys.stderr)
+	result = sum_even_odd(nums)
+	print(f"Sum of even numbers: {result['even_sum']}")
+	print(f"Sum of odd numbers: {result['odd_sum']}")
+
+
 if __name__ == '__main__':
+	if '--batch' in sys.argv[1:]:
+		run_batch()
+		sys.exit(0)
 	try:
 		raw = input('Enter integers separated by spaces (or press Enter for none): ')
 	except EOFError:
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+from csv_backends import available_backends, scan_csv_columnar
+from csv_stats import scan_csv, scan_range
+
+DATA = """id,value,weight
+1,2.5,nan
+2,nan,1.5
+3,,2.0
+4,4.0,NaN
+5,x,3.5
+6,-1.0,0.5
+"""
+
+
+class TestBackendsAgreeOnNaN(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", newline='') as f:
+            f.write(DATA)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_python_path_skips_nan(self):
+        _, stats, rows = scan_csv(self.path)
+        self.assertEqual(rows, 6)
+        self.assertEqual(stats["value"].count, 3)
+        self.assertAlmostEqual(stats["value"].mean, 5.5 / 3)
+        self.assertEqual(stats["weight"].count, 4)
+        self.assertEqual(stats["weight"].max, 3.5)
+
+    def test_scan_range_skips_nan(self):
+        with open(self.path, "rb") as f:
+            f.readline()
+            start = f.tell()
+        stats, rows, _ = scan_range(self.path, start, os.path.getsize(self.path), [1, 2], "utf-8", False)
+        self.assertEqual(rows, 6)
+        self.assertEqual(stats[1].count, 3)
+        self.assertEqual(stats[2].count, 4)
+
+    def test_backends_match(self):
+        _, expected, expected_rows = scan_csv(self.path, sketches=True)
+        for backend in available_backends():
+            with self.subTest(backend=backend):
+                header, stats, rows = scan_csv_columnar(self.path, sketches=True, backend=backend)
+                self.assertEqual(header, ["id", "value", "weight"])
+                self.assertEqual(rows, expected_rows)
+                self.assertEqual(stats.keys(), expected.keys())
+                for name, column in expected.items():
+                    got = stats[name].as_dict([50])
+                    for key, value in column.as_dict([50]).items():
+                        self.assertAlmostEqual(got[key], value, msg=f"{name} {key}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from task2 import is_palindrome, is_palindrome_file
+
+CASES = {
+    "empty": "",
+    "punctuation only": "?!., ;:-- \n\t'\"()",
+    "single character": "x",
+    "sentence": "A man, a plan, a canal: Panama!\n",
+    "sentence, odd middle": "Was it a car or a cat I saw?",
+    "digits": "12 3-21",
+    "one letter off in the middle": "abcdefgXhgfedcba",
+    "one letter off at the end": "abcdefggfedcbz",
+    "unbalanced punctuation": ",,,,,,,,,,,,,,,,,,,ab!!!!ba" + "." * 40,
+    "long": "Step on no pets. " * 50 + "x" + " .STEP ON NO PETS" * 50,
+    "long, off by one": "Step on no pets. " * 50 + "xy" + " .STEP ON NO PETS" * 50,
+}
+
+
+class TestIsPalindromeFile(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".txt")
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def check(self, text, block_sizes=(1, 2, 3, 5, 7, 16, 1 << 16)):
+        with open(self.path, "w", encoding="ascii", newline="") as f:
+            f.write(text)
+        expected = is_palindrome(text)
+        for block_size in block_sizes:
+            with self.subTest(text=text[:30], block_size=block_size):
+                self.assertEqual(is_palindrome_file(self.path, block_size), expected)
+        return expected
+
+    def test_matches_is_palindrome(self):
+        for name, text in CASES.items():
+            with self.subTest(name):
+                self.check(text)
+
+    def test_empty_and_punctuation_files_are_palindromes(self):
+        self.assertTrue(self.check(CASES["empty"]))
+        self.assertTrue(self.check(CASES["punctuation only"]))
+
+    def test_halves_straddle_block_boundaries(self):
+        # The halves are 9 characters long, so every small block size splits
+        # the walk from each end at a different offset.
+        self.assertTrue(self.check("ABCDEFGHI" + "--" + "ihgfedcba"))
+        self.assertFalse(self.check("ABCDEFGHI" + "--" + "ihgfedcbb"))
+
+    def test_invalid_block_size(self):
+        with self.assertRaises(ValueError):
+            is_palindrome_file(self.path, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import random
+import unittest
+from array import array
+from unittest import mock
+
+import common_package  # makes the shared `common` package importable
+from common import parity
+from common.parity import even_odd_sums
+from task5 import sum_even_odd
+
+np = parity.np
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+
+def loop_sums(values):
+    """The plain Python loop even_odd_sums must agree with."""
+    even = odd = 0
+    for x in values:
+        if x % 2 == 0:
+            even += x
+        else:
+            odd += x
+    return even, odd
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestEvenOddSums(unittest.TestCase):
+    def check(self, numbers, values=None):
+        expected = loop_sums(numbers.tolist() if values is None else values)
+        self.assertEqual(even_odd_sums(numbers), expected)
+        # Short chunks exercise the per-chunk recombination too.
+        with mock.patch.object(parity, "CHUNK_SIZE", 7):
+            self.assertEqual(even_odd_sums(numbers), expected)
+
+    def test_int8(self):
+        self.check(np.arange(-128, 128, dtype=np.int8))
+        self.check(np.array([-128, -127, -1, 0, 1, 127] * 50, dtype=np.int8))
+
+    def test_uint64(self):
+        top = (1 << 64) - 1
+        self.check(np.array([0, 1, 2, top, top - 1, 1 << 63, (1 << 63) + 1] * 10, dtype=np.uint64))
+
+    def test_int64_extremes(self):
+        # Sums of the 32-bit halves of these overflow int64 if not split.
+        values = [INT64_MIN, INT64_MAX, INT64_MIN + 1, INT64_MAX - 1, -1, 0, 1] * 20
+        self.check(np.array(values, dtype=np.int64))
+        self.check(np.array([INT64_MAX] * 100, dtype=np.int64))
+        self.check(np.array([INT64_MIN] * 100, dtype=np.int64))
+
+    def test_random_int64(self):
+        rng = random.Random(5)
+        values = [rng.randint(INT64_MIN, INT64_MAX) for _ in range(1000)]
+        self.check(np.array(values, dtype=np.int64))
+
+    def test_array_and_memoryview(self):
+        values = [INT64_MIN, INT64_MAX, -3, -2, 0, 5, 8] * 30
+        self.check(array("q", values), values)
+        self.check(memoryview(array("q", values)), values)
+        self.check(memoryview(array("q", values))[1::2], values[1::2])
+        self.check(array("B", range(256)), list(range(256)))
+
+    def test_unsupported_inputs(self):
+        self.assertIsNone(even_odd_sums([1, 2, 3]))
+        self.assertIsNone(even_odd_sums(array("d", [1.0, 2.0])))
+        self.assertIsNone(even_odd_sums(np.array([1.0, 2.0])))
+
+    def test_sum_even_odd_agrees_with_fallback(self):
+        values = [INT64_MIN, -7, 0, 4, INT64_MAX]
+        fast = sum_even_odd(array("q", values))
+        self.assertEqual(fast, sum_even_odd(values))
+        self.assertEqual((fast["even_sum"], fast["odd_sum"]), loop_sums(values))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import io
+import math
+import random
+import unittest
+from array import array
+
+import reductions
+from reductions import CHUNK_SIZE, dot, norm, reduce_stream, sum_of_squares, total
+
+
+def cancelling(n, seed):
+    """n values of very different magnitudes whose big terms cancel exactly."""
+    rng = random.Random(seed)
+    big = [rng.uniform(-1, 1) * 10.0 ** rng.randint(6, 12) for _ in range(n // 4)]
+    small = [rng.uniform(-1, 1) * 10.0 ** rng.randint(-3, 3) for _ in range(n - 2 * len(big))]
+    values = big + [-x for x in big] + small
+    rng.shuffle(values)
+    return values
+
+
+class TestCompensatedReductions(unittest.TestCase):
+    def assert_close(self, value, expected):
+        # Twice-working-precision sums may round the last bit differently.
+        self.assertLessEqual(abs(value - expected), math.ulp(expected), f"{value} != {expected}")
+
+    def test_total_matches_fsum(self):
+        cases = {
+            "repeated": [1e16, 1.0, -1e16] * 1000,
+            "across chunks": [1e16, 1.0, -1e16] * (CHUNK_SIZE // 2),
+            "mixed": cancelling(3 * CHUNK_SIZE + 17, 1),
+            "odd length": cancelling(1001, 2),
+            "short": [1e100, 1.0, -1e100],
+        }
+        for name, values in cases.items():
+            with self.subTest(name):
+                self.assert_close(total(values), math.fsum(values))
+                self.assert_close(total(array("d", values)), math.fsum(values))
+
+    def test_sum_of_squares_matches_fsum(self):
+        values = [1e8, 1.0, -1e8, 3.0] * (CHUNK_SIZE // 3)
+        self.assertEqual(sum_of_squares(values), math.fsum(x * x for x in values))
+
+    def test_dot_matches_fsum(self):
+        a = cancelling(2 * CHUNK_SIZE + 5, 3)
+        b = [1.0 if i % 3 else -0.5 for i in range(len(a))]
+        self.assert_close(dot(a, b), math.fsum(x * y for x, y in zip(a, b)))
+        with self.assertRaises(ValueError):
+            dot([1.0], [1.0, 2.0])
+
+    def test_stream_matches_fsum(self):
+        values = [1e16, 1.0, -1e16, 0.5] * 5000
+        text = " ".join(map(repr, values)).encode()
+        reducer, bad = reduce_stream(io.BytesIO(text), block_size=4096)
+        self.assertEqual(bad, [])
+        self.assertEqual(reducer.count, len(values))
+        self.assertEqual(reducer.sum, math.fsum(values))
+
+    def test_non_finite(self):
+        self.assertEqual(total([math.inf, 1.0]), math.inf)
+        self.assertEqual(total([]), 0.0)
+        self.assertTrue(math.isclose(norm([3e200, 4e200]), 5e200))
+
+    @unittest.skipIf(reductions.np is None, "NumPy is not installed")
+    def test_sum2_error_term(self):
+        np = reductions.np
+        high, error = reductions._sum2(np.array([1e16, 1.0] * 100 + [-1e16] * 100))
+        self.assertEqual(high + error, 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,68 +1,79 @@
+from tariffs import load_tariffs
+
+# Slab rates, fixed and flat charges come from the versioned tariff config
+# (tariffs.json); a new customer category only needs a new entry there.
+TARIFFS = load_tariffs()
+
+
 def calculate_energy_charges(units, customer_type):
     """Calculate energy charges based on units consumed and customer type"""
-    if customer_type.upper() == 'DOMESTIC':
-        if units <= 100:
-            return units * 1.45
-        elif units <= 200:
-            return (100 * 1.45) + ((units - 100) * 2.60)
-        else:
-            return (100 * 1.45) + (100 * 2.60) + ((units - 200) * 3.60)
-    elif customer_type.upper() == 'COMMERCIAL':
-        if units <= 100:
-            return units * 3.85
-        else:
-            return (100 * 3.85) + ((units - 100) * 6.30)
-    else:
+    tariff = TARIFFS.get(customer_type)
+    if tariff is None:
         return 0
+    return tariff.energy_charge(units)
 
 def calculate_fixed_charges(customer_type):
     """Calculate fixed charges based on customer type"""
-    if customer_type.upper() == 'DOMESTIC':
-        return 25
-    elif customer_type.upper() == 'COMMERCIAL':
-        return 50
-    else:
-        return 0
+    tariff = TARIFFS.get(customer_type)
+    return 0 if tariff is None else tariff.fixed
 
 def calculate_customer_charges():
     """Calculate customer charges (flat rate)"""
-    return 35
+    return TARIFFS.customer_charges
 
 def calculate_electricity_duty(energy_charges):
-    """Calculate electricity duty as 6% of energy charges"""
-    return energy_charges * 0.06
+    """Calculate electricity duty as a share (6%) of energy charges"""
+    return energy_charges * TARIFFS.duty_rate
+
+# One bill as printed by print_bill; fields use str.format syntax.
+BILL_TEMPLATE = (
+    "\n" + "="*50 + "\n"
+    "           TGNPDCL ELECTRICITY BILL\n"
+    + "="*50 + "\n"
+    "Customer Name: {customer_name}\n"
+    "Customer Type: {customer_type}\n"
+    "Previous Reading: {previous_reading}\n"
+    "Current Reading: {current_reading}\n"
+    "Units Consumed: {units_consumed}\n"
+    + "-"*50 + "\n"
+    "Charges Breakdown:\n"
+    "Energy Charges (EC): ₹{energy_charges:.2f}\n"
+    "Fixed Charges (FC): ₹{fixed_charges:.2f}\n"
+    "Customer Charges (CC): ₹{customer_charges:.2f}\n"
+    "Electricity Duty (ED): ₹{electricity_duty:.2f}\n"
+    + "-"*50 + "\n"
+    "Total Bill Amount: ₹{total_bill:.2f}\n"
+    + "="*50 + "\n"
+)
+
+def format_bill(customer_name, customer_type, previous_reading, current_reading, 
+                energy_charges, fixed_charges, customer_charges, electricity_duty, total_bill):
+    """Return the formatted bill text"""
+    return BILL_TEMPLATE.format(
+        customer_name=customer_name, customer_type=customer_type,
+        previous_reading=previous_reading, current_reading=current_reading,
+        units_consumed=current_reading - previous_reading,
+        energy_charges=energy_charges, fixed_charges=fixed_charges,
+        customer_charges=customer_charges, electricity_duty=electricity_duty,
+        total_bill=total_bill)
 
 def print_bill(customer_name, customer_type, previous_reading, current_reading, 
                energy_charges, fixed_charges, customer_charges, electricity_duty, total_bill):
     """Print the formatted bill"""
-    units_consumed = current_reading - previous_reading
-    print("\n" + "="*50)
-    print("           TGNPDCL ELECTRICITY BILL")
-    print("="*50)
-    print(f"Customer Name: {customer_name}")
-    print(f"Customer Type: {customer_type}")
-    print(f"Previous Reading: {previous_reading}")
-    print(f"Current Reading: {current_reading}")
-    print(f"Units Consumed: {units_consumed}")
-    print("-"*50)
-    print("Charges Breakdown:")
-    print(f"Energy Charges (EC): ₹{energy_charges:.2f}")
-    print(f"Fixed Charges (FC): ₹{fixed_charges:.2f}")
-    print(f"Customer Charges (CC): ₹{customer_charges:.2f}")
-    print(f"Electricity Duty (ED): ₹{electricity_duty:.2f}")
-    print("-"*50)
-    print(f"Total Bill Amount: ₹{total_bill:.2f}")
-    print("="*50)
+    print(format_bill(customer_name, customer_type, previous_reading, current_reading,
+                      energy_charges, fixed_charges, customer_charges, electricity_duty,
+                      total_bill), end="")
 
 def main():
     # Get customer details
     customer_name = input("Enter Customer Name: ")
-    customer_type = input("Enter Customer Type (Domestic/Commercial): ")
+    choices = "/".join(name.title() for name in TARIFFS.names)
+    customer_type = input(f"Enter Customer Type ({choices}): ")
     
     # Validate customer type
-    while customer_type.upper() not in ['DOMESTIC', 'COMMERCIAL']:
-        print("Invalid customer type! Please enter either 'Domestic' or 'Commercial'")
-        customer_type = input("Enter Customer Type (Domestic/Commercial): ")
+    while customer_type not in TARIFFS:
+        print(f"Invalid customer type! Please enter one of {choices}")
+        customer_type = input(f"Enter Customer Type ({choices}): ")
     
     # Get meter readings
     while True:
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Benchmark of float, exact integer-paise and Decimal billing.
+
+For each size, builds random DOMESTIC/COMMERCIAL readings (whole units and
+thousandths) and times:
+- bill_arrays: float arithmetic, as TGNPDCL.py
+- bill_paise: vectorized int64 paise with explicit rounding
+- bill_decimal: the same rules with decimal.Decimal, one bill at a time,
+  up to --decimal-max rows since it runs at interpreter speed
+and prints bills/s for each. It also checks that bill_paise matches
+bill_decimal to the paisa and reports how many float bills, rounded to
+paise as the ledger prints them, differ from the exact bill, and how far
+the sum of the float totals drifts from the exact sum.
+"""
+
+import argparse
+import math
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+from billing_engine import ROUNDINGS, TARIFFS, bill_arrays, bill_paise, to_paise
+from tariffs import UNIT_DECIMALS, TariffBook, exact
+
+_CENT = Decimal("0.01")
+_UNIT = Decimal(1).scaleb(-UNIT_DECIMALS)
+
+
+def bill_decimal(customer_type: str, previous: float, current: float,
+                 tariffs: TariffBook = TARIFFS, rounding: str = ROUND_HALF_UP) -> Decimal:
+    """Total of one bill in rupees under bill_paise's rules, computed with Decimal."""
+    tariff = tariffs.get(customer_type)
+    units = (exact(current).quantize(_UNIT, rounding)
+             - exact(previous).quantize(_UNIT, rounding))
+    charge, lower = Decimal(0), Decimal(0)
+    for upper, rate in tariff.slabs:
+        top = units if upper is None else min(units, exact(upper))
+        if top > lower:
+            charge += (top - lower) * exact(rate)
+        if upper is None or units <= upper:
+            break
+        lower = exact(upper)
+    energy = charge.quantize(_CENT, rounding)
+    duty = (energy * exact(tariffs.duty_rate)).quantize(_CENT, rounding)
+    return energy + exact(tariff.fixed) + exact(tariffs.customer_charges) + duty
+
+
+def throughput(func, *args, count: int):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**5, 10**6, 10**7])
+    parser.add_argument("--decimal-max", type=int, default=2 * 10**5)
+    parser.add_argument("--rounding", choices=sorted(ROUNDINGS), default="half_up")
+    args = parser.parse_args()
+    rounding = ROUNDINGS[args.rounding]
+
+    rng = np.random.default_rng(0)
+    print(f"{'bills':>11} {'float b/s':>12} {'paise b/s':>12} {'Decimal b/s':>12} "
+          f"{'float off':>10} {'float drift':>12}")
+    for size in args.sizes:
+        type_code = rng.integers(0, 2, size=size)
+        previous = rng.integers(0, 100_000, size=size).astype(np.float64)
+        current = previous + rng.integers(0, 800_000, size=size) / 1000
+        bills, float_rate = throughput(bill_arrays, type_code, previous, current, count=size)
+        exact_bills, paise_rate = throughput(bill_paise, type_code, previous, current,
+                                             TARIFFS, rounding, count=size)
+
+        n = min(size, args.decimal_max)
+        names = [TARIFFS.names[code] for code in type_code[:n].tolist()]
+        rows = list(zip(names, previous[:n].tolist(), current[:n].tolist()))
+        totals, decimal_rate = throughput(
+            lambda: [bill_decimal(*row, rounding=rounding) for row in rows], count=n)
+        if [int(total * 100) for total in totals] != exact_bills.total[:n].tolist():
+            raise SystemExit("bill_paise differs from the Decimal reference")
+
+        off = int((to_paise(bills.total) != exact_bills.total).sum())
+        drift = math.fsum(bills.total.tolist()) - int(exact_bills.total.sum()) / 100
+        print(f"{size:>11,} {float_rate:>12,.0f} {paise_rate:>12,.0f} {decimal_rate:>12,.0f} "
+              f"{off:>10,} {drift:>+12.2f}")
+
+
+if __name__ == "__main__":
+    main()
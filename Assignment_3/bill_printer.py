@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Assignment 3 — multi-process bill rendering for print-shop dispatch
+
+Renders the TGNPDCL.py bill of every reading in a CSV file and shards the
+text by circle (or any other column, e.g. area):
+
+    out_dir/<circle>/part-00000.txt, part-00001.txt, ...
+
+Bills are identical to print_bill's output (UTF-8). BILL_TEMPLATE is
+compiled once per customer type into a bytes %-format string with the
+type, fixed and customer charges already inlined, so a bill costs one
+format operation. Rendered bills are collected per shard and written in
+large chunks.
+
+The input is cut at line starts into one byte range per worker process;
+worker k writes part k of every shard it sees, so concatenating the parts
+of a shard in order gives its bills in input order. Readings that
+print_bill could not show (unknown type, non-numeric reading, current <
+previous) are skipped and counted. As in the CSV statistics scans, a range
+with an odd number of quotes on a line (a quoted field spanning lines)
+makes the whole file be rendered again by a single worker.
+
+Output goes to a temporary directory that is renamed to out_dir when
+complete; out_dir must not exist yet.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import os
+import re
+import shutil
+import string
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import common_package  # makes the shared `common` package importable
+from common.csvblocks import has_open_quote, header_positions, iter_line_blocks, split_offsets
+from TGNPDCL import BILL_TEMPLATE, TARIFFS
+from tariffs import TariffBook, load_tariffs
+
+COLUMNS = ("customer", "type", "previous_reading", "current_reading")
+# Per-bill values, in the positional order of a compiled template.
+ROW_FIELDS = (
+    "customer_name", "previous_reading", "current_reading", "units_consumed",
+    "energy_charges", "electricity_duty", "total_bill",
+)
+WRITE_BUFFER = 4 * 1024 * 1024   # bytes buffered per shard before a write
+BLOCK_SIZE = 1 << 23
+# Files smaller than this are always rendered by a single worker.
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+
+RangeResult = Tuple[int, int, int, Dict[str, int]]
+# Format specs that mean the same in str.format and %-formatting.
+_PERCENT_SPEC = re.compile(r"[-+ #0]*\d*(?:\.\d+)?[dfFeEgGxXo]")
+
+
+def _escape(text: str) -> bytes:
+    return text.replace("%", "%%").encode("utf-8")
+
+
+def compile_template(template: str, constants: Dict[str, object]) -> Callable[[tuple], bytes]:
+    """Compile a str.format template into a bytes %-format renderer.
+
+    Fields named in `constants` are formatted once and inlined as literal
+    text. Every other field must be in ROW_FIELDS; the renderer takes a
+    tuple of the ROW_FIELDS values in that order, with customer_name as
+    UTF-8 bytes, and returns the UTF-8 text. bytes % is several times
+    faster than str.format and needs no encode step.
+
+    Raises:
+        ValueError: if the template does not use every ROW_FIELDS value
+            once and in order (or with a format spec that has no %-format
+            equivalent), or uses any other non-constant field
+    """
+    conversions = {"r": repr, "s": str, "a": ascii}
+    parts = []
+    position = 0
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        parts.append(_escape(literal))
+        if field is None:
+            continue
+        if field in constants:
+            value = constants[field]
+            if conversion:
+                value = conversions[conversion](value)
+            parts.append(_escape(format(value, spec)))
+            continue
+        if position == len(ROW_FIELDS) or field != ROW_FIELDS[position] or conversion:
+            raise ValueError(f"Template field {field!r} is neither constant nor the next bill value")
+        position += 1
+        if field == "customer_name":
+            code = "%s"  # UTF-8 bytes
+        elif not spec:
+            code = "%r"  # repr of a float is what str.format prints
+        elif _PERCENT_SPEC.fullmatch(spec):
+            code = "%" + spec
+        else:
+            raise ValueError(f"Format spec {spec!r} of {field!r} has no %-format equivalent")
+        parts.append(code.encode())
+    if position != len(ROW_FIELDS):
+        raise ValueError(f"Template does not use {', '.join(ROW_FIELDS[position:])}")
+    return b"".join(parts).__mod__
+
+
+def shard_name(value: str) -> str:
+    """Directory name of a shard: the column value with unsafe characters replaced."""
+    return re.sub(r"[^\w.-]", "_", value.strip()).strip(".") or "UNASSIGNED"
+
+
+class _ShardWriter:
+    """Buffered text of one shard, appended to its part file in large chunks."""
+
+    __slots__ = ("path", "chunks", "buffered", "bills", "bytes")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.chunks: List[bytes] = []
+        self.buffered = 0
+        self.bills = 0
+        self.bytes = 0
+
+    def flush(self) -> None:
+        if self.chunks:
+            data = b"".join(self.chunks)
+            with open(self.path, "ab", buffering=0) as f:
+                f.write(data)
+            self.bytes += len(data)
+            self.chunks = []
+            self.buffered = 0
+
+
+def render_range(
+    readings_path: str,
+    start: int,
+    end: int,
+    positions: Dict[str, int],
+    out_dir: str,
+    part: int,
+    tariffs: TariffBook = TARIFFS,
+    buffer_size: int = WRITE_BUFFER,
+    whole_file: bool = False,
+) -> Optional[RangeResult]:
+    """Render the bills in the byte range [start, end), which begins at a line start.
+
+    whole_file means the range starts at the first data row, so quoted
+    fields may span lines; other ranges give up when one might.
+
+    Returns:
+        (bills, bytes written, skipped rows, bills per shard), or None when
+        a quoted field may span lines (nothing is written then)
+    """
+    name_i, type_i, prev_i, cur_i, shard_i = (
+        positions[column] for column in (*COLUMNS, "shard"))
+    width = max(positions.values()) + 1
+    renderers: Dict[str, object] = {}  # raw type -> (render, tariff), or None if unknown
+    writers: Dict[str, _ShardWriter] = {}  # shard directory -> writer
+    shards: Dict[str, _ShardWriter] = {}   # raw column value -> writer
+    duty_rate, customer_charges = tariffs.duty_rate, tariffs.customer_charges
+    skipped = 0
+    with open(readings_path, "rb") as f:
+        f.seek(start)
+        for block in iter_line_blocks(f, end, BLOCK_SIZE, balance_quotes=whole_file):
+            if not whole_file and has_open_quote(block):
+                for shard in writers.values():
+                    if os.path.exists(shard.path):
+                        os.unlink(shard.path)
+                return None
+            for row in csv.reader(io.StringIO(block.decode("utf-8"), newline="")):
+                if len(row) < width:
+                    skipped += bool(row)
+                    continue
+                customer_type = row[type_i]
+                if customer_type not in renderers:
+                    tariff = tariffs.get(customer_type)
+                    renderers[customer_type] = None if tariff is None else (
+                        compile_template(BILL_TEMPLATE, {
+                            "customer_type": customer_type,
+                            "fixed_charges": tariff.fixed,
+                            "customer_charges": customer_charges,
+                        }),
+                        tariff,
+                    )
+                compiled = renderers[customer_type]
+                try:
+                    previous, current = float(row[prev_i]), float(row[cur_i])
+                except ValueError:
+                    skipped += 1
+                    continue
+                units = current - previous
+                if compiled is None or not units >= 0:
+                    skipped += 1
+                    continue
+                render, tariff = compiled
+                # Same arithmetic as TGNPDCL.main.
+                energy = tariff.energy_charge(units)
+                duty = energy * duty_rate
+                total = energy + tariff.fixed + customer_charges + duty
+                text = render((row[name_i].encode("utf-8"), previous, current, units,
+                               energy, duty, total))
+
+                key = row[shard_i]
+                shard = shards.get(key)
+                if shard is None:
+                    name = shard_name(key)
+                    if name not in writers:
+                        directory = os.path.join(out_dir, name)
+                        os.makedirs(directory, exist_ok=True)
+                        writers[name] = _ShardWriter(os.path.join(directory, f"part-{part:05d}.txt"))
+                    shard = shards[key] = writers[name]
+                shard.chunks.append(text)
+                shard.buffered += len(text)
+                shard.bills += 1
+                if shard.buffered >= buffer_size:
+                    shard.flush()
+    for shard in writers.values():
+        shard.flush()
+    counts = {name: shard.bills for name, shard in writers.items()}
+    return sum(counts.values()), sum(shard.bytes for shard in writers.values()), skipped, counts
+
+
+def _header_positions(header: List[str], shard_by: str) -> Dict[str, int]:
+    positions = header_positions(header, (*COLUMNS, shard_by), "readings file")
+    return {**{name: positions[name] for name in COLUMNS}, "shard": positions[shard_by]}
+
+
+def render_bills(
+    readings_path: str,
+    out_dir: str,
+    shard_by: str = "circle",
+    workers: Optional[int] = None,
+    tariffs: TariffBook = TARIFFS,
+    buffer_size: int = WRITE_BUFFER,
+) -> Dict[str, object]:
+    """Render every bill of readings_path into out_dir, sharded by `shard_by`.
+
+    Returns:
+        {"bills", "bytes", "skipped", "shards": bills per shard directory}
+
+    Raises:
+        FileExistsError: if out_dir already exists
+        ValueError: if a required column is missing
+    """
+    if os.path.exists(out_dir):
+        raise FileExistsError(f"Output directory already exists: {out_dir}")
+    with open(readings_path, "rb") as f:
+        header_line = f.readline()
+        data_start = f.tell()
+    if not header_line.strip():
+        raise ValueError(f"Missing columns in readings file: {', '.join(COLUMNS)}, {shard_by}")
+    positions = _header_positions(next(csv.reader([header_line.decode("utf-8-sig")])), shard_by)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if os.path.getsize(readings_path) < PARALLEL_MIN_BYTES:
+        workers = 1
+    parent = os.path.dirname(os.path.abspath(out_dir))
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=".bills.")
+    try:
+        results = None
+        size = os.path.getsize(readings_path)
+        if workers > 1:
+            offsets = split_offsets(readings_path, data_start, workers)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(render_range, readings_path, start, end, positions,
+                                    tmp_dir, part, tariffs, buffer_size)
+                    for part, (start, end) in enumerate(zip(offsets, offsets[1:]))
+                ]
+                results = [future.result() for future in futures]
+            if any(result is None for result in results):
+                # A quoted field may contain a newline: the byte split is unsafe.
+                shutil.rmtree(tmp_dir)
+                os.mkdir(tmp_dir)
+                results = None
+        if results is None:
+            results = [render_range(readings_path, data_start, size, positions,
+                                    tmp_dir, 0, tariffs, buffer_size, whole_file=True)]
+        os.rename(tmp_dir, out_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    shards: Dict[str, int] = {}
+    for _, _, _, counts in results:
+        for name, count in counts.items():
+            shards[name] = shards.get(name, 0) + count
+    return {
+        "bills": sum(result[0] for result in results),
+        "bytes": sum(result[1] for result in results),
+        "skipped": sum(result[2] for result in results),
+        "shards": shards,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render TGNPDCL bills into per-circle files")
+    parser.add_argument("readings", help="CSV with customer, type, previous_reading, "
+                                         "current_reading and the shard column")
+    parser.add_argument("out_dir", help="output directory (must not exist)")
+    parser.add_argument("--shard-by", default="circle", help="column to shard by (default: circle)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPUs)")
+    parser.add_argument("--tariffs", metavar="JSON", help="tariff config (default: tariffs.json)")
+    args = parser.parse_args()
+
+    tariffs = load_tariffs(args.tariffs) if args.tariffs else TARIFFS
+    start = time.perf_counter()
+    result = render_bills(args.readings, args.out_dir, args.shard_by, args.workers, tariffs)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"Rendered {result['bills']:,} bills into {len(result['shards'])} shards "
+          f"in {elapsed:.2f} s ({result['bills'] / elapsed:,.0f} bills/s, "
+          f"{result['bytes'] / elapsed / 1e6:,.1f} MB/s)")
+    if result["skipped"]:
+        print(f"Skipped {result['skipped']:,} invalid readings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+"""Assignment 3 — bulk TGNPDCL billing engine
+
+Bills a whole meter-reading file at once instead of one customer per
+input() prompt:
+- readings are streamed from CSV (or Parquet, with pyarrow) in large blocks
+  with columns customer, type, previous_reading and current_reading (any
+  order, extra columns ignored);
+- energy, fixed and customer charges, electricity duty and the total are
+  computed for every row of a block with NumPy, from the same compiled
+  tariff config as TGNPDCL.py (tariffs.py; --tariffs picks another
+  version) and with the same float arithmetic;
+- a ledger CSV is written with one line per reading:
+  customer,type,units,energy_charges,fixed_charges,customer_charges,
+  electricity_duty,total,status
+
+CSV blocks without quotes are parsed as raw bytes: delimiter positions,
+reading digits, type names and ledger text are all handled as NumPy
+arrays, so no Python object is created per row. Blocks that contain quotes
+fall back to csv.reader.
+
+With exact=True (--exact) every bill is computed by bill_paise in int64
+paise instead: readings are rounded to thousandths of a unit, the energy
+charge is summed exactly over the slabs and rounded once to paise, the
+duty is rounded to paise from that charge, and the total is the exact sum
+of the rounded parts. Rounding is half-up by default (--rounding
+half_even for banker's rounding), so totals add up to the paisa over any
+number of bills.
+
+Amounts in the ledger are rounded to paise. Rows get status OK,
+UNKNOWN_TYPE (type is not a tariff category, in any case) or
+BAD_READING (a reading that is not a number, or current < previous); the
+charges of rows that are not OK are left empty.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import os
+import tempfile
+import time
+from decimal import ROUND_HALF_EVEN, ROUND_HALF_UP
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Sequence
+
+import numpy as np
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+import common_package  # makes the shared `common` package importable
+from common.csvblocks import header_positions, iter_line_blocks
+from tariffs import TariffBook, load_tariffs
+
+COLUMNS = ("customer", "type", "previous_reading", "current_reading")
+LEDGER_COLUMNS = (
+    "customer", "type", "units", "energy_charges", "fixed_charges",
+    "customer_charges", "electricity_duty", "total", "status",
+)
+STATUS_OK, STATUS_UNKNOWN_TYPE, STATUS_BAD_READING = 0, 1, 2
+STATUSES = ("OK", "UNKNOWN_TYPE", "BAD_READING")
+ROUNDINGS = {"half_up": ROUND_HALF_UP, "half_even": ROUND_HALF_EVEN}
+
+# Default tariff version (tariffs.json, or $TGNPDCL_TARIFFS).
+TARIFFS = load_tariffs()
+
+BLOCK_SIZE = 1 << 20
+# Most digits parsed on the byte fast path (exact in a float64 mantissa);
+# longer readings go through float().
+_MAX_DIGITS = 15
+_POWERS = 10 ** np.arange(1, 19, dtype=np.int64)
+_COMMA, _NEWLINE, _DOT = ord(","), ord("\n"), ord(".")
+_PAD = 64
+
+
+class Batch(NamedTuple):
+    """A block of readings; customer and type text live in the `text` buffer."""
+
+    text: np.ndarray            # uint8
+    customer_start: np.ndarray  # offset and length of each customer in text
+    customer_len: np.ndarray
+    type_start: np.ndarray      # offset and length of each type in text
+    type_len: np.ndarray
+    type_code: np.ndarray       # index into the tariff names, -1 when unknown
+    previous: np.ndarray        # float64, NaN when not a number
+    current: np.ndarray
+
+
+class Bills(NamedTuple):
+    units: np.ndarray
+    energy_charges: np.ndarray
+    fixed_charges: np.ndarray
+    customer_charges: np.ndarray
+    electricity_duty: np.ndarray
+    total: np.ndarray
+    status: np.ndarray        # STATUS_* per row
+
+
+def bill_arrays(
+    type_code: np.ndarray, previous: np.ndarray, current: np.ndarray, tariffs: TariffBook = TARIFFS
+) -> Bills:
+    """Compute the bill of every row.
+
+    Args:
+        type_code: index into tariffs.names per row (-1: unknown type)
+        previous, current: meter readings per row
+        tariffs: tariff version to bill with
+
+    Returns:
+        Bills; charges are NaN where status is not STATUS_OK
+    """
+    units = current - previous
+    status = np.full(units.shape, STATUS_OK, dtype=np.int8)
+    status[type_code < 0] = STATUS_UNKNOWN_TYPE
+    status[~(units >= 0)] = STATUS_BAD_READING  # also catches NaN readings
+
+    energy = np.zeros(units.shape)
+    fixed = np.zeros(units.shape)
+    for code, tariff in enumerate(tariffs.categories.values()):
+        rows = np.flatnonzero(type_code == code)
+        energy[rows] = tariff.energy_charges(units[rows])
+        fixed[rows] = tariff.fixed
+    customer = np.full(units.shape, float(tariffs.customer_charges))
+    duty = energy * tariffs.duty_rate
+    total = energy + fixed + customer + duty
+
+    bad = status != STATUS_OK
+    for values in (energy, fixed, customer, duty, total):
+        values[bad] = np.nan
+    units = np.where(status == STATUS_BAD_READING, np.nan, units)
+    return Bills(units, energy, fixed, customer, duty, total, status)
+
+
+class PaiseBills(NamedTuple):
+    """Exact bills: units in 1 / unit_scale units, charges in int64 paise (0 unless OK)."""
+
+    units: np.ndarray
+    energy_charges: np.ndarray
+    fixed_charges: np.ndarray
+    customer_charges: np.ndarray
+    electricity_duty: np.ndarray
+    total: np.ndarray
+    status: np.ndarray
+    unit_scale: int
+
+    def rupees(self) -> "Bills":
+        """The same bills as float rupees, NaN where not OK, like bill_arrays."""
+        bad = self.status != STATUS_OK
+        units = self.units / self.unit_scale
+        units[self.status == STATUS_BAD_READING] = np.nan
+        charges = []
+        for paise in self[1:6]:
+            values = paise / 100
+            values[bad] = np.nan
+            charges.append(values)
+        return Bills(units, *charges, self.status)
+
+
+def _round_div(numerator: np.ndarray, denominator: int, rounding: str) -> np.ndarray:
+    """numerator / denominator rounded to an integer; numerator must be >= 0."""
+    quotient, remainder = np.divmod(numerator, denominator)
+    twice = 2 * remainder
+    if rounding == ROUND_HALF_UP:
+        up = twice >= denominator
+    elif rounding == ROUND_HALF_EVEN:
+        up = (twice > denominator) | ((twice == denominator) & (quotient & 1 == 1))
+    else:
+        raise ValueError(f"rounding must be ROUND_HALF_UP or ROUND_HALF_EVEN, got {rounding!r}")
+    return quotient + up
+
+
+def _round_readings(values: np.ndarray, scale: int, rounding: str) -> np.ndarray:
+    """Readings in whole 1 / scale units, as float64; NaN stays NaN.
+
+    A reading is rounded as the decimal it was written as (its repr), like
+    Decimal(repr(x)).quantize(1 / scale, rounding).
+    """
+    scaled = values * scale
+    units = np.rint(scaled)
+    # Only readings within rounding error of a half unit can round differently.
+    near_half = np.flatnonzero(np.abs(scaled - units) > 0.49)
+    if near_half.size:
+        x = np.abs(values[near_half])
+        floor = np.floor(x * scale)
+        half = (floor + 0.5) / scale  # the float nearest to the half unit
+        # A tie when x is that float, unless it is as near to a whole unit.
+        tie = (x == half) & (x != floor / scale) & (x != (floor + 1) / scale)
+        if rounding == ROUND_HALF_UP:
+            up = (x > half) | tie
+        else:
+            up = (x > half) | (tie & (floor % 2 == 1))
+        units[near_half] = np.copysign(floor + up, values[near_half])
+    return units
+
+
+def bill_paise(
+    type_code: np.ndarray,
+    previous: np.ndarray,
+    current: np.ndarray,
+    tariffs: TariffBook = TARIFFS,
+    rounding: str = ROUND_HALF_UP,
+) -> PaiseBills:
+    """Compute the bill of every row exactly, in integer paise.
+
+    Readings are rounded to 1 / unit_scale units first, as the decimals
+    they were written as; a reading that is not a number, current <
+    previous, or a consumption too large for int64 arithmetic is
+    STATUS_BAD_READING. Then, per row:
+    - energy = slab charges summed exactly, rounded once to paise;
+    - duty = energy * duty rate, rounded to paise;
+    - total = energy + fixed + customer charges + duty, exact.
+    """
+    tables = tariffs.paise_tables()
+    scale = tables.unit_scale
+    limit = 2.0**53
+    with np.errstate(invalid="ignore"):
+        prev, cur = _round_readings(previous, scale, rounding), _round_readings(current, scale, rounding)
+        readable = (np.abs(prev) < limit) & (np.abs(cur) < limit)  # False for NaN
+    units = np.where(readable, cur, 0).astype(np.int64) - np.where(readable, prev, 0).astype(np.int64)
+    status = np.full(units.shape, STATUS_OK, dtype=np.int8)
+    status[type_code < 0] = STATUS_UNKNOWN_TYPE
+    status[~readable | (units < 0) | (units > tables.max_units)] = STATUS_BAD_READING
+    ok = status == STATUS_OK
+
+    energy = np.zeros(units.shape, dtype=np.int64)
+    fixed = np.zeros(units.shape, dtype=np.int64)
+    for code, (uppers, lowers, bases, rates) in enumerate(tables.tables):
+        rows = np.flatnonzero((type_code == code) & ok)
+        u = units[rows]
+        i = np.searchsorted(uppers, u, side="left")
+        energy[rows] = _round_div(bases[i] + (u - lowers[i]) * rates[i], tables.divisor, rounding)
+        fixed[rows] = tables.fixed[code]
+    numerator, denominator = tables.duty
+    duty = _round_div(energy * numerator, denominator, rounding)
+    customer = np.where(ok, tables.customer_charges, 0)
+    total = energy + fixed + customer + duty
+    units[status == STATUS_BAD_READING] = 0
+    return PaiseBills(units, energy, fixed, customer, duty, total, status, scale)
+
+
+# --- parsing -----------------------------------------------------------------
+
+def _gather(text: np.ndarray, starts: np.ndarray, lengths: np.ndarray, width: int) -> np.ndarray:
+    """Return an (n, width) uint8 matrix of text[start:start + length], 0-padded."""
+    if width == 0:
+        return np.zeros((len(starts), 0), dtype=np.uint8)
+    if len(text) < width or int(starts.max(initial=0)) + width > len(text):
+        text = np.concatenate([text, np.zeros(width, dtype=np.uint8)])
+    # Row-wise copies of fixed-width windows are much cheaper than
+    # indexing every byte.
+    chars = np.lib.stride_tricks.sliding_window_view(text, width)[starts]
+    chars *= np.arange(width) < lengths[:, None]
+    return chars
+
+
+def _match_types(
+    text: np.ndarray, starts: np.ndarray, lengths: np.ndarray, names: Sequence[str]
+) -> np.ndarray:
+    """Index into names of every type field (ASCII case-insensitive), -1 if none."""
+    codes = np.full(len(starts), -1, dtype=np.int64)
+    for code, name in enumerate(names):
+        target = np.frombuffer(name.lower().encode(), dtype=np.uint8)
+        rows = np.flatnonzero(lengths == len(target))
+        if not rows.size:
+            continue
+        chars = _gather(text, starts[rows], lengths[rows], len(target))
+        upper = (chars >= 65) & (chars <= 90)
+        chars[upper] |= 0x20
+        codes[rows[(chars == target).all(axis=1)]] = code
+    return codes
+
+
+def _parse_decimals(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Parse unsigned decimal fields buf[starts:ends] vectorized; NaN for anything else.
+
+    Fields that are not plain digits with at most one '.' are retried with
+    float(), so e.g. exponents and signs are still accepted.
+    """
+    n = len(starts)
+    lengths = ends - starts
+    result = np.full(n, np.nan)
+    width = int(min(lengths.max(initial=0), _MAX_DIGITS + 1))
+    if width == 0:
+        return result
+    chars = np.ascontiguousarray(_gather(buf, starts, lengths, width).T)
+    ok = (lengths > 0) & (lengths <= width)
+    mantissa = np.zeros(n, dtype=np.int64)
+    decimals = np.zeros(n, dtype=np.int64)
+    seen_dot = np.zeros(n, dtype=bool)
+    digits = np.zeros(n, dtype=np.int64)
+    for j in range(width):
+        c = chars[j]
+        inside = j < lengths
+        d = c - np.uint8(48)  # wraps around for bytes below '0'
+        is_digit = (d < 10) & inside
+        is_dot = c == _DOT
+        ok &= is_digit | is_dot | ~inside
+        ok &= ~(is_dot & seen_dot)
+        seen_dot |= is_dot
+        decimals += seen_dot & is_digit
+        digits += is_digit
+        mantissa = np.where(is_digit, mantissa * 10 + d, mantissa)
+    ok &= (digits > 0) & (digits <= _MAX_DIGITS)
+    # mantissa and 10**decimals are exact, so the quotient is correctly rounded.
+    result[ok] = mantissa[ok] / 10.0 ** decimals[ok]
+
+    retry = np.flatnonzero(~ok & (lengths > 0))
+    if retry.size:
+        raw = buf.tobytes()
+        for i, start, end in zip(retry.tolist(), starts[retry].tolist(), ends[retry].tolist()):
+            try:
+                result[i] = float(raw[start:end])
+            except ValueError:
+                continue
+    return result
+
+
+def _parse_numbers(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Parse the reading fields buf[starts:ends]; NaN where not a number.
+
+    Plain integers (the usual meter reading) are read right-aligned, so a
+    Horner loop over the digit columns needs no per-row bookkeeping; other
+    fields go through _parse_decimals.
+    """
+    lengths = ends - starts
+    width = int(min(lengths.max(initial=0), _MAX_DIGITS))
+    if width == 0:
+        return np.full(len(starts), np.nan)
+    first = ends - width
+    padded = buf
+    if int(first.min()) < 0:
+        padded = np.concatenate([np.zeros(width, dtype=np.uint8), buf])
+        first = first + width
+    digits = np.lib.stride_tricks.sliding_window_view(padded, width)[first] - np.uint8(48)
+    digits *= np.arange(width) >= (width - lengths)[:, None]  # 0 left of the field
+    ok = (digits < 10).all(axis=1) & (lengths > 0) & (lengths <= width)
+    digits = np.ascontiguousarray(digits.T)
+    value = digits[0].astype(np.int64)
+    for row in digits[1:]:
+        value *= 10
+        value += row
+    result = value.astype(np.float64)
+    rest = np.flatnonzero(~ok)
+    if rest.size:
+        result[rest] = _parse_decimals(buf, starts[rest], ends[rest])
+    return result
+
+
+def _parse_fast(block: bytes, positions: Dict[str, int], ncols: int, tariffs: TariffBook):
+    """Parse a quote-free block of complete lines; None if the lines are ragged."""
+    # Zero padding lets fixed-width windows start at any field.
+    buf = np.frombuffer(block + bytes(_PAD), dtype=np.uint8)
+    delims = np.flatnonzero((buf == _COMMA) | (buf == _NEWLINE))
+    if len(delims) % ncols or not len(delims):
+        return None
+    ends = delims.reshape(-1, ncols)
+    if not (buf[ends[:, -1]] == _NEWLINE).all() or (buf[ends[:, :-1]] == _NEWLINE).any():
+        return None
+    starts = np.empty_like(ends)
+    starts.ravel()[0] = 0
+    starts.ravel()[1:] = delims[:-1] + 1
+    # Strip a trailing \r (CRLF files) from the last field of every line.
+    last = ends[:, -1]
+    cr = (last > starts[:, -1]) & (buf[np.maximum(last - 1, 0)] == ord("\r"))
+    if cr.any():
+        ends[cr, -1] -= 1
+
+    def column(name):
+        j = positions[name]
+        return starts[:, j], ends[:, j]
+
+    customer_start, customer_end = column("customer")
+    type_start, type_end = column("type")
+    type_len = type_end - type_start
+    return Batch(
+        buf,
+        customer_start,
+        customer_end - customer_start,
+        type_start,
+        type_len,
+        _match_types(buf, type_start, type_len, tariffs.names),
+        _parse_numbers(buf, *column("previous_reading")),
+        _parse_numbers(buf, *column("current_reading")),
+    )
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _csv_field(value) -> bytes:
+    text = "" if value is None else str(value)
+    if any(ch in text for ch in ',"\r\n'):
+        text = '"' + text.replace('"', '""') + '"'
+    return text.encode()
+
+
+def _batch_from_columns(
+    customers: List[str], types: List[str], previous, current, tariffs: TariffBook
+) -> Batch:
+    """Build a Batch from per-row Python values (csv.reader and Parquet paths)."""
+    encoded = [_csv_field(value) for pair in zip(customers, types) for value in pair]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    starts = np.cumsum(lengths) - lengths
+    text = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    raw_types = ("" if t is None else str(t) for t in types)
+    return Batch(
+        text,
+        starts[0::2],
+        lengths[0::2],
+        starts[1::2],
+        lengths[1::2],
+        np.fromiter(map(tariffs.code, raw_types), dtype=np.int64, count=len(types)),
+        np.fromiter(map(_to_float, previous), dtype=np.float64, count=len(customers)),
+        np.fromiter(map(_to_float, current), dtype=np.float64, count=len(customers)),
+    )
+
+
+def _parse_slow(block: bytes, positions: Dict[str, int], tariffs: TariffBook) -> Batch:
+    rows = [row for row in csv.reader(io.StringIO(block.decode("utf-8"), newline="")) if row]
+    width = max(positions.values()) + 1
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    columns = {name: [row[j] for row in rows] for name, j in positions.items()}
+    return _batch_from_columns(*(columns[name] for name in COLUMNS), tariffs)
+
+
+def _iter_lines_blocks(f: BinaryIO, block_size: int) -> Iterator[bytes]:
+    """Yield blocks of complete lines; a quoted newline keeps the block growing."""
+    for block in iter_line_blocks(f, block_size=block_size, balance_quotes=True):
+        if block.endswith(b"\n"):
+            yield block
+        elif block.strip():
+            yield block + b"\n"
+
+
+def iter_csv_batches(
+    path: str, block_size: int = BLOCK_SIZE, tariffs: TariffBook = TARIFFS
+) -> Iterator[Batch]:
+    """Yield a Batch per block of the readings CSV at path."""
+    with open(path, "rb") as f:
+        header_line = f.readline()
+        if not header_line.strip():
+            return
+        header = next(csv.reader([header_line.decode("utf-8-sig")]))
+        positions = header_positions(header, COLUMNS, "readings file")
+        for block in _iter_lines_blocks(f, block_size):
+            batch = None
+            if b'"' not in block:
+                batch = _parse_fast(block, positions, len(header), tariffs)
+            yield batch if batch is not None else _parse_slow(block, positions, tariffs)
+
+
+def iter_parquet_batches(
+    path: str, batch_rows: int = 1 << 20, tariffs: TariffBook = TARIFFS
+) -> Iterator[Batch]:
+    """Yield a Batch per record batch of a readings Parquet file (needs pyarrow)."""
+    if pq is None:
+        raise ValueError("Reading Parquet files requires pyarrow")
+    for record in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=list(COLUMNS)):
+        columns = {name: record.column(name) for name in COLUMNS}
+        yield _batch_from_columns(
+            columns["customer"].to_pylist(),
+            columns["type"].to_pylist(),
+            columns["previous_reading"].cast("float64").fill_null(float("nan")).to_numpy(),
+            columns["current_reading"].cast("float64").fill_null(float("nan")).to_numpy(),
+            tariffs,
+        )
+
+
+# --- ledger output -------------------------------------------------------------
+
+def _to_paise_exact(values: np.ndarray) -> np.ndarray:
+    # x * 100 is itself rounded, which can turn e.g. 0.43499999... into 43.5;
+    # splitting x (Veltkamp) gives x * 100 exactly as hi + lo, and a tie is
+    # then decided by the sign of lo, with exact ties going to even.
+    c = values * 134217729.0  # 2**27 + 1
+    x_hi = c - (c - values)
+    a, b = x_hi * 100, (values - x_hi) * 100  # both exact
+    hi = a + b
+    lo = b - (hi - a)
+    floor = np.floor(hi)
+    frac = hi - floor
+    up = (frac > 0.5) | ((frac == 0.5) & ((lo > 0) | ((lo == 0) & (floor % 2 == 1))))
+    return (floor + up).astype(np.int64)
+
+
+def to_paise(values: np.ndarray) -> np.ndarray:
+    """Round non-negative float amounts to int64 paise exactly like f"{x:.2f}"."""
+    scaled = values * 100
+    paise = np.rint(scaled)
+    # Only values within rounding error of a half paisa can round differently.
+    near_half = np.flatnonzero(np.abs(scaled - paise) > 0.49)
+    paise = paise.astype(np.int64)
+    if near_half.size:
+        paise[near_half] = _to_paise_exact(values[near_half])
+    return paise
+
+
+def _render_amounts(values: np.ndarray) -> np.ndarray:
+    """Render non-negative amounts as 'rupees.paise' text, one column per row.
+
+    Returns a (width, n) uint8 matrix (field text runs down each column,
+    0-padded); NaN renders as an empty field.
+    """
+    valid = np.isfinite(values)
+    paise = to_paise(np.where(valid, values, 0))
+    top = int(paise.max(initial=0))
+    if top < 2**31:
+        paise = paise.astype(np.int32)  # halves the work of the digit loop
+    rupees = paise // 100
+    cents = paise - rupees * 100
+    int_width = int(np.searchsorted(_POWERS, top // 100, side="right")) + 1
+    chars = np.empty((int_width + 3, len(values)), dtype=np.uint8)
+    tens = cents // 10
+    chars[-1] = cents - tens * 10 + 48
+    chars[-2] = tens + 48
+    chars[-3] = _DOT
+    for row in range(int_width - 1, -1, -1):
+        quotient = rupees // 10
+        chars[row] = rupees - quotient * 10 + 48
+        if row < int_width - 1:
+            chars[row] *= rupees != 0  # blank out leading zeros
+        rupees = quotient
+    if not valid.all():
+        chars[:, ~valid] = 0
+    return chars
+
+
+def _render_by_code(table: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """Render amounts that only depend on a small index: render the table once."""
+    return _render_amounts(table).T[index]
+
+
+_STATUS_TEXT = np.zeros((len(STATUSES), max(map(len, STATUSES))), dtype=np.uint8)
+for _code, _status in enumerate(STATUSES):
+    _STATUS_TEXT[_code, :len(_status)] = np.frombuffer(_status.encode(), dtype=np.uint8)
+
+
+def render_ledger(batch: Batch, bills: Bills, tariffs: TariffBook = TARIFFS) -> bytes:
+    """Return the ledger lines of a batch (without header).
+
+    Every field is rendered into an (n, width) uint8 block of one table,
+    padded with 0 bytes, with separator columns between the blocks; the
+    padding is then dropped with a single boolean mask.
+    """
+    n = len(bills.status)
+    if n == 0:
+        return b""
+    # Fixed and customer charges only depend on the tariff (or are empty).
+    code = np.where(bills.status == STATUS_OK, batch.type_code, len(tariffs))
+    fixed = np.array([tariff.fixed for tariff in tariffs.categories.values()] + [np.nan])
+    customer = np.array([tariffs.customer_charges] * len(tariffs) + [np.nan])
+    fields = [
+        _gather(batch.text, batch.customer_start, batch.customer_len,
+                int(batch.customer_len.max())),
+        _gather(batch.text, batch.type_start, batch.type_len, int(batch.type_len.max())),
+        _render_amounts(bills.units).T,
+        _render_amounts(bills.energy_charges).T,
+        _render_by_code(fixed, code),
+        _render_by_code(customer, code),
+        _render_amounts(bills.electricity_duty).T,
+        _render_amounts(bills.total).T,
+        _STATUS_TEXT[bills.status],
+    ]
+    table = np.empty((n, sum(field.shape[1] + 1 for field in fields)), dtype=np.uint8)
+    col = 0
+    for field in fields:
+        width = field.shape[1]
+        table[:, col:col + width] = field
+        table[:, col + width] = _COMMA
+        col += width + 1
+    table[:, -1] = _NEWLINE
+    lines = table.ravel()
+    return lines[lines != 0].tobytes()
+
+
+def run_billing(
+    readings_path: str,
+    ledger_path: str,
+    block_size: int = BLOCK_SIZE,
+    tariffs: TariffBook = TARIFFS,
+    exact: bool = False,
+    rounding: str = ROUND_HALF_UP,
+) -> Dict[str, int]:
+    """Bill every reading in readings_path (.csv or .parquet) into a ledger CSV.
+
+    exact=True bills with bill_paise and `rounding` instead of float
+    arithmetic.
+
+    The ledger is written to a temporary file and moved into place when
+    complete.
+
+    Returns:
+        counts per status, plus "rows"
+    """
+    if readings_path.lower().endswith((".parquet", ".pq")):
+        batches = iter_parquet_batches(readings_path, tariffs=tariffs)
+    else:
+        batches = iter_csv_batches(readings_path, block_size, tariffs)
+    counts = dict.fromkeys(STATUSES, 0)
+    rows = 0
+    directory = os.path.dirname(os.path.abspath(ledger_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".ledger.")
+    try:
+        with os.fdopen(fd, "wb", buffering=1 << 20) as out:
+            out.write((",".join(LEDGER_COLUMNS) + "\n").encode())
+            for batch in batches:
+                if exact:
+                    bills = bill_paise(batch.type_code, batch.previous, batch.current,
+                                       tariffs, rounding).rupees()
+                else:
+                    bills = bill_arrays(batch.type_code, batch.previous, batch.current, tariffs)
+                out.write(render_ledger(batch, bills, tariffs))
+                rows += len(bills.status)
+                for code, count in enumerate(np.bincount(bills.status, minlength=len(STATUSES))):
+                    counts[STATUSES[code]] += int(count)
+        os.replace(tmp_path, ledger_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    counts["rows"] = rows
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bill a meter-reading file into a ledger CSV")
+    parser.add_argument("readings", help="CSV or Parquet with customer, type, previous_reading, current_reading")
+    parser.add_argument("ledger", help="output ledger CSV")
+    parser.add_argument("--tariffs", metavar="JSON", help="tariff config (default: tariffs.json)")
+    parser.add_argument("--exact", action="store_true", help="bill in exact integer paise")
+    parser.add_argument("--rounding", choices=sorted(ROUNDINGS), default="half_up",
+                        help="rounding of exact paise amounts (default: half_up)")
+    args = parser.parse_args()
+
+    tariffs = load_tariffs(args.tariffs) if args.tariffs else TARIFFS
+    start = time.perf_counter()
+    counts = run_billing(args.readings, args.ledger, tariffs=tariffs, exact=args.exact,
+                         rounding=ROUNDINGS[args.rounding])
+    elapsed = time.perf_counter() - start
+    print(f"Billed {counts['rows']} readings in {elapsed:.2f} s "
+          f"({counts['rows'] / max(elapsed, 1e-9):,.0f} rows/s)")
+    for status in STATUSES:
+        print(f"  {status}: {counts[status]}")
+
+
+if __name__ == "__main__":
+    main()
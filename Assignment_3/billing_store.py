@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Assignment 3 — incremental re-billing with a persisted billing-state store
+
+A SQLite store keeps, per billing cycle and customer, the inputs of the
+last bill (type, previous and current reading), the tariff version it was
+computed with and its outputs (the billing_engine ledger fields). The
+config of every tariff version used is stored too.
+
+rebill(store, cycle, diff_ledger, readings=None, tariffs=TARIFFS) brings a
+cycle up to date and only recomputes what is stale:
+- rows of the readings file (CSV or Parquet, billing_engine columns; may
+  be a corrections file with only some customers) that are new, or whose
+  inputs or tariff version differ from the stored ones;
+- stored rows billed with another tariff version, from their stored inputs.
+
+Recomputed rows are billed with billing_engine.bill_arrays and stored. The
+diff ledger lists the bills that are new or whose outputs changed, with the
+previous total and the difference. All readings are loaded into a
+temporary table first, so a customer listed twice in one file is billed
+once, from its later row, and diffed against the bill stored before the run.
+
+The ledger is written to a temporary file, moved into place, and then the
+store transaction is committed; if anything fails the store is unchanged.
+Re-using a tariff version with a different config is refused, since
+stored bills would silently stop matching their version.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import math
+import os
+import sqlite3
+import tempfile
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from billing_engine import (BLOCK_SIZE, LEDGER_COLUMNS, STATUSES, TARIFFS, Batch,
+                            bill_arrays, iter_csv_batches, iter_parquet_batches)
+from tariffs import TariffBook, load_tariffs
+
+SCHEMA_VERSION = 1
+CHUNK_ROWS = 1 << 16
+OUTPUTS = LEDGER_COLUMNS[2:]  # units ... total, status
+DIFF_COLUMNS = ("customer", "type", "change") + OUTPUTS + ("previous_total", "difference")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS tariffs (version TEXT PRIMARY KEY, config TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS bills (
+    cycle TEXT NOT NULL,
+    customer TEXT NOT NULL,
+    type TEXT NOT NULL,
+    previous_reading REAL,
+    current_reading REAL,
+    tariff_version TEXT NOT NULL,
+    {", ".join(f"{name} REAL" for name in OUTPUTS[:-1])},
+    status INTEGER NOT NULL,
+    PRIMARY KEY (cycle, customer)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS bills_version ON bills (cycle, tariff_version);
+"""
+_INPUTS = ("customer", "type", "previous_reading", "current_reading")
+_UPSERT = (
+    f"INSERT OR REPLACE INTO bills (cycle, tariff_version, {', '.join(_INPUTS + OUTPUTS)}) "
+    f"VALUES ({', '.join('?' * (2 + len(_INPUTS) + len(OUTPUTS)))})"
+)
+# The later row of a customer replaces the earlier one.
+_LOAD_INCOMING = """
+INSERT INTO temp.incoming VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (customer) DO UPDATE SET seq = excluded.seq, type = excluded.type,
+    previous_reading = excluded.previous_reading, current_reading = excluded.current_reading
+"""
+# Incoming rows with no stored bill, or whose inputs or tariff version
+# differ (IS NOT also treats two NULLs, i.e. NaN readings, as equal), from
+# seq onwards. Each customer has one incoming row, so bills stored for rows
+# before seq do not affect the later pages.
+_STALE_INCOMING = f"""
+SELECT i.seq, {", ".join(f"i.{name}" for name in _INPUTS)}, {", ".join(f"b.{name}" for name in OUTPUTS)}
+FROM temp.incoming AS i
+LEFT JOIN bills AS b ON b.cycle = ? AND b.customer = i.customer
+WHERE i.seq > ? AND (b.customer IS NULL OR b.tariff_version IS NOT ? OR b.type IS NOT i.type
+    OR b.previous_reading IS NOT i.previous_reading
+    OR b.current_reading IS NOT i.current_reading)
+ORDER BY i.seq LIMIT ?
+"""
+_STALE_STORED = f"""
+SELECT {", ".join(_INPUTS + OUTPUTS)} FROM bills
+WHERE cycle = ? AND tariff_version != ? LIMIT ?
+"""
+
+
+def open_store(path: str) -> sqlite3.Connection:
+    """Open (creating if needed) the billing-state store at path.
+
+    Raises:
+        ValueError: if the store was written with another schema version
+    """
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    conn.execute("INSERT OR IGNORE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+    version = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()[0]
+    if version != str(SCHEMA_VERSION):
+        conn.close()
+        raise ValueError(f"{path}: store schema version {version}, expected {SCHEMA_VERSION}")
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS incoming (seq INTEGER NOT NULL, customer TEXT PRIMARY KEY, "
+        "type TEXT, previous_reading REAL, current_reading REAL)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS temp.incoming_seq ON incoming (seq)")
+    return conn
+
+
+def _record_tariffs(conn: sqlite3.Connection, tariffs: TariffBook) -> None:
+    config = json.dumps(tariffs.to_config(), sort_keys=True)
+    conn.execute("INSERT OR IGNORE INTO tariffs VALUES (?, ?)", (tariffs.version, config))
+    stored = conn.execute("SELECT config FROM tariffs WHERE version = ?", (tariffs.version,)).fetchone()[0]
+    if stored != config:
+        raise ValueError(f"Tariff version {tariffs.version!r} is already recorded with a different "
+                         "config; give the revised tariffs a new version")
+
+
+def _field_values(text: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> List[str]:
+    """Decode the customer or type fields of a Batch (CSV-quoted ones are unquoted)."""
+    raw = text.tobytes()
+    values = [raw[start:start + length].decode("utf-8")
+              for start, length in zip(starts.tolist(), lengths.tolist())]
+    return [next(csv.reader([value]))[0] if value.startswith('"') else value for value in values]
+
+
+def _nullable(values: np.ndarray) -> list:
+    """Array to list with NaN as None (what SQLite stores for NaN)."""
+    return [None if math.isnan(x) else x for x in values.tolist()]
+
+
+def _amount(value: Optional[float]) -> str:
+    return "" if value is None else f"{value:.2f}"
+
+
+class _Rebill:
+    """One rebill run: bills stale rows, stores them and writes the diff ledger."""
+
+    def __init__(self, conn: sqlite3.Connection, cycle: str, tariffs: TariffBook, writer) -> None:
+        self.conn = conn
+        self.cycle = cycle
+        self.tariffs = tariffs
+        self.writer = writer
+        self.counts = {"rows": 0, "recomputed": 0, "new": 0, "changed": 0}
+
+    def bill(self, customers: Sequence[str], types: Sequence[str],
+             previous: np.ndarray, current: np.ndarray, old: Sequence[Optional[tuple]]) -> None:
+        """Bill the rows, store them and diff them against the old outputs (None: new)."""
+        if not len(customers):
+            return
+        codes = np.fromiter(map(self.tariffs.code, types), dtype=np.int64, count=len(types))
+        bills = bill_arrays(codes, previous, current, self.tariffs)
+        outputs = [_nullable(column) for column in bills[:-1]] + [bills.status.tolist()]
+        new_rows = list(zip(*outputs))
+        self.conn.executemany(_UPSERT, (
+            (self.cycle, self.tariffs.version, customer, type_, prev, cur) + row
+            for customer, type_, prev, cur, row in zip(
+                customers, types, _nullable(previous), _nullable(current), new_rows)
+        ))
+        self.counts["recomputed"] += len(new_rows)
+        for customer, type_, row, before in zip(customers, types, new_rows, old):
+            if before is not None and tuple(before) == row:
+                continue
+            change = "NEW" if before is None else "CHANGED"
+            self.counts[change.lower()] += 1
+            *amounts, status = row
+            previous_total = None if before is None else before[-2]
+            difference = None
+            if row[-2] is not None and previous_total is not None:
+                difference = row[-2] - previous_total
+            self.writer.writerow([customer, type_, change, *map(_amount, amounts), STATUSES[status],
+                                  _amount(previous_total), _amount(difference)])
+
+    def load_batch(self, batch: Batch) -> None:
+        """Add the rows of a readings batch to temp.incoming (later rows win)."""
+        customers = _field_values(batch.text, batch.customer_start, batch.customer_len)
+        types = _field_values(batch.text, batch.type_start, batch.type_len)
+        start = self.counts["rows"]
+        self.counts["rows"] += len(customers)
+        self.conn.executemany(_LOAD_INCOMING, zip(
+            range(start, start + len(customers)), customers, types,
+            _nullable(batch.previous), _nullable(batch.current)))
+
+    def apply_readings(self) -> None:
+        """Rebill the loaded readings that are new or stale."""
+        n = 1 + len(_INPUTS)
+        seq = -1
+        while True:
+            rows = self.conn.execute(
+                _STALE_INCOMING, (self.cycle, seq, self.tariffs.version, CHUNK_ROWS)).fetchall()
+            if not rows:
+                break
+            seq = rows[-1][0]
+            readings = np.array([row[3:n] for row in rows], dtype=np.float64).reshape(-1, 2)
+            old = [None if row[-1] is None else row[n:] for row in rows]
+            self.bill([row[1] for row in rows], [row[2] for row in rows],
+                      readings[:, 0], readings[:, 1], old)
+
+    def apply_tariff_version(self) -> None:
+        """Rebill stored rows of the cycle that used another tariff version."""
+        n = len(_INPUTS)
+        while True:
+            rows = self.conn.execute(
+                _STALE_STORED, (self.cycle, self.tariffs.version, CHUNK_ROWS)).fetchall()
+            if not rows:
+                break
+            readings = np.array([row[2:n] for row in rows], dtype=np.float64).reshape(-1, 2)
+            self.bill([row[0] for row in rows], [row[1] for row in rows],
+                      readings[:, 0], readings[:, 1], [row[n:] for row in rows])
+
+
+def rebill(
+    store_path: str,
+    cycle: str,
+    diff_path: str,
+    readings_path: Optional[str] = None,
+    tariffs: TariffBook = TARIFFS,
+    block_size: int = BLOCK_SIZE,
+) -> Dict[str, int]:
+    """Bring `cycle` in the store up to date and write the diff ledger.
+
+    Returns:
+        {"rows": readings read, "recomputed", "new", "changed"}
+
+    Raises:
+        ValueError: if the tariff version was recorded with another config
+    """
+    conn = open_store(store_path)
+    directory = os.path.dirname(os.path.abspath(diff_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".diff.")
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        _record_tariffs(conn, tariffs)
+        with os.fdopen(fd, "w", newline="", buffering=1 << 20) as out:
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow(DIFF_COLUMNS)
+            run = _Rebill(conn, cycle, tariffs, writer)
+            conn.execute("DELETE FROM temp.incoming")
+            if readings_path is not None:
+                if readings_path.lower().endswith((".parquet", ".pq")):
+                    batches = iter_parquet_batches(readings_path, tariffs=tariffs)
+                else:
+                    batches = iter_csv_batches(readings_path, block_size, tariffs)
+                for batch in batches:
+                    run.load_batch(batch)
+                run.apply_readings()
+            run.apply_tariff_version()
+        os.replace(tmp_path, diff_path)
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    finally:
+        conn.close()
+    return run.counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally re-bill a cycle into a billing store")
+    parser.add_argument("store", help="SQLite billing-state store (created if missing)")
+    parser.add_argument("cycle", help="billing cycle, e.g. 2024-06")
+    parser.add_argument("diff_ledger", help="output CSV of new and changed bills")
+    parser.add_argument("--readings", help="CSV or Parquet of new or corrected readings")
+    parser.add_argument("--tariffs", metavar="JSON", help="tariff config (default: tariffs.json)")
+    args = parser.parse_args()
+
+    tariffs = load_tariffs(args.tariffs) if args.tariffs else TARIFFS
+    start = time.perf_counter()
+    counts = rebill(args.store, args.cycle, args.diff_ledger, args.readings, tariffs)
+    elapsed = time.perf_counter() - start
+    print(f"Cycle {args.cycle}, tariff version {tariffs.version}: read {counts['rows']} readings, "
+          f"recomputed {counts['recomputed']} bills in {elapsed:.2f} s")
+    print(f"  new: {counts['new']}, changed: {counts['changed']}")
+
+
+if __name__ == "__main__":
+    main()
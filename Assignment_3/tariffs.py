@@ -0,0 +1,225 @@
+"""Versioned TGNPDCL tariff tables.
+
+Provides:
+- load_tariffs(path=TARIFF_PATH) -> TariffBook read from a JSON config
+- TariffBook: tariff version, flat customer charges, duty rate and one
+  CompiledTariff per customer category (names matched case-insensitively)
+- CompiledTariff: the slabs of one category compiled into cumulative-charge
+  breakpoints, so the energy charge of any consumption is one bisect
+  (np.searchsorted for arrays) plus one multiply-add
+- PaiseTables: the same breakpoints in scaled int64, for exact billing in
+  integer paise (TariffBook.paise_tables())
+
+Config format:
+
+    {"version": "2024-1", "customer_charges": 35, "duty_rate": 0.06,
+     "categories": {"DOMESTIC": {"fixed": 25,
+                                 "slabs": [[100, 1.45], [200, 2.60], [null, 3.60]]}}}
+
+Slabs are [upper bound in units, rate per unit] in increasing order and the
+last one has no upper bound (null). A new category (e.g. INDUSTRIAL or
+AGRICULTURAL) only needs a new entry in the config.
+
+The charge at each breakpoint is accumulated slab by slab in the same order
+as the original if-chains, so base + (units - lower) * rate gives exactly
+the same floats as (100 * 1.45) + ((units - 100) * 2.60) and so on.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from bisect import bisect_left
+from decimal import Decimal
+from typing import Dict, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TARIFF_PATH = os.environ.get(
+    "TGNPDCL_TARIFFS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "tariffs.json")
+)
+# Exact billing counts consumption in thousandths of a unit.
+UNIT_DECIMALS = 3
+
+
+def exact(value) -> Decimal:
+    """The decimal a config number was written as (0.06 -> Decimal('0.06'))."""
+    return Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+
+
+def _require_numpy(what: str) -> None:
+    if np is None:
+        raise ImportError(f"{what} requires NumPy")
+
+
+def _integral(value: Decimal, what: str) -> int:
+    if value != value.to_integral_value():
+        raise ValueError(f"{what} {value} is not a whole number at the exact billing scale")
+    return int(value)
+
+
+class CompiledTariff:
+    """Slab rates of one customer category as cumulative-charge breakpoints."""
+
+    def __init__(self, name: str, slabs: Sequence[Tuple[Optional[float], float]], fixed: float) -> None:
+        if not slabs or slabs[-1][0] is not None:
+            raise ValueError(f"{name}: the last slab must have no upper bound")
+        self.name = name
+        self.fixed = fixed
+        self.slabs = tuple((upper, rate) for upper, rate in slabs)
+        self.uppers = []   # upper bound of every slab but the last
+        self.lowers = []   # lower bound of every slab
+        self.bases = []    # energy charge of `lower` units
+        self.rates = []
+        lower, base = 0, 0
+        for upper, rate in self.slabs:
+            if not 0 <= rate < math.inf:  # also rejects NaN
+                raise ValueError(f"{name}: rate must be a finite number >= 0, got {rate}")
+            self.lowers.append(lower)
+            self.bases.append(base)
+            self.rates.append(rate)
+            if upper is None:
+                break
+            if not lower < upper < math.inf:
+                raise ValueError(f"{name}: slab bounds must increase, got {upper} after {lower}")
+            self.uppers.append(upper)
+            base = base + (upper - lower) * rate
+            lower = upper
+        if len(self.rates) != len(self.slabs):
+            raise ValueError(f"{name}: only the last slab may have no upper bound")
+        if np is not None:
+            self._arrays = tuple(np.array(values, dtype=np.float64)
+                                 for values in (self.uppers, self.lowers, self.bases, self.rates))
+
+    def energy_charge(self, units: float) -> float:
+        """Energy charge of `units`; a slab's upper bound belongs to that slab."""
+        i = bisect_left(self.uppers, units)
+        return self.bases[i] + (units - self.lowers[i]) * self.rates[i]
+
+    def energy_charges(self, units):
+        """energy_charge of every element of a NumPy array (NaN stays NaN).
+
+        Raises:
+            ImportError: if NumPy is not installed
+        """
+        _require_numpy("CompiledTariff.energy_charges")
+        uppers, lowers, bases, rates = self._arrays
+        i = np.searchsorted(uppers, units, side="left")
+        return bases[i] + (units - lowers[i]) * rates[i]
+
+
+class TariffBook:
+    """All categories of one tariff version, plus the flat charges."""
+
+    def __init__(self, version: str, categories: Dict[str, CompiledTariff],
+                 customer_charges: float, duty_rate: float) -> None:
+        self.version = version
+        self.categories = categories
+        self.names = tuple(categories)
+        self.customer_charges = customer_charges
+        self.duty_rate = duty_rate
+        self._codes = {name: code for code, name in enumerate(self.names)}
+        self._paise: Optional[PaiseTables] = None
+
+    def __contains__(self, customer_type: str) -> bool:
+        return customer_type.upper() in self._codes
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def code(self, customer_type: str) -> int:
+        """Index of the category in `names` (case-insensitive), -1 if unknown."""
+        return self._codes.get(customer_type.upper(), -1)
+
+    def get(self, customer_type: str) -> Optional[CompiledTariff]:
+        return self.categories.get(customer_type.upper())
+
+    def paise_tables(self) -> "PaiseTables":
+        """The book in scaled integers, compiled on first use."""
+        if self._paise is None:
+            self._paise = PaiseTables(self)
+        return self._paise
+
+    def to_config(self) -> dict:
+        """Return the config this book was compiled from (JSON-serializable)."""
+        return {
+            "version": self.version,
+            "customer_charges": self.customer_charges,
+            "duty_rate": self.duty_rate,
+            "categories": {
+                name: {"fixed": tariff.fixed, "slabs": [list(slab) for slab in tariff.slabs]}
+                for name, tariff in self.categories.items()
+            },
+        }
+
+
+class PaiseTables:
+    """A TariffBook in scaled int64 for exact billing.
+
+    Consumption is counted in 1 / unit_scale units and slab rates in
+    1 / rate_scale paise (rate_scale is the smallest power of ten that
+    makes every rate whole), so the energy charge before rounding is an
+    exact integer in 1 / divisor paise. Fixed and customer charges are
+    whole paise; the duty rate is the fraction duty[0] / duty[1].
+
+    Raises:
+        ImportError: if NumPy is not installed
+        ValueError: if a slab bound is finer than 1 / unit_scale units, or
+            a fixed or customer charge is not a whole number of paise
+    """
+
+    def __init__(self, book: TariffBook, unit_decimals: int = UNIT_DECIMALS) -> None:
+        _require_numpy("Exact billing (PaiseTables)")
+        rates = [exact(rate) * 100 for tariff in book.categories.values() for _, rate in tariff.slabs]
+        decimals = max([-min(rate.normalize().as_tuple().exponent, 0) for rate in rates] + [0])
+        self.unit_scale = 10 ** unit_decimals
+        self.rate_scale = 10 ** decimals
+        self.divisor = self.unit_scale * self.rate_scale
+        self.tables = []  # (uppers, lowers, bases, rates) per category, as in CompiledTariff
+        for tariff in book.categories.values():
+            uppers = [_integral(exact(upper) * self.unit_scale, f"{tariff.name} slab bound")
+                      for upper in tariff.uppers]
+            lowers = [0] + uppers
+            rates = [_integral(exact(rate) * 100 * self.rate_scale, f"{tariff.name} rate")
+                     for rate in tariff.rates]
+            bases = [0]
+            for lower, upper, rate in zip(lowers, uppers, rates):
+                bases.append(bases[-1] + (upper - lower) * rate)
+            self.tables.append(tuple(np.array(values, dtype=np.int64)
+                                     for values in (uppers, lowers, bases, rates)))
+        self.fixed = np.array([_integral(exact(tariff.fixed) * 100, f"{tariff.name} fixed charge")
+                               for tariff in book.categories.values()], dtype=np.int64)
+        self.customer_charges = _integral(exact(book.customer_charges) * 100, "customer charge")
+        self.duty = exact(book.duty_rate).as_integer_ratio()
+        # Largest consumption (in 1 / unit_scale units) whose charges fit in int64:
+        # the energy charge is at most units * top rate, the duty a multiple of it.
+        top_rate = max([int(table[3].max(initial=1)) for table in self.tables] + [1])
+        self.max_units = 2**62 // (top_rate * max(self.duty[0], 1))
+
+
+def load_tariffs(path: Optional[str] = None) -> TariffBook:
+    """Read and compile the tariff config at path (default TARIFF_PATH).
+
+    Raises:
+        ValueError: if the config is malformed
+    """
+    path = path or TARIFF_PATH
+    with open(path, encoding="utf-8") as f:
+        try:
+            config = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: invalid JSON: {e}") from None
+    try:
+        categories = {
+            name.upper(): CompiledTariff(name.upper(), [tuple(slab) for slab in entry["slabs"]],
+                                         entry["fixed"])
+            for name, entry in config["categories"].items()
+        }
+        return TariffBook(str(config["version"]), categories,
+                          config["customer_charges"], config["duty_rate"])
+    except (AttributeError, KeyError, TypeError) as e:
+        raise ValueError(f"{path}: malformed tariff config ({e!r})") from None
@@ -0,0 +1,126 @@
+import math
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import TGNPDCL
+from bench_billing import bill_decimal
+from billing_engine import (ROUNDINGS, STATUS_BAD_READING, STATUS_OK, STATUS_UNKNOWN_TYPE, TARIFFS,
+                            bill_arrays, bill_paise, iter_csv_batches)
+
+# Consumption around the slab bounds of the shipped tariffs (100 and 200 units).
+BOUNDARY_UNITS = (0, 0.01, 50, 99.99, 100, 100.01, 150, 199.99, 200, 200.01, 200.5, 1000)
+
+
+def bill_row(customer_type, previous, current):
+    """The bill of one row as TGNPDCL.main computes it."""
+    units = current - previous
+    energy = TGNPDCL.calculate_energy_charges(units, customer_type)
+    fixed = TGNPDCL.calculate_fixed_charges(customer_type)
+    customer = TGNPDCL.calculate_customer_charges()
+    duty = TGNPDCL.calculate_electricity_duty(energy)
+    return units, energy, fixed, customer, duty, energy + fixed + customer + duty
+
+
+class TestBillArrays(unittest.TestCase):
+    def assert_matches_rows(self, types, previous, current, bills):
+        for i, (customer_type, prev, cur) in enumerate(zip(types, previous, current)):
+            expected = bill_row(customer_type, prev, cur)
+            got = tuple(float(column[i]) for column in bills[:6])
+            self.assertEqual(got, expected, f"{customer_type} {prev} -> {cur}")
+            self.assertEqual(bills.status[i], STATUS_OK)
+
+    def test_slab_boundaries_match_per_row_functions(self):
+        for name in TARIFFS.names:
+            for previous in (0.0, 1234.5):
+                with self.subTest(type=name, previous=previous):
+                    current = [previous + units for units in BOUNDARY_UNITS]
+                    codes = np.full(len(current), TARIFFS.code(name))
+                    prev = np.full(len(current), previous)
+                    bills = bill_arrays(codes, prev, np.array(current))
+                    self.assert_matches_rows([name] * len(current), prev.tolist(), current, bills)
+
+    def test_parsed_csv_matches_per_row_functions(self):
+        rows = [(f"C{i}", name.title(), 1000.0, 1000 + units)
+                for name in TARIFFS.names for i, units in enumerate(BOUNDARY_UNITS)]
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write("customer,type,previous_reading,current_reading\n")
+                f.writelines(f"{c},{t},{p!r},{cur!r}\n" for c, t, p, cur in rows)
+            batches = list(iter_csv_batches(path))
+        finally:
+            os.unlink(path)
+        self.assertEqual(len(batches), 1)
+        batch = batches[0]
+        self.assertEqual(batch.previous.tolist(), [row[2] for row in rows])
+        self.assertEqual(batch.current.tolist(), [row[3] for row in rows])
+        bills = bill_arrays(batch.type_code, batch.previous, batch.current)
+        self.assert_matches_rows([row[1] for row in rows], batch.previous.tolist(),
+                                 batch.current.tolist(), bills)
+
+    def test_bad_rows(self):
+        codes = np.array([TARIFFS.code("DOMESTIC"), -1, TARIFFS.code("COMMERCIAL"), 0])
+        previous = np.array([200.0, 0.0, math.nan, 10.0])
+        current = np.array([100.0, 100.0, 50.0, 10.0])
+        bills = bill_arrays(codes, previous, current)
+        self.assertEqual(bills.status.tolist(),
+                         [STATUS_BAD_READING, STATUS_UNKNOWN_TYPE, STATUS_BAD_READING, STATUS_OK])
+        for column in bills[1:6]:
+            self.assertTrue(np.isnan(column[:3]).all())
+        self.assertTrue(np.isnan(bills.units[[0, 2]]).all())
+        self.assertEqual(bills.units[1], 100.0)
+        self.assertEqual(bills.total[3], TARIFFS.get(TARIFFS.names[0]).fixed + TARIFFS.customer_charges)
+
+
+class TestBillPaise(unittest.TestCase):
+    def assert_matches_decimal(self, name, previous, current, rounding):
+        codes = np.full(len(current), TARIFFS.code(name))
+        bills = bill_paise(codes, np.array(previous), np.array(current), rounding=rounding)
+        self.assertTrue((bills.status == STATUS_OK).all())
+        for prev, cur, total in zip(previous, current, bills.total.tolist()):
+            expected = bill_decimal(name, prev, cur, rounding=rounding) * 100
+            self.assertEqual(total, expected, f"{name} {prev} -> {cur} ({rounding})")
+        return bills.total
+
+    def test_slab_boundaries_match_decimal(self):
+        for name in TARIFFS.names:
+            for rounding in ROUNDINGS.values():
+                for previous in (0.0, 1234.5):
+                    with self.subTest(type=name, rounding=rounding, previous=previous):
+                        current = [previous + units for units in BOUNDARY_UNITS]
+                        self.assert_matches_decimal(name, [previous] * len(current), current, rounding)
+
+    def test_half_paisa_and_half_unit_readings_match_decimal(self):
+        # Thousandths of a unit at 1.45 or 3.85 rupees often cost a whole and
+        # a half paisa; readings in ten-thousandths also round to half units.
+        current = [k / 1000 for k in range(0, 2000, 7)] + [k / 10000 for k in range(0, 2000, 5)]
+        current += [100 + k / 10000 for k in range(0, 100, 5)]
+        for name in TARIFFS.names:
+            totals = {}
+            for rounding in ROUNDINGS.values():
+                with self.subTest(type=name, rounding=rounding):
+                    totals[rounding] = self.assert_matches_decimal(
+                        name, [0.0] * len(current), current, rounding)
+            # The readings do exercise ties, where the two roundings differ.
+            self.assertTrue((totals[ROUNDINGS["half_up"]] != totals[ROUNDINGS["half_even"]]).any())
+
+    def test_consumption_overflowing_int64_is_bad_reading(self):
+        tables = TARIFFS.paise_tables()
+        too_many = (tables.max_units + 1) / tables.unit_scale
+        previous = np.array([0.0, 0.0, 0.0, 1e15])
+        current = np.array([too_many, 1e15, 1e300, 1e15 + 1000])
+        for rounding in ROUNDINGS.values():
+            bills = bill_paise(np.zeros(4, dtype=np.int64), previous, current, rounding=rounding)
+            self.assertEqual(bills.status.tolist(), [STATUS_BAD_READING] * 4)
+            self.assertEqual(bills.total.tolist(), [0] * 4)
+        largest = tables.max_units // tables.unit_scale
+        bills = bill_paise(np.zeros(1, dtype=np.int64), np.zeros(1), np.array([float(largest)]))
+        self.assertEqual(bills.status.tolist(), [STATUS_OK])
+        self.assertEqual(bills.total[0], bill_decimal(TARIFFS.names[0], 0.0, float(largest)) * 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import csv
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from billing_engine import TARIFFS
+from billing_store import rebill
+from tariffs import load_tariffs
+
+READINGS = [
+    ("A1", "Domestic", 1000.0, 1150.0),
+    ("A2", "Domestic", 500.0, 700.0),
+    ("B1", "Commercial", 10.0, 90.5),
+    ("B2", "Commercial", 0.0, 250.0),
+]
+
+
+class TestRebill(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.store = os.path.join(self.dir, "bills.db")
+        self.diff = os.path.join(self.dir, "diff.csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write_readings(self, rows, name="readings.csv"):
+        path = os.path.join(self.dir, name)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["customer", "type", "previous_reading", "current_reading"])
+            writer.writerows(rows)
+        return path
+
+    def diff_rows(self):
+        with open(self.diff, newline="") as f:
+            return list(csv.DictReader(f))
+
+    def stored(self):
+        conn = sqlite3.connect(self.store)
+        try:
+            return {row[0]: row[1:] for row in conn.execute(
+                "SELECT customer, previous_reading, current_reading, tariff_version, total "
+                "FROM bills WHERE cycle = '2024-06'")}
+        finally:
+            conn.close()
+
+    def revised_tariffs(self):
+        config = TARIFFS.to_config()
+        config["version"] = "2024-2"
+        config["categories"]["COMMERCIAL"]["fixed"] = 60
+        path = os.path.join(self.dir, "tariffs.json")
+        with open(path, "w") as f:
+            json.dump(config, f)
+        return load_tariffs(path)
+
+    def test_unchanged_readings_are_not_rebilled(self):
+        path = self.write_readings(READINGS)
+        counts = rebill(self.store, "2024-06", self.diff, path)
+        self.assertEqual(counts, {"rows": 4, "recomputed": 4, "new": 4, "changed": 0})
+        counts = rebill(self.store, "2024-06", self.diff, path)
+        self.assertEqual(counts, {"rows": 4, "recomputed": 0, "new": 0, "changed": 0})
+        self.assertEqual(self.diff_rows(), [])
+
+    def test_only_corrected_rows_are_rebilled(self):
+        rebill(self.store, "2024-06", self.diff, self.write_readings(READINGS))
+        before = self.stored()
+        corrections = self.write_readings([("A2", "Domestic", 500.0, 720.0),
+                                           ("B1", "Commercial", 10.0, 90.5)], "fix.csv")
+        counts = rebill(self.store, "2024-06", self.diff, corrections)
+        self.assertEqual(counts, {"rows": 2, "recomputed": 1, "new": 0, "changed": 1})
+        [row] = self.diff_rows()
+        self.assertEqual((row["customer"], row["change"]), ("A2", "CHANGED"))
+        self.assertEqual(float(row["previous_total"]), round(before["A2"][3], 2))
+        after = self.stored()
+        self.assertEqual(after["A2"][1], 720.0)
+        self.assertEqual({k: v for k, v in after.items() if k != "A2"},
+                         {k: v for k, v in before.items() if k != "A2"})
+
+    def test_new_tariff_version_rebills_stored_rows(self):
+        rebill(self.store, "2024-06", self.diff, self.write_readings(READINGS))
+        before = self.stored()
+        counts = rebill(self.store, "2024-06", self.diff, tariffs=self.revised_tariffs())
+        self.assertEqual(counts, {"rows": 0, "recomputed": 4, "new": 0, "changed": 2})
+        self.assertEqual(sorted(row["customer"] for row in self.diff_rows()), ["B1", "B2"])
+        after = self.stored()
+        self.assertEqual({value[2] for value in after.values()}, {"2024-2"})
+        self.assertAlmostEqual(after["B1"][3] - before["B1"][3], 10.0)
+        self.assertEqual(after["A1"][3], before["A1"][3])
+        counts = rebill(self.store, "2024-06", self.diff, tariffs=self.revised_tariffs())
+        self.assertEqual(counts["recomputed"], 0)
+
+    def test_reused_version_with_other_config_is_refused(self):
+        rebill(self.store, "2024-06", self.diff, self.write_readings(READINGS))
+        revised = self.revised_tariffs()
+        revised.version = TARIFFS.version
+        with self.assertRaises(ValueError):
+            rebill(self.store, "2024-06", self.diff, tariffs=revised)
+
+    def test_duplicate_customer_keeps_later_row(self):
+        rows = READINGS + [("A1", "Domestic", 1000.0, 1300.0)]
+        path = self.write_readings(rows)
+        counts = rebill(self.store, "2024-06", self.diff, path)
+        self.assertEqual(counts, {"rows": 5, "recomputed": 4, "new": 4, "changed": 0})
+        self.assertEqual(self.stored()["A1"][1], 1300.0)
+        [row] = [row for row in self.diff_rows() if row["customer"] == "A1"]
+        self.assertEqual(float(row["units"]), 300.0)
+        # Re-running the same file finds nothing stale.
+        counts = rebill(self.store, "2024-06", self.diff, path)
+        self.assertEqual(counts["recomputed"], 0)
+        self.assertEqual(self.stored()["A1"][1], 1300.0)
+
+    def test_duplicate_customer_across_blocks(self):
+        rows = [("A1", "Domestic", 1000.0, 1150.0)]
+        rows += [(f"C{i}", "Domestic", 0.0, float(i)) for i in range(200)]
+        rows += [("A1", "Domestic", 1000.0, 1300.0)]
+        path = self.write_readings(rows)
+        counts = rebill(self.store, "2024-06", self.diff, path, block_size=256)
+        self.assertEqual(counts, {"rows": 202, "recomputed": 201, "new": 201, "changed": 0})
+        ledger = [row for row in self.diff_rows() if row["customer"] == "A1"]
+        self.assertEqual([(row["change"], float(row["units"])) for row in ledger], [("NEW", 300.0)])
+        self.assertEqual(self.stored()["A1"][1], 1300.0)
+        counts = rebill(self.store, "2024-06", self.diff, path, block_size=256)
+        self.assertEqual(counts, {"rows": 202, "recomputed": 0, "new": 0, "changed": 0})
+        self.assertEqual(self.diff_rows(), [])
+        # A correction listing A1 twice is diffed against the bill from before the run.
+        total = self.stored()["A1"][3]
+        fix = self.write_readings([("A1", "Domestic", 1000.0, 1100.0)] + rows[1:60]
+                                  + [("A1", "Domestic", 1000.0, 1200.0)], "fix.csv")
+        counts = rebill(self.store, "2024-06", self.diff, fix, block_size=256)
+        self.assertEqual(counts, {"rows": 61, "recomputed": 1, "new": 0, "changed": 1})
+        [row] = self.diff_rows()
+        self.assertEqual(float(row["previous_total"]), round(total, 2))
+        self.assertEqual(float(row["units"]), 200.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
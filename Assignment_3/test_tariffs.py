@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+from billing_engine import STATUS_OK, bill_arrays, bill_paise
+from tariffs import load_tariffs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def shipped_config():
+    with open(os.path.join(HERE, "tariffs.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+class TestLoadTariffs(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "tariffs.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, config):
+        with open(self.path, "w", encoding="utf-8") as f:
+            if isinstance(config, str):
+                f.write(config)
+            else:
+                json.dump(config, f)
+        return self.path
+
+    def test_shipped_config(self):
+        book = load_tariffs()
+        self.assertEqual(book.names, ("DOMESTIC", "COMMERCIAL"))
+        self.assertEqual(book.to_config(), shipped_config())
+        self.assertEqual(book.code("domestic"), 0)
+        self.assertEqual(book.code("Industrial"), -1)
+        self.assertAlmostEqual(book.get("Domestic").energy_charge(150), 100 * 1.45 + 50 * 2.60)
+
+    def test_environment_override(self):
+        config = shipped_config()
+        config["version"] = "2099-1"
+        config["duty_rate"] = 0.07
+        path = self.write(config)
+        code = ("import tariffs, billing_engine; "
+                "print(tariffs.TARIFF_PATH); print(billing_engine.TARIFFS.version, tariffs.load_tariffs().duty_rate)")
+        env = dict(os.environ, TGNPDCL_TARIFFS=path)
+        output = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.splitlines(), [path, "2099-1 0.07"])
+        # Without the variable, the config next to tariffs.py is used.
+        env.pop("TGNPDCL_TARIFFS")
+        output = subprocess.run([sys.executable, "-c", code], cwd=HERE, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.splitlines()[0], os.path.join(HERE, "tariffs.json"))
+
+    def test_new_category_from_config_only(self):
+        config = shipped_config()
+        config["categories"]["Industrial"] = {"fixed": 150, "slabs": [[500, 5.0], [1000, 6.5], [None, 7.25]]}
+        book = load_tariffs(self.write(config))
+        self.assertEqual(book.names, ("DOMESTIC", "COMMERCIAL", "INDUSTRIAL"))
+        self.assertIn("industrial", book)
+        code = book.code("industrial")
+        self.assertEqual(code, 2)
+        industrial = book.get("INDUSTRIAL")
+        units = np.array([0.0, 500.0, 750.0, 1000.0, 1200.0])
+        expected = [0.0, 2500.0, 2500.0 + 250 * 6.5, 5750.0, 5750.0 + 200 * 7.25]
+        self.assertEqual([industrial.energy_charge(u) for u in units.tolist()], expected)
+        self.assertEqual(industrial.energy_charges(units).tolist(), expected)
+
+        codes = np.full(len(units), code)
+        bills = bill_arrays(codes, np.zeros(len(units)), units, tariffs=book)
+        self.assertTrue((bills.status == STATUS_OK).all())
+        self.assertEqual(bills.energy_charges.tolist(), expected)
+        self.assertEqual(bills.fixed_charges.tolist(), [150.0] * len(units))
+        exact = bill_paise(codes, np.zeros(len(units)), units, tariffs=book)
+        energy = [round(x * 100) for x in expected]
+        duty = [round(x * 0.06) for x in energy]  # no exact half paisa here
+        self.assertEqual(exact.total.tolist(), [e + 15000 + 3500 + d for e, d in zip(energy, duty)])
+
+    def test_malformed_configs_are_rejected(self):
+        cases = {
+            "invalid JSON": '{"version": "x",',
+            "not an object": [],
+            "no categories": {"version": "x", "customer_charges": 35, "duty_rate": 0.06},
+            "categories not an object": dict(shipped_config(), categories=[]),
+            "no fixed charge": {"DOMESTIC": {"slabs": [[None, 1.0]]}},
+            "slab not a pair": {"DOMESTIC": {"fixed": 25, "slabs": [[100, 1.0, 2.0], [None, 2.0]]}},
+            "text bound": {"DOMESTIC": {"fixed": 25, "slabs": [["100", 1.0], [None, 2.0]]}},
+            "no slabs": {"DOMESTIC": {"fixed": 25, "slabs": []}},
+            "bounded last slab": {"DOMESTIC": {"fixed": 25, "slabs": [[100, 1.0], [200, 2.0]]}},
+            "unbounded middle slab": {"DOMESTIC": {"fixed": 25, "slabs": [[None, 1.0], [None, 2.0]]}},
+            "decreasing bounds": {"DOMESTIC": {"fixed": 25, "slabs": [[200, 1.0], [100, 2.0], [None, 3.0]]}},
+            "repeated bound": {"DOMESTIC": {"fixed": 25, "slabs": [[100, 1.0], [100, 2.0], [None, 3.0]]}},
+            "zero bound": {"DOMESTIC": {"fixed": 25, "slabs": [[0, 1.0], [None, 2.0]]}},
+            "NaN bound": {"DOMESTIC": {"fixed": 25, "slabs": [[float("nan"), 1.0], [None, 2.0]]}},
+            "infinite bound": {"DOMESTIC": {"fixed": 25, "slabs": [[float("inf"), 1.0], [None, 2.0]]}},
+            "negative rate": {"DOMESTIC": {"fixed": 25, "slabs": [[100, -1.0], [None, 2.0]]}},
+            "NaN rate": {"DOMESTIC": {"fixed": 25, "slabs": [[100, 1.0], [None, float("nan")]]}},
+        }
+        for name, config in cases.items():
+            if isinstance(config, dict) and "version" not in config:
+                config = dict(shipped_config(), categories=config)
+            with self.subTest(name):
+                with self.assertRaises(ValueError):
+                    load_tariffs(self.write(config))
+
+
+if __name__ == "__main__":
+    unittest.main()
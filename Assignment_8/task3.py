@@ -1,14 +1,26 @@
-import re
 import unittest
 
+import common_package  # makes the shared `common` package importable
+from common.palindromes import Normalizer, PalindromeIndex
+
+_NORMALIZER = Normalizer("word")
+
 def is_sentence_palindrome(sentence: str) -> bool:
     if not isinstance(sentence, str):
         raise TypeError("Sentence must be a string.")
 
-    cleaned = re.sub(r"[^\w]", "", sentence).lower()
+    cleaned = _NORMALIZER.normalize(sentence)
     return cleaned == cleaned[::-1]
 
 
+def longest_sentence_palindrome(sentence: str) -> str:
+    """Return the longest palindromic stretch of `sentence`, ignoring case and punctuation."""
+    if not isinstance(sentence, str):
+        raise TypeError("Sentence must be a string.")
+
+    return PalindromeIndex(sentence, "word").longest()[2]
+
+
 class TestIsSentencePalindrome(unittest.TestCase):
     def test_classic_palindrome(self):
         self.assertTrue(is_sentence_palindrome("A man, a plan, a canal: Panama"))
@@ -32,6 +44,13 @@ class TestIsSentencePalindrome(unittest.TestCase):
         with self.assertRaises(TypeError):
             is_sentence_palindrome(12345)
 
+    def test_longest_palindrome_in_sentence(self):
+        self.assertEqual(longest_sentence_palindrome("I said: Was it a rat I saw?"), "Was it a rat I saw")
+
+    def test_longest_palindrome_non_string_input(self):
+        with self.assertRaises(TypeError):
+            longest_sentence_palindrome(None)
+
 if __name__ == "__main__":
     unittest.main(exit=False)
     try:
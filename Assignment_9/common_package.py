@@ -0,0 +1,12 @@
+"""Make the repository's shared `common` package importable.
+
+A script only sees the modules of its own folder, so every assignment
+folder that uses `common` has this same small stub. It runs
+common/bootstrap.py, which registers ../common as the `common` package
+without changing sys.path; change that file, not the stubs.
+"""
+
+import os
+import runpy
+
+runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "common", "bootstrap.py"))
@@ -1,3 +1,7 @@
+import common_package  # makes the shared `common` package importable
+from common.parity import even_odd_sums
+
+
 def sum_even_odd(numbers: list[int]) -> tuple[int, int]:
 	"""Return the sum of even and odd integers from a list.
 
@@ -21,6 +25,11 @@ def sum_even_odd(numbers: list[int]) -> tuple[int, int]:
 	if not hasattr(numbers, '__iter__'):
 		raise TypeError('numbers must be an iterable of integers')
 
+	# Integer arrays and buffers (array('q'), memoryview, NumPy): vectorized.
+	fast = even_odd_sums(numbers)
+	if fast is not None:
+		return fast
+
 	sum_even = 0
 	sum_odd = 0
 
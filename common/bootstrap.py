@@ -0,0 +1,18 @@
+"""Register this directory as the `common` package.
+
+Run (with runpy) by the common_package.py stub of each assignment folder,
+before `common` can be imported; sys.path is not changed.
+"""
+
+import importlib.util
+import os
+import sys
+
+if "common" not in sys.modules:
+    _PATH = os.path.dirname(os.path.abspath(__file__))
+    _spec = importlib.util.spec_from_file_location(
+        "common", os.path.join(_PATH, "__init__.py"), submodule_search_locations=[_PATH]
+    )
+    _module = importlib.util.module_from_spec(_spec)
+    sys.modules["common"] = _module
+    _spec.loader.exec_module(_module)
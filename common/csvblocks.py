@@ -0,0 +1,82 @@
+"""Newline-aligned blocks and byte ranges of CSV files.
+
+Provides:
+- iter_line_blocks(f, end=None, block_size, balance_quotes=False) -> blocks
+  of whole lines from the current position of a binary file up to `end`
+- split_offsets(path, start, parts) -> byte offsets at line starts, for
+  handing one range of a file to each worker process
+- has_open_quote(block) -> whether a line of the block has an odd number of
+  quote characters, i.e. a quoted field may span lines
+- header_positions(header, columns) -> index of every required column
+
+Cutting at raw newlines is only valid when no quoted field spans lines.
+Readers of a whole file can ask iter_line_blocks to balance quotes, so a
+block never ends inside a quoted field; workers that start mid-file cannot
+know the quoting state, so they check has_open_quote and give up instead.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence
+
+BLOCK_SIZE = 1 << 23
+
+
+def iter_line_blocks(
+    f: BinaryIO, end: Optional[int] = None, block_size: int = BLOCK_SIZE, balance_quotes: bool = False
+) -> Iterator[bytes]:
+    """Yield blocks from the current position up to `end` (None: EOF), cut after a newline.
+
+    With balance_quotes, a block is never cut inside a quoted field. The last
+    block is whatever follows the last cut and may lack a final newline.
+    """
+    remaining = None if end is None else end - f.tell()
+    tail = b""
+    while remaining is None or remaining > 0:
+        data = f.read(block_size if remaining is None else min(block_size, remaining))
+        if not data:
+            break
+        if remaining is not None:
+            remaining -= len(data)
+        data = tail + data
+        cut = data.rfind(b"\n") + 1
+        while balance_quotes and cut and data.count(b'"', 0, cut) & 1:
+            cut = data.rfind(b"\n", 0, cut - 1) + 1
+        tail = data[cut:]
+        if cut:
+            yield data[:cut]
+    if tail:
+        yield tail
+
+
+def split_offsets(path: str, start: int, parts: int) -> List[int]:
+    """Return sorted byte offsets from `start` to EOF, each at a line start."""
+    size = os.path.getsize(path)
+    offsets = [start]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(max(start + (size - start) * i // parts - 1, offsets[-1]))
+            f.readline()
+            if offsets[-1] < f.tell() < size:
+                offsets.append(f.tell())
+    offsets.append(size)
+    return offsets
+
+
+def has_open_quote(block: bytes) -> bool:
+    """Return True if a line of block has an odd number of '"' characters."""
+    return b'"' in block and any(line.count(b'"') & 1 for line in block.split(b"\n"))
+
+
+def header_positions(header: Sequence[str], columns: Sequence[str], what: str = "CSV file") -> Dict[str, int]:
+    """Return {column: index in header}, matching names case-insensitively.
+
+    Raises:
+        ValueError: if a column is missing
+    """
+    names = [name.strip().lower() for name in header]
+    missing = [name for name in columns if name.lower() not in names]
+    if missing:
+        raise ValueError(f"Missing columns in {what}: {', '.join(missing)}")
+    return {name: names.index(name.lower()) for name in columns}
@@ -0,0 +1,164 @@
+"""Fast bulk parsing of whitespace-separated numbers from byte streams.
+
+Provides:
+- read_numbers(stream=None, kind="int") -> (values, bad_tokens)
+- parse_block(block, offset, kind) -> (values, bad_tokens)
+- ParseError, raised for the first bad token when errors="raise"
+
+The stream (sys.stdin.buffer by default) is read in large blocks that are
+cut on whitespace, and each block is converted in one call: numpy.fromstring
+when NumPy is installed, otherwise array(typecode, map(int/float, tokens)).
+Only when a block contains a bad token is it re-scanned token by token, so
+every bad token is reported with its byte offset in the stream.
+
+Integers are returned as array('q') and floats as array('d'). Integers that
+do not fit in 64 bits are parsed with int(), and the result is then a list
+of Python ints instead. Commas are treated as whitespace.
+"""
+
+from __future__ import annotations
+
+import re
+import sys
+from array import array
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BLOCK_SIZE = 1 << 20
+
+_TOKEN = re.compile(rb"[^\s,]+")
+_WHITESPACE = b" \t\n\r\v\f,"
+_COMMA_TO_SPACE = bytes.maketrans(b",", b" ")
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+BadToken = Tuple[int, str]
+Numbers = Union[array, List[int]]
+
+
+class ParseError(ValueError):
+    """A token that is not a valid number, with its byte offset."""
+
+    def __init__(self, offset: int, token: str, kind: str) -> None:
+        label = "integer" if kind == "int" else "number"
+        super().__init__(f"'{token}' at byte offset {offset} is not a valid {label}")
+        self.offset = offset
+        self.token = token
+
+
+def _typecode(kind: str) -> str:
+    if kind == "int":
+        return "q"
+    if kind == "float":
+        return "d"
+    raise ValueError(f"kind must be 'int' or 'float', got {kind!r}")
+
+
+def iter_blocks(stream: BinaryIO, block_size: int = BLOCK_SIZE) -> Iterator[Tuple[int, bytes]]:
+    """Yield (byte offset, block) pairs where no token is split across blocks."""
+    offset = 0
+    tail = b""
+    while True:
+        data = stream.read(block_size)
+        if not data:
+            break
+        data = tail + data
+        cut = max(data.rfind(bytes([c])) for c in _WHITESPACE) + 1
+        if cut == 0:
+            tail = data
+            continue
+        yield offset, data[:cut]
+        offset += cut
+        tail = data[cut:]
+    if tail:
+        yield offset, tail
+
+
+def _parse_slow(block: bytes, offset: int, kind: str) -> Tuple[Numbers, List[BadToken]]:
+    convert = int if kind == "int" else float
+    values: Numbers = array(_typecode(kind))
+    bad: List[BadToken] = []
+    for match in _TOKEN.finditer(block):
+        token = match.group()
+        try:
+            value = convert(token)
+        except ValueError:
+            bad.append((offset + match.start(), token.decode(errors="replace")))
+            continue
+        if kind == "int" and isinstance(values, array) and not _INT64_MIN <= value <= _INT64_MAX:
+            values = values.tolist()  # beyond 64 bits: keep Python ints
+        values.append(value)
+    return values, bad
+
+
+def parse_block(block: bytes, offset: int = 0, kind: str = "int") -> Tuple[Numbers, List[BadToken]]:
+    """Parse every token in `block`; return the values and the bad tokens.
+
+    `offset` is the byte offset of the block in the stream, used for the
+    positions reported in bad tokens. The values are an array, or a list of
+    ints if an integer does not fit in 64 bits.
+    """
+    typecode = _typecode(kind)
+    text = block.translate(_COMMA_TO_SPACE)
+    if not text.strip():
+        return array(typecode), []  # fromstring reads blank input as [0]
+    if np is not None:
+        dtype = np.int64 if kind == "int" else np.float64
+        try:
+            parsed = np.fromstring(text, dtype=dtype, sep=" ")
+        except ValueError:
+            return _parse_slow(block, offset, kind)
+        # fromstring saturates on int64 overflow instead of failing
+        if kind == "int" and parsed.size and (
+            parsed.max() == _INT64_MAX or parsed.min() == _INT64_MIN
+        ):
+            return _parse_slow(block, offset, kind)
+        values = array(typecode)
+        values.frombytes(parsed.tobytes())
+        return values, []
+    try:
+        return array(typecode, map(int if kind == "int" else float, text.split())), []
+    except (ValueError, OverflowError):
+        return _parse_slow(block, offset, kind)
+
+
+def read_numbers(
+    stream: Optional[BinaryIO] = None,
+    kind: str = "int",
+    block_size: int = BLOCK_SIZE,
+    errors: str = "raise",
+) -> Tuple[Numbers, List[BadToken]]:
+    """Read all numbers from a binary stream (default: sys.stdin.buffer).
+
+    Args:
+        stream: binary file-like object
+        kind: "int" (array('q'), or a list once an integer does not fit in
+            64 bits) or "float" (array('d'))
+        block_size: bytes read per block
+        errors: "raise" to stop at the first bad token, "skip" to collect
+            every bad token and keep going
+
+    Returns:
+        (values, bad_tokens) where bad_tokens is a list of (offset, token)
+
+    Raises:
+        ParseError: on the first bad token when errors="raise"
+    """
+    if errors not in ("raise", "skip"):
+        raise ValueError(f"errors must be 'raise' or 'skip', got {errors!r}")
+    if stream is None:
+        stream = sys.stdin.buffer
+    values: Numbers = array(_typecode(kind))
+    bad_tokens: List[BadToken] = []
+    for offset, block in iter_blocks(stream, block_size):
+        parsed, bad = parse_block(block, offset, kind)
+        if bad and errors == "raise":
+            raise ParseError(*bad[0], kind)
+        if isinstance(parsed, list) and isinstance(values, array):
+            values = values.tolist()
+        values.extend(parsed)
+        bad_tokens.extend(bad)
+    return values, bad_tokens
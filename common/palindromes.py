@@ -0,0 +1,174 @@
+"""Palindrome normalization and Manacher-based palindrome analytics.
+
+Provides:
+- Normalizer(mode): cached str.translate table that drops ignored characters
+  and lowercases the rest, optionally with a map back to original offsets
+- manacher(s) -> palindrome lengths for every centre of s, in O(len(s))
+- PalindromeIndex(text, mode): longest palindromic substring and all
+  maximal palindromes of the normalized text, reported as offsets into the
+  original text
+- is_palindrome_file(path): "alnum" palindrome check of a file of any size,
+  two pointers walking inward over mmap'ed blocks
+
+Modes match the existing checkers:
+- "alnum": keep ASCII [0-9a-zA-Z] (Assignment_2 is_palindrome)
+- "word": keep \\w characters, i.e. str.isalnum() or "_" (Assignment_8
+  is_sentence_palindrome)
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from array import array
+from itertools import chain, repeat
+from typing import Dict, Iterator, List, Tuple
+
+_ASCII_ALNUM = frozenset("0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+BLOCK_SIZE = 1 << 20
+# bytes.translate arguments: fold A-Z to a-z, delete everything but [0-9a-zA-Z].
+_FOLD = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz")
+_DROP = bytes(b for b in range(256) if chr(b) not in _ASCII_ALNUM)
+
+
+class _TranslationTable(dict):
+    """str.translate table filled lazily: each code point is classified once."""
+
+    def __init__(self, mode: str) -> None:
+        super().__init__()
+        if mode == "alnum":
+            self._keep = _ASCII_ALNUM.__contains__
+        elif mode == "word":
+            self._keep = lambda ch: ch.isalnum() or ch == "_"
+        else:
+            raise ValueError(f"mode must be 'alnum' or 'word', got {mode!r}")
+
+    def __missing__(self, code: int) -> str:
+        ch = chr(code)
+        # '' deletes the character; using '' rather than None keeps len() valid
+        value = ch.lower() if self._keep(ch) else ""
+        self[code] = value
+        return value
+
+
+_TABLES: Dict[str, _TranslationTable] = {}
+
+
+class Normalizer:
+    """Drop ignored characters and lowercase the rest with one str.translate."""
+
+    def __init__(self, mode: str = "alnum") -> None:
+        if mode not in _TABLES:
+            _TABLES[mode] = _TranslationTable(mode)
+        self.mode = mode
+        self.table = _TABLES[mode]
+
+    def normalize(self, text: str) -> str:
+        return text.translate(self.table)
+
+    def normalize_with_positions(self, text: str) -> Tuple[str, array]:
+        """Return (normalized text, offset in `text` of every normalized character)."""
+        normalized = text.translate(self.table)
+        lookup = self.table.__getitem__
+        lengths = map(len, map(lookup, map(ord, text)))
+        positions = array("q", chain.from_iterable(map(repeat, range(len(text)), lengths)))
+        return normalized, positions
+
+
+def manacher(s: str) -> List[int]:
+    """Return the palindrome length at each of the 2 * len(s) + 1 centres.
+
+    Centre i lies on character (i - 1) // 2 when i is odd and between
+    characters when i is even; the palindrome at centre i with length L
+    starts at (i - L) // 2.
+    """
+    m = 2 * len(s) + 1
+    lengths = [0] * m
+    center = right = 0
+    for i in range(m):
+        length = min(right - i, lengths[2 * center - i]) if i < right else 0
+        a, b = i - length - 1, i + length + 1
+        while a >= 0 and b < m and (a % 2 == 0 or s[a // 2] == s[b // 2]):
+            length += 1
+            a -= 1
+            b += 1
+        lengths[i] = length
+        if i + length > right:
+            center, right = i, i + length
+    return lengths
+
+
+class PalindromeIndex:
+    """Manacher index over the normalized form of `text`."""
+
+    def __init__(self, text: str, mode: str = "alnum") -> None:
+        self.text = text
+        self.normalized, self._positions = Normalizer(mode).normalize_with_positions(text)
+        self._lengths = manacher(self.normalized)
+
+    def _span(self, start: int, length: int) -> Tuple[int, int]:
+        """Map a normalized [start, start + length) to original offsets."""
+        return self._positions[start], self._positions[start + length - 1] + 1
+
+    def is_palindrome(self) -> bool:
+        return self._lengths[len(self.normalized)] == len(self.normalized)
+
+    def longest(self) -> Tuple[int, int, str]:
+        """Return (start, end, text[start:end]) of the leftmost longest palindrome.
+
+        Offsets refer to the original text; (0, 0, "") when nothing is kept.
+        """
+        if not self.normalized:
+            return 0, 0, ""
+        best = max(range(len(self._lengths)), key=self._lengths.__getitem__)
+        length = self._lengths[best]
+        start, end = self._span((best - length) // 2, length)
+        return start, end, self.text[start:end]
+
+    def maximal_palindromes(self, min_length: int = 2) -> Iterator[Tuple[int, int]]:
+        """Yield (start, end) of the maximal palindrome at every centre.
+
+        Only palindromes of at least `min_length` normalized characters are
+        reported, in order of their centre.
+        """
+        min_length = max(min_length, 1)
+        for i, length in enumerate(self._lengths):
+            if length >= min_length:
+                yield self._span((i - length) // 2, length)
+
+
+def is_palindrome_file(path: str, block_size: int = BLOCK_SIZE) -> bool:
+    """Return True if the file reads as a palindrome under the "alnum" rules.
+
+    Equivalent to is_palindrome on the decoded text for ASCII-compatible
+    encodings (non-ASCII bytes are never alphanumeric), but the file is
+    mmap'ed and consumed from both ends one block at a time: each block is
+    case-folded and filtered with a single bytes.translate, and at most about
+    two blocks of normalized bytes are held at once.
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be positive")
+    size = os.path.getsize(path)
+    if size == 0:
+        return True
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lo, hi = 0, size
+        front = back = b""  # normalized bytes not yet compared; back is reversed
+        while lo < hi:
+            # Refill the shorter side so both stay within about one block.
+            if len(front) <= len(back):
+                end = min(lo + block_size, hi)
+                front += mm[lo:end].translate(_FOLD, _DROP)
+                lo = end
+            else:
+                start = max(hi - block_size, lo)
+                back += mm[start:hi].translate(_FOLD, _DROP)[::-1]
+                hi = start
+            n = min(len(front), len(back))
+            if front[:n] != back[:n]:
+                return False
+            front, back = front[n:], back[n:]
+        # Everything is read; what is left is the uncompared middle.
+        middle = front or back
+        return middle == middle[::-1]
@@ -0,0 +1,79 @@
+"""Even/odd sums over integer buffers without a per-element Python loop.
+
+Provides even_odd_sums(numbers) -> (even_sum, odd_sum) or None.
+
+The fast path covers NumPy integer arrays and buffers of C integers
+(array('q') and the other integer typecodes, memoryview, bytes-like
+objects with an integer format). The parity split is done with bit masks:
+x & -(x & 1) is x for odd x and 0 for even x, so the odd sum is one masked
+reduction and the even sum is the total minus it. Sums are exact Python
+ints whatever the length: every int64 is split into a signed high and an
+unsigned low 32-bit half, each half is reduced with np.add.reduce in
+chunks small enough not to overflow, and the halves are recombined.
+
+None is returned for anything else (lists, generators, float arrays, or
+any input when NumPy is not installed), and callers fall back to their own
+validated Python loop.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Elements reduced at a time: bounds temporaries, and keeps the 32-bit
+# halves far from overflowing their 64-bit accumulators.
+CHUNK_SIZE = 1 << 20
+_INT_FORMATS = frozenset("bhilqnBHILQN")
+
+
+def _as_int_array(numbers) -> Optional["np.ndarray"]:
+    """Return a flat integer view of numbers, or None if it is not an integer buffer."""
+    if isinstance(numbers, np.ndarray):
+        return numbers.ravel() if numbers.dtype.kind in "iu" else None
+    if isinstance(numbers, (array, memoryview, bytes, bytearray)):
+        view = memoryview(numbers)
+        if view.format.lstrip("@=<>!") not in _INT_FORMATS:
+            return None
+        return np.asarray(view).ravel()
+    return None
+
+
+def _exact_sum(values: "np.ndarray") -> int:
+    """Exact sum of a (64-bit or narrower) integer chunk."""
+    if values.dtype.kind == "u":
+        values = values.astype(np.uint64, copy=False)
+        high = np.add.reduce(values >> np.uint64(32), dtype=np.uint64)
+    else:
+        values = values.astype(np.int64, copy=False)
+        high = np.add.reduce(values >> 32, dtype=np.int64)
+    low = np.add.reduce(values.view(np.uint64) & np.uint64(0xFFFFFFFF), dtype=np.uint64)
+    return (int(high) << 32) + int(low)
+
+
+def even_odd_sums(numbers) -> Optional[Tuple[int, int]]:
+    """Return (even_sum, odd_sum) of an integer array or buffer, or None.
+
+    None means numbers has no fast path (see the module docstring); the
+    caller should then iterate and validate the items itself.
+    """
+    if np is None:
+        return None
+    values = _as_int_array(numbers)
+    if values is None:
+        return None
+    total = odd = 0
+    one = values.dtype.type(1)
+    for start in range(0, values.size, CHUNK_SIZE):
+        chunk = values[start:start + CHUNK_SIZE]
+        parity = chunk & one
+        # -(x & 1) is all ones for odd x (modulo 2^bits for unsigned dtypes).
+        mask = np.negative(parity) if values.dtype.kind == "i" else (~parity + one)
+        total += _exact_sum(chunk)
+        odd += _exact_sum(chunk & mask)
+    return total - odd, odd
@@ -0,0 +1,166 @@
+"""Vectorized bulk shape areas over columnar inputs.
+
+Provides:
+- bulk_areas(shapes, x, y=None) -> (areas, invalid): one NumPy mask per
+  shape type selects the rows its formula is applied to
+- areas_csv(src, dst) -> (rows, invalid rows): streams a CSV with shape / x /
+  y columns in chunks and writes it back with "area" and "valid" appended
+
+Both need NumPy; it is imported optionally so that modules which also
+offer scalar area functions can import this one without it.
+
+Dimensions are x (radius, side, length or base) and y (width or height,
+ignored for circles and squares). A row is invalid when its shape is not
+supported, a dimension it uses is missing or not finite, or, with
+require_positive=True, not positive; invalid rows get a NaN area.
+"""
+
+from __future__ import annotations
+
+import csv
+import math
+from itertools import islice
+from typing import Dict, Iterable, Optional, Sequence, TextIO, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_ROWS = 1 << 16
+
+# name -> (formula(x, y, pi), uses y)
+AREA_FORMULAS: Dict[str, tuple] = {
+    "circle": (lambda x, y, pi: pi * x * x, False),
+    "rectangle": (lambda x, y, pi: x * y, True),
+    "triangle": (lambda x, y, pi: 0.5 * x * y, True),
+    "square": (lambda x, y, pi: x * x, False),
+}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("Bulk shape areas require NumPy")
+
+
+def _as_floats(values) -> np.ndarray:
+    """Return values as a float64 array; cells that are not numbers become NaN."""
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        result = np.empty(len(values), dtype=np.float64)
+        for i, value in enumerate(values):
+            try:
+                result[i] = float(value)
+            except (TypeError, ValueError):
+                result[i] = math.nan
+        return result
+
+
+def bulk_areas(
+    shapes: Sequence[str],
+    x,
+    y=None,
+    pi: float = math.pi,
+    require_positive: bool = True,
+    supported: Optional[Iterable[str]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the area of every row of a columnar shape table.
+
+    Args:
+        shapes: shape name per row (case-insensitive)
+        x: first dimension per row
+        y: second dimension per row (None: no shape that needs it is valid)
+        pi: value of pi used for circles
+        require_positive: mark rows with a dimension <= 0 invalid
+        supported: shape names to accept (default: every AREA_FORMULAS key)
+
+    Returns:
+        (float64 areas, bool invalid mask), both of length len(shapes)
+
+    Raises:
+        ImportError: if NumPy is not installed
+        ValueError: if the columns have different lengths or a supported
+            shape has no formula
+    """
+    _require_numpy()
+    kinds = np.char.lower(np.asarray(shapes, dtype=str).ravel())
+    x = _as_floats(x).ravel()
+    y = np.full(x.shape, math.nan) if y is None else _as_floats(y).ravel()
+    if not len(kinds) == len(x) == len(y):
+        raise ValueError("shapes, x and y must have the same length")
+    names = AREA_FORMULAS if supported is None else [name.lower() for name in supported]
+
+    areas = np.full(len(kinds), math.nan)
+    invalid = np.ones(len(kinds), dtype=bool)
+    for name in names:
+        if name not in AREA_FORMULAS:
+            raise ValueError(f"Unsupported shape: {name}")
+        formula, uses_y = AREA_FORMULAS[name]
+        rows = kinds == name
+        ok = rows & np.isfinite(x)
+        if require_positive:
+            ok &= x > 0
+        if uses_y:
+            ok &= np.isfinite(y)
+            if require_positive:
+                ok &= y > 0
+        index = np.flatnonzero(ok)
+        areas[index] = formula(x[index], y[index], pi)
+        invalid[index] = False
+    return areas, invalid
+
+
+def areas_csv(
+    src: TextIO,
+    dst: TextIO,
+    shape_column: str = "shape",
+    x_column: str = "x",
+    y_column: str = "y",
+    chunk_rows: int = CHUNK_ROWS,
+    **options,
+) -> Tuple[int, int]:
+    """Stream a shape CSV from src to dst, appending "area" and "valid" columns.
+
+    The y column is optional. Extra keyword arguments are passed to
+    bulk_areas. Returns (data rows, invalid rows).
+
+    Raises:
+        ImportError: if NumPy is not installed
+        ValueError: if the header lacks the shape or x column
+    """
+    _require_numpy()
+    reader = csv.reader(src)
+    writer = csv.writer(dst, lineterminator="\n")
+    header = next(reader, None)
+    if header is None:
+        return 0, 0
+    for name in (shape_column, x_column):
+        if name not in header:
+            raise ValueError(f"Column '{name}' not found in CSV header")
+    shape_index, x_index = header.index(shape_column), header.index(x_column)
+    y_index = header.index(y_column) if y_column in header else None
+    writer.writerow(header + ["area", "valid"])
+
+    total = bad = 0
+    while True:
+        rows = [row for row in islice(reader, chunk_rows) if row]
+        if not rows:
+            break
+        width = max(shape_index, x_index, -1 if y_index is None else y_index) + 1
+        for row in rows:
+            if len(row) < width:
+                row.extend([""] * (width - len(row)))
+        areas, invalid = bulk_areas(
+            [row[shape_index] for row in rows],
+            [row[x_index] for row in rows],
+            None if y_index is None else [row[y_index] for row in rows],
+            **options,
+        )
+        for row, area, flag in zip(rows, areas.tolist(), invalid.tolist()):
+            row.append("" if flag else repr(area))
+            row.append("0" if flag else "1")
+        writer.writerows(rows)
+        total += len(rows)
+        bad += int(invalid.sum())
+    return total, bad